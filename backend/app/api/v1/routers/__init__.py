@@ -4,3 +4,4 @@ from .academic import router as academic_router
 # from .risk import router as risk_router
 # from .payment import router as payment_router
 from .financing import router as financing_router
+from .debug import router as debug_router
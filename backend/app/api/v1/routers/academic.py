@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import Optional
 import logging
 
@@ -7,41 +7,58 @@ from app.api.v1.schemas.academic import (
 )
 from app.services.academic_service import academic_service
 from app.core.security import get_current_user
+from app.core.tracing import traced
+from app.core.executors import executor_pools
+from app.core.rate_limit import rate_limit
+from app.core.http_cache import conditional_response, load_with_etag
+from app.core.serialization import trusted_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/academic-history", response_model=AcademicHistoryResponse)
+@router.post("/academic-history", response_model=AcademicHistoryResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def create_academic_history(
     data: AcademicHistoryCreate,
     current_user: dict = Depends(get_current_user)
 ) -> AcademicHistoryResponse:
     """Create academic history record"""
-    return academic_service.create_academic_history(data, current_user.get("id"))
+    return await executor_pools.run("writes", academic_service.create_academic_history, data, current_user.get("id"))
 
 @router.get("/academic-history/{application_id}", response_model=Optional[AcademicHistoryResponse])
+@traced()
 async def get_academic_history(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ) -> Optional[AcademicHistoryResponse]:
-    """Get academic history by application ID"""
-    return academic_service.get_academic_history(application_id, current_user.get("id"))
+    """Get academic history by application ID; honors If-None-Match"""
+    record, etag = await load_with_etag(
+        "academic_history", "reads", academic_service.get_academic_history_data, application_id, current_user.get("id")
+    )
+    not_modified = conditional_response(request, response, "academic_history", etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(AcademicHistoryResponse, record or None, response.headers)
 
-@router.put("/academic-history/{application_id}", response_model=AcademicHistoryResponse)
+@router.put("/academic-history/{application_id}", response_model=AcademicHistoryResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def update_academic_history(
     application_id: str,
     data: AcademicHistoryUpdate,
     current_user: dict = Depends(get_current_user)
 ) -> AcademicHistoryResponse:
     """Update academic history record"""
-    return academic_service.update_academic_history(application_id, data, current_user.get("id"))
+    return await executor_pools.run("writes", academic_service.update_academic_history, application_id, data, current_user.get("id"))
 
-@router.delete("/academic-history/{application_id}")
+@router.delete("/academic-history/{application_id}", dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def delete_academic_history(
     application_id: str,
     current_user: dict = Depends(get_current_user)
 ) -> dict:
     """Delete academic history record"""
-    academic_service.delete_academic_history(application_id, current_user.get("id"))
+    await executor_pools.run("writes", academic_service.delete_academic_history, application_id, current_user.get("id"))
     return {"message": "Academic history deleted successfully"}
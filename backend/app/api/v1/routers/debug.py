@@ -0,0 +1,48 @@
+"""
+Debug API router.
+
+Exposes operational diagnostics to operators holding ``DEBUG_API_TOKEN``.
+The endpoints answer 404 while no token is configured and are left out of
+the OpenAPI schema.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.security import require_debug_token
+from app.db.instrumentation import slow_query_log
+
+router = APIRouter(dependencies=[Depends(require_debug_token)])
+
+
+@router.get("/slow-queries", include_in_schema=False)
+async def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+) -> Dict[str, Any]:
+    """
+    List recent database calls slower than the configured threshold.
+
+    Entries are newest first and contain the repository method, table,
+    filter columns, row count, payload size and duration. Filter values are
+    never recorded.
+    """
+    if not settings.slow_query_log_enabled:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled")
+
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "capacity": slow_query_log.capacity,
+        "total_recorded": slow_query_log.total_recorded,
+        "entries": slow_query_log.entries(limit),
+    }
+
+
+@router.delete("/slow-queries", include_in_schema=False)
+async def clear_slow_queries() -> Dict[str, str]:
+    """Clear the slow query log."""
+    if not settings.slow_query_log_enabled:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled")
+
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Request, Response
 from typing import Dict, Any
 
 from app.api.v1.schemas.documents import (
@@ -7,65 +7,107 @@ from app.api.v1.schemas.documents import (
 )
 from app.services.document_service import document_service
 from app.core.security import get_current_user
+from app.core.tracing import traced
+from app.core.executors import executor_pools
+from app.core.rate_limit import rate_limit
+from app.core.http_cache import conditional_response, load_with_etag
+from app.core.idempotency import idempotency_store
+from app.core.serialization import trusted_response
 
 router = APIRouter()
 
 @router.get("/{application_id}", response_model=DocumentStatusResponse)
+@traced()
 async def get_document_status(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ) -> DocumentStatusResponse:
-    """Get document upload status"""
-    return document_service.get_document_status(application_id, current_user.get("id"))
+    """Get document upload status; honors If-None-Match"""
+    data, etag = await load_with_etag(
+        "document_status", "reads", document_service.get_document_status_data, application_id, current_user.get("id")
+    )
+    not_modified = conditional_response(request, response, "document_status", etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(DocumentStatusResponse, data, response.headers)
 
-@router.post("/upload", response_model=FileUploadResponse)
+@router.post("/upload", response_model=FileUploadResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     application_id: str = Form(...),
     document_type: str = Form(...),
     current_user: dict = Depends(get_current_user)
 ) -> FileUploadResponse:
-    """Upload file to Supabase Storage"""
-    return document_service.upload_file(file, application_id, document_type, current_user.get("id"))
+    """Upload file to Supabase Storage; honors Idempotency-Key"""
+    user_id = current_user.get("id")
+    # The file itself is identified by its name, type and size
+    payload = {
+        "application_id": application_id,
+        "document_type": document_type,
+        "filename": file.filename,
+        "content_type": file.content_type,
+        "size": file.size,
+    }
+    return await idempotency_store.run(
+        request, user_id, "upload_file", payload,
+        lambda: executor_pools.run("uploads", document_service.upload_file, file, application_id, document_type, user_id)
+    )
 
 @router.get("/{application_id}/files", response_model=UploadedFilesResponse)
+@traced()
 async def get_uploaded_files(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ) -> UploadedFilesResponse:
-    """Get uploaded files for application"""
-    return document_service.get_uploaded_files(application_id, current_user.get("id"))
+    """Get uploaded files for application; honors If-None-Match"""
+    data, etag = await load_with_etag(
+        "uploaded_files", "reads", document_service.get_uploaded_files_data, application_id, current_user.get("id")
+    )
+    not_modified = conditional_response(request, response, "uploaded_files", etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(UploadedFilesResponse, data, response.headers)
 
-@router.delete("/{application_id}/files/{file_id}", response_model=DeleteFileResponse)
+@router.delete("/{application_id}/files/{file_id}", response_model=DeleteFileResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def delete_file(
     application_id: str,
     file_id: str,
     current_user: dict = Depends(get_current_user)
 ) -> DeleteFileResponse:
     """Delete uploaded file"""
-    return document_service.delete_file(application_id, file_id, current_user.get("id"))
+    return await executor_pools.run("uploads", document_service.delete_file, application_id, file_id, current_user.get("id"))
 
-@router.post("/complete", response_model=CompleteUploadResponse)
+@router.post("/complete", response_model=CompleteUploadResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def complete_document_upload(
     data: Dict[str, Any],
     current_user: dict = Depends(get_current_user)
 ) -> CompleteUploadResponse:
     """Mark document upload as complete"""
-    return document_service.complete_upload(data, current_user.get("id"))
+    return await executor_pools.run("writes", document_service.complete_upload, data, current_user.get("id"))
 
 @router.get("/{application_id}/upload-summary", response_model=UploadSummaryResponse)
+@traced()
 async def get_upload_summary(
     application_id: str,
     current_user: dict = Depends(get_current_user)
 ) -> UploadSummaryResponse:
     """Get upload summary for application"""
-    return document_service.get_upload_summary(application_id, current_user.get("id"))
+    return await executor_pools.run("reads", document_service.get_upload_summary, application_id, current_user.get("id"))
 
-@router.post("/{application_id}/mark-complete/{doc_type}")
+@router.post("/{application_id}/mark-complete/{doc_type}", dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def mark_document_complete(
     application_id: str,
     doc_type: str,
     current_user: dict = Depends(get_current_user)
 ):
     """Mark document type as complete"""
-    return document_service.mark_complete(application_id, doc_type, current_user.get("id"))
+    return await executor_pools.run("writes", document_service.mark_complete, application_id, doc_type, current_user.get("id"))
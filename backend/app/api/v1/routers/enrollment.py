@@ -1,28 +1,39 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import JSONResponse
 from typing import Dict, Any
+import json
 import logging
 
 from app.api.v1.schemas.enrollment import (
     AutoSaveRequest, AutoSaveResponse, EnrollmentData,
     SubmitEnrollmentResponse, ApplicationResponse,
     UploadSummaryResponse, SubmitApplicationRequest,
-    SubmitApplicationResponse
+    SubmitApplicationResponse, ApplicationProgressResponse, SubmissionJobResponse
 )
 from app.services.enrollment_service import enrollment_service
+from app.services.submission_service import submission_service
 from app.core.security import get_current_user
+from app.core.tracing import traced
+from app.core.executors import executor_pools
+from app.core.rate_limit import rate_limit
+from app.core.http_cache import conditional_response, load_with_etag
+from app.core.idempotency import REPLAYED_HEADER, idempotency_store
+from app.core.serialization import trusted_response
+from app.core.validation import CompiledBodyRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=CompiledBodyRoute)
 
-@router.post("/auto-save", response_model=AutoSaveResponse)
+@router.post("/auto-save", response_model=AutoSaveResponse, dependencies=[Depends(rate_limit("auto_save"))])
+@traced()
 async def auto_save_enrollment(
     data: AutoSaveRequest,
     current_user: dict = Depends(get_current_user)
 ) -> AutoSaveResponse:
     """Auto-save enrollment progress"""
     try:
-        return enrollment_service.auto_save_enrollment(data, current_user.get("id"))
+        return await executor_pools.run("writes", enrollment_service.auto_save_enrollment, data, current_user.get("id"))
     except Exception as e:
         logger.error(f"Auto-save failed: {str(e)}")
         # Return a success response to prevent frontend errors
@@ -32,42 +43,112 @@ async def auto_save_enrollment(
             application_id=data.application_id or "unknown"
         )
 
-@router.post("/submit", response_model=SubmitEnrollmentResponse)
+@router.post("/submit", response_model=SubmitEnrollmentResponse, dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def submit_enrollment(
     data: EnrollmentData,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ) -> SubmitEnrollmentResponse:
-    """Submit complete enrollment"""
-    return enrollment_service.submit_enrollment(data, current_user.get("id"))
+    """Submit complete enrollment; honors Idempotency-Key"""
+    user_id = current_user.get("id")
+    return await idempotency_store.run(
+        request, user_id, "submit_enrollment", data,
+        lambda: executor_pools.run("writes", enrollment_service.submit_enrollment, data, user_id)
+    )
 
 @router.get("/get-application/{application_id}", response_model=ApplicationResponse)
+@traced()
 async def get_application(
     application_id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ) -> ApplicationResponse:
-    """Get application by ID"""
-    return enrollment_service.get_application(application_id, current_user.get("id"))
+    """Get application by ID; honors If-None-Match"""
+    data, etag = await load_with_etag(
+        "application", "reads", enrollment_service.get_application_data, application_id, current_user.get("id")
+    )
+    not_modified = conditional_response(request, response, "application", etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(ApplicationResponse, data, response.headers)
 
 @router.get("/{application_id}/upload-summary", response_model=UploadSummaryResponse)
+@traced()
 async def get_upload_summary(
     application_id: str,
     current_user: dict = Depends(get_current_user)
 ) -> UploadSummaryResponse:
     """Get upload summary for application"""
-    return enrollment_service.get_upload_summary(application_id, current_user.get("id"))
+    return await executor_pools.run("reads", enrollment_service.get_upload_summary, application_id, current_user.get("id"))
 
-@router.post("/submit-application", response_model=SubmitApplicationResponse)
+@router.get("/{application_id}/progress", response_model=ApplicationProgressResponse)
+@traced()
+async def get_application_progress(
+    application_id: str,
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+) -> ApplicationProgressResponse:
+    """Get the completeness of every application step in one lookup; honors If-None-Match"""
+    data, etag = await load_with_etag(
+        "application_progress", "reads", enrollment_service.get_progress_data, application_id, current_user.get("id")
+    )
+    not_modified = conditional_response(request, response, "application_progress", etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(ApplicationProgressResponse, data, response.headers)
+
+@router.post(
+    "/submit-application", response_model=SubmitApplicationResponse, dependencies=[Depends(rate_limit("writes"))],
+    responses={202: {"model": SubmissionJobResponse, "description": "Queued with Prefer: respond-async"}}
+)
+@traced()
 async def submit_full_application(
     data: SubmitApplicationRequest,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ) -> SubmitApplicationResponse:
-    """Submit full application"""
-    return enrollment_service.submit_application(data, current_user.get("id"))
+    """Submit full application; honors Idempotency-Key and Prefer: respond-async"""
+    user_id = current_user.get("id")
+    if "respond-async" not in request.headers.get("prefer", "").lower():
+        return await idempotency_store.run(
+            request, user_id, "submit_application", data,
+            lambda: executor_pools.run("writes", enrollment_service.submit_application, data, user_id)
+        )
+
+    job = await idempotency_store.run(
+        request, user_id, "submit_application_async", data,
+        lambda: submission_service.enqueue(data, user_id), status_code=202
+    )
+    headers = {"Preference-Applied": "respond-async"}
+    if isinstance(job, Response):
+        # Replayed: report the current state of the first request's job
+        headers[REPLAYED_HEADER] = job.headers[REPLAYED_HEADER]
+        job = await executor_pools.run("reads", submission_service.get_status, json.loads(job.body)["job_id"], user_id)
+    headers["Location"] = str(request.url_for("get_submission_status", job_id=job["job_id"]))
+    return JSONResponse(SubmissionJobResponse(**job).model_dump(), status_code=202, headers=headers)
+
+@router.get("/submissions/{job_id}", response_model=SubmissionJobResponse)
+@traced()
+async def get_submission_status(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> SubmissionJobResponse:
+    """Get the status of an asynchronous submission"""
+    return await executor_pools.run("reads", submission_service.get_status, job_id, current_user.get("id"))
 
-@router.post("/declaration")
+@router.post("/declaration", dependencies=[Depends(rate_limit("writes"))])
+@traced()
 async def submit_declaration(
     data: Dict[str, Any],
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
-    """Submit declaration data"""
-    return enrollment_service.submit_declaration(data, current_user.get("id"))
+    """Submit declaration data; honors Idempotency-Key"""
+    user_id = current_user.get("id")
+    return await idempotency_store.run(
+        request, user_id, "submit_declaration", data,
+        lambda: executor_pools.run("writes", enrollment_service.submit_declaration, data, user_id)
+    )
@@ -4,15 +4,20 @@ Financing API router.
 Handles financing-related endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.api.v1.schemas.financing import FinancingSelectionRequest, FinancingSelectionResponse
 from app.services.financing_service import financing_service
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import traced
+from app.core.executors import executor_pools
+from app.core.http_cache import conditional_response, load_with_etag
+from app.core.serialization import trusted_response
 
 router = APIRouter(prefix="/financing", tags=["financing"])
 
 
 @router.post("/select-plan", response_model=FinancingSelectionResponse)
+@traced()
 async def select_financing_plan(request: FinancingSelectionRequest):
     """
     Save financing plan selection for an application.
@@ -21,7 +26,9 @@ async def select_financing_plan(request: FinancingSelectionRequest):
     The selection is stored in the financing_selections table.
     """
     try:
-        financing_id = financing_service.save_financing_selection(
+        financing_id = await executor_pools.run(
+            "writes",
+            financing_service.save_financing_selection,
             application_id=request.application_id,
             plan_type=request.plan_type.value,  # Convert enum to string
             discount_rate=request.discount_rate,
@@ -30,7 +37,7 @@ async def select_financing_plan(request: FinancingSelectionRequest):
         )
 
         # Get the saved selection to return complete data
-        selection = financing_service.get_financing_selection(request.application_id)
+        selection = await executor_pools.run("reads", financing_service.get_financing_selection, request.application_id)
         if not selection:
             raise HTTPException(status_code=500, detail="Failed to retrieve saved financing selection")
 
@@ -44,18 +51,27 @@ async def select_financing_plan(request: FinancingSelectionRequest):
 
 
 @router.get("/selection/{application_id}", response_model=FinancingSelectionResponse)
-async def get_financing_selection(application_id: str):
+@traced()
+async def get_financing_selection(application_id: str, request: Request, response: Response):
     """
     Get financing selection for an application.
 
-    Returns the financing plan selected for the given application.
+    Returns the financing plan selected for the given application. Answers 304
+    when If-None-Match carries the current ETag.
     """
     try:
-        selection = financing_service.get_financing_selection(application_id)
+        selection, etag = await load_with_etag(
+            "financing_selection", "reads", financing_service.get_financing_selection, application_id
+        )
         if not selection:
             raise HTTPException(status_code=404, detail="Financing selection not found")
 
-        return FinancingSelectionResponse(**selection)
+        not_modified = conditional_response(request, response, "financing_selection", etag)
+        if not_modified:
+            return not_modified
+        return trusted_response(FinancingSelectionResponse, selection, response.headers)
+    except HTTPException:
+        raise
     except ExternalServiceError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -235,6 +235,25 @@ class UploadSummaryResponse(BaseModel):
     uploaded_types: List[str]
 
 
+class ApplicationProgressResponse(BaseModel):
+    """
+    Application progress response schema.
+
+    Completeness of every step, maintained incrementally as sections are saved.
+    """
+    application_id: str
+    status: Optional[str] = None
+    student_completed: bool = False
+    medical_completed: bool = False
+    family_completed: bool = False
+    fee_completed: bool = False
+    document_types_completed: List[str] = []
+    academic_history_completed: bool = False
+    financing_plan: Optional[str] = None
+    declaration_signed: bool = False
+    updated_at: Optional[str] = None
+
+
 class SubmitApplicationRequest(BaseModel):
     """Submit application request schema."""
     application_id: str = Field(..., min_length=1, description="Application ID to submit")
@@ -252,3 +271,19 @@ class SubmitApplicationResponse(BaseModel):
     """Submit application response schema."""
     message: str
     application_id: str
+
+
+class SubmissionJobResponse(BaseModel):
+    """
+    Asynchronous submission job schema.
+
+    Status of a submission accepted with ``Prefer: respond-async`` and of
+    each step of its pipeline.
+    """
+    job_id: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    steps: Dict[str, str] = Field(default_factory=dict, description="Status of each pipeline step")
+    result: Dict[str, Any] = Field(default_factory=dict, description="application_id and missing_documents once known")
+    error: Optional[Dict[str, Any]] = None
+    created_at: str
+    updated_at: str
@@ -0,0 +1,496 @@
+"""
+Application-keyed cache.
+
+Repositories cache per-application reads (``full_application``,
+``academic_history``, ``financing_selection``, ``declaration``) through
+``application_cache`` and invalidate every key of an application after any
+write that touches it. The cache also holds the user -> application_id index
+used by auto-save and submission, the application progress snapshot, which
+is updated in place by its repository rather than invalidated, and the
+per-user markers that throttle login-time prefetching.
+
+Invalidation uses a generation token per application: keys embed the current
+token, and invalidating replaces the token, so all older keys become
+unreachable at once and age out through TTL/LRU. Generations are random tokens
+rather than counters, so a token lost to eviction can never bring old entries
+back.
+
+Polled sections (the upload summary) are read stale-while-revalidate: an
+entry older than its soft TTL is still returned, and reloaded on a background
+thread. Writes invalidate them like any other section, so the first read
+after an upload or delete always loads fresh data.
+
+Lookups of applications that do not exist are remembered for
+``negative_cache_ttl_seconds``, so repeated requests for unknown IDs cost no
+queries. A negative entry is the only entry such a lookup leaves: it sits
+outside the generation scheme, records the generation it was stored under and
+is ignored once that changes, so creating an application invalidates its ID
+like any other write.
+
+Backends:
+    memory  In-process TTL + LRU (default). Each worker has its own copy, so
+            other workers may serve data up to ``cache_ttl_seconds`` old.
+    redis   Shared network cache (needs the ``redis`` package). The memory
+            backend is its local stand-in.
+    none    Caching disabled.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Generation tokens must outlive the entries that embed them
+GENERATION_TTL_SECONDS = 24 * 60 * 60
+
+# Result of a lookup that hit a negative entry
+MISSING = "__missing__"
+
+cache_requests_total = metrics.counter(
+    "cache_requests_total", "Application cache lookups by section and result", ["section", "result"]
+)
+cache_invalidations_total = metrics.counter(
+    "cache_invalidations_total", "Application cache invalidations"
+)
+cache_errors_total = metrics.counter(
+    "cache_errors_total", "Cache backend errors by operation", ["operation"]
+)
+cache_hit_ratio = metrics.gauge(
+    "cache_hit_ratio", "Fraction of application cache lookups served from the cache", ["section"]
+)
+
+
+class CacheBackend(ABC):
+    """Key/value store with per-entry TTL."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Value for ``key``, or None when absent or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` for ``ttl`` seconds."""
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store ``value`` only if ``key`` is absent; whether it was stored."""
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Thread-safe TTL + LRU cache held in the worker process."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate what they get back
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        value = copy.deepcopy(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on Redis; values are stored as JSON."""
+
+    def __init__(self, url: Optional[str] = None, client: Any = None, prefix: str = "enrollment:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ConfigurationError("CACHE_BACKEND=redis requires the 'redis' package")
+            if not url:
+                raise ConfigurationError("CACHE_REDIS_URL must be set when CACHE_BACKEND=redis")
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl)))
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl)), nx=True))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ApplicationCache:
+    """
+    Read-through cache of per-application sections.
+
+    Backend errors are logged and counted; the loader result is then used
+    directly so a cache outage only costs latency.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 60.0,
+                 user_index_ttl: float = 1800.0, negative_ttl: float = 30.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.user_index_ttl = user_index_ttl
+        self.negative_ttl = negative_ttl
+        self._sections_seen = set()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def configure(self, backend: Optional[CacheBackend], ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def get_or_load(self, application_id: str, section: str, loader: Callable[[], Any],
+                    cache_missing: bool = False) -> Any:
+        """
+        Cached value of ``section`` for the application, loading it on a miss.
+
+        Empty results are not cached, unless ``cache_missing`` is set: a None
+        result is then remembered for ``negative_ttl`` seconds, until the
+        application is invalidated.
+        """
+        if self.backend is None or not application_id:
+            return loader()
+        self._track(section)
+
+        try:
+            # Read without creating the generation, so a miss on an unknown ID stores nothing but its negative entry
+            generation = self.backend.get(self._generation_key(application_id))
+            cached = self.backend.get(self._section_key(application_id, generation, section)) if generation else None
+            if cached is None and cache_missing:
+                negative = self.backend.get(self._missing_key(application_id, section))
+                # Only valid for the generation it was stored under; an invalidation since voids it
+                if negative is not None and negative.get("generation") == generation:
+                    cached = MISSING
+        except Exception as e:
+            self._error("get", e)
+            return loader()
+
+        if cached == MISSING:
+            cache_requests_total.inc(section=section, result="negative_hit")
+            return None
+        if cached is not None:
+            cache_requests_total.inc(section=section, result="hit")
+            return cached
+
+        cache_requests_total.inc(section=section, result="miss")
+        value = loader()
+        try:
+            if value:
+                if generation is None:
+                    # Created only after the load, with add: losing means an invalidation or
+                    # another reader got there first, and the value may predate that write
+                    generation = uuid.uuid4().hex[:12]
+                    if not self.backend.add(self._generation_key(application_id), generation, GENERATION_TTL_SECONDS):
+                        return value
+                self.backend.set(self._section_key(application_id, generation, section), value, self.ttl)
+            elif value is None and cache_missing:
+                self.backend.set(self._missing_key(application_id, section), {"generation": generation},
+                                 self.negative_ttl)
+        except Exception as e:
+            self._error("set", e)
+        return value
+
+    def get_stale_while_revalidate(self, application_id: str, section: str,
+                                   loader: Callable[[], Any], soft_ttl: float) -> Any:
+        """
+        Cached value of ``section``, refreshed in the background once stale.
+
+        Entries younger than ``soft_ttl`` are fresh. Older entries are still
+        returned, and one background reload per key replaces them. Entries
+        expire entirely after the cache TTL, and on invalidation.
+        """
+        if self.backend is None or not application_id:
+            return loader()
+        self._track(section)
+
+        try:
+            key = self._key(application_id, section)
+            entry = self.backend.get(key)
+        except Exception as e:
+            self._error("get", e)
+            return loader()
+
+        if entry is not None:
+            if entry["fresh_until"] > time.time():
+                cache_requests_total.inc(section=section, result="hit")
+            else:
+                cache_requests_total.inc(section=section, result="stale")
+                self._refresh_in_background(key, loader, soft_ttl)
+            return entry["value"]
+
+        cache_requests_total.inc(section=section, result="miss")
+        value = loader()
+        self._store_fresh(key, value, soft_ttl)
+        return value
+
+    def _store_fresh(self, key: str, value: Any, soft_ttl: float) -> None:
+        try:
+            # Wall-clock time, so workers sharing a Redis backend agree
+            self.backend.set(key, {"value": value, "fresh_until": time.time() + soft_ttl}, self.ttl)
+        except Exception as e:
+            self._error("set", e)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any], soft_ttl: float) -> None:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+        def refresh() -> None:
+            try:
+                # An invalidation meanwhile moves readers to a new key, so a
+                # late refresh can never overwrite fresher data
+                self._store_fresh(key, loader(), soft_ttl)
+            except Exception as e:
+                self._error("refresh", e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    def invalidate(self, application_id: Optional[str]) -> None:
+        """Drop every cached section of an application."""
+        if self.backend is None or not application_id:
+            return
+        try:
+            self.backend.set(self._generation_key(application_id), uuid.uuid4().hex[:12], GENERATION_TTL_SECONDS)
+            cache_invalidations_total.inc()
+        except Exception as e:
+            self._error("invalidate", e)
+
+    def get_user_application_id(self, user_id: str, loader: Callable[[], Optional[str]]) -> Optional[str]:
+        """Application ID of a user from the index, loading it on a miss."""
+        if self.backend is None or not user_id:
+            return loader()
+        self._track("user_application")
+
+        key = self._user_key(user_id)
+        try:
+            application_id = self.backend.get(key)
+        except Exception as e:
+            self._error("get", e)
+            return loader()
+
+        if application_id is not None:
+            cache_requests_total.inc(section="user_application", result="hit")
+            return application_id
+
+        cache_requests_total.inc(section="user_application", result="miss")
+        application_id = loader()
+        if application_id:
+            self.remember_user_application(user_id, application_id)
+        return application_id
+
+    def remember_user_application(self, user_id: Optional[str], application_id: str) -> None:
+        """Index a user's application, e.g. right after creating it."""
+        if self.backend is None or not user_id:
+            return
+        try:
+            self.backend.set(self._user_key(user_id), application_id, self.user_index_ttl)
+        except Exception as e:
+            self._error("set", e)
+
+    def forget_user_application(self, user_id: Optional[str]) -> None:
+        """Drop a user's index entry, e.g. when the application status changes."""
+        if self.backend is None or not user_id:
+            return
+        try:
+            self.backend.delete(self._user_key(user_id))
+        except Exception as e:
+            self._error("invalidate", e)
+
+    def get_progress(self, application_id: str) -> Optional[Any]:
+        """Cached progress snapshot of an application, or None."""
+        if self.backend is None or not application_id:
+            return None
+        self._track("progress")
+        try:
+            progress = self.backend.get(self._progress_key(application_id))
+        except Exception as e:
+            self._error("get", e)
+            return None
+        cache_requests_total.inc(section="progress", result="hit" if progress is not None else "miss")
+        return progress
+
+    def set_progress(self, application_id: str, progress: Any) -> None:
+        if self.backend is None or not application_id:
+            return
+        try:
+            self.backend.set(self._progress_key(application_id), progress, self.ttl)
+        except Exception as e:
+            self._error("set", e)
+
+    def forget_progress(self, application_id: str) -> None:
+        if self.backend is None or not application_id:
+            return
+        try:
+            self.backend.delete(self._progress_key(application_id))
+        except Exception as e:
+            self._error("invalidate", e)
+
+    def claim_prefetch(self, user_id: Optional[str], ttl: float) -> bool:
+        """Whether a user's application should be warmed now; claims the user for ``ttl`` seconds."""
+        if self.backend is None or not user_id:
+            return False
+        try:
+            # Atomic, so concurrent first requests and other workers cannot all win the claim
+            return self.backend.add(f"prefetch:{user_id}", True, ttl)
+        except Exception as e:
+            self._error("set", e)
+            return False
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop background refreshes, letting running ones finish with ``wait``."""
+        with self._refresh_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _key(self, application_id: str, section: str) -> str:
+        generation_key = self._generation_key(application_id)
+        generation = self.backend.get(generation_key)
+        if generation is None:
+            # Only ever added, so a reader cannot replace the token of a concurrent invalidation
+            generation = uuid.uuid4().hex[:12]
+            if not self.backend.add(generation_key, generation, GENERATION_TTL_SECONDS):
+                generation = self.backend.get(generation_key) or generation
+        return self._section_key(application_id, generation, section)
+
+    @staticmethod
+    def _section_key(application_id: str, generation: str, section: str) -> str:
+        return f"app:{application_id}:{generation}:{section}"
+
+    @staticmethod
+    def _generation_key(application_id: str) -> str:
+        return f"app:{application_id}:generation"
+
+    @staticmethod
+    def _missing_key(application_id: str, section: str) -> str:
+        return f"app:{application_id}:missing:{section}"
+
+    @staticmethod
+    def _user_key(user_id: str) -> str:
+        return f"user:{user_id}:application_id"
+
+    @staticmethod
+    def _progress_key(application_id: str) -> str:
+        return f"progress:{application_id}"
+
+    def _track(self, section: str) -> None:
+        if section in self._sections_seen:
+            return
+        self._sections_seen.add(section)
+
+        def ratio() -> float:
+            hits = sum(cache_requests_total.value(section=section, result=result)
+                       for result in ("hit", "stale", "negative_hit"))
+            total = hits + cache_requests_total.value(section=section, result="miss")
+            return hits / total if total else 0.0
+
+        cache_hit_ratio.set_function(ratio, section=section)
+
+    @staticmethod
+    def _error(operation: str, error: Exception) -> None:
+        cache_errors_total.inc(operation=operation)
+        logger.warning(f"Cache {operation} failed: {error}")
+
+
+def create_cache_backend(settings) -> Optional[CacheBackend]:
+    """Build the cache backend selected by ``CACHE_BACKEND``."""
+    backend = settings.cache_backend.lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemoryCacheBackend(max_entries=settings.cache_max_entries)
+    if backend == "redis":
+        return RedisCacheBackend(url=settings.cache_redis_url)
+    raise ConfigurationError(f"Unknown CACHE_BACKEND '{settings.cache_backend}'")
+
+
+# Global instance
+application_cache = ApplicationCache(
+    create_cache_backend(settings),
+    ttl=settings.cache_ttl_seconds,
+    user_index_ttl=settings.user_index_ttl_seconds,
+    negative_ttl=settings.negative_cache_ttl_seconds,
+)
@@ -0,0 +1,284 @@
+"""
+Response compression with brotli, zstd and gzip.
+
+``CompressionMiddleware`` replaces Starlette's ``GZipMiddleware``. It picks
+the encoding from ``Accept-Encoding`` (highest q-value first, then the order
+of ``COMPRESSION_ENCODINGS``), leaves already-compressed content types and
+small bodies alone, and lowers the compression level as bodies grow, so
+large payloads do not cost disproportionate CPU.
+
+brotli and zstd are optional dependencies (``pip install brotli zstandard``);
+without them, responses fall back to gzip.
+
+Responses that carry an ``ETag`` are the same bytes for as long as the ETag
+is, so their compressed bodies are cached by ETag and encoding (bounded by
+``COMPRESSION_CACHE_MAX_BYTES``), and repeated reads of big payloads like the
+full application are compressed once. A compressed response's strong ETag is
+sent as a weak one, since the encoded bytes differ from the identity
+representation; ``If-None-Match`` uses weak comparison, so 304s still work.
+"""
+
+import gzip
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Content types that are compressed already, or not worth compressing
+SKIP_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/pdf",
+    "application/octet-stream", "application/x-7z-compressed", "application/vnd.openxmlformats",
+)
+
+# Compression level per body size: the first tier whose limit the body is under
+LEVELS: Dict[str, Tuple[Tuple[Optional[int], int], ...]] = {
+    "br": ((64 * 1024, 5), (1024 * 1024, 4), (None, 2)),
+    "zstd": ((64 * 1024, 6), (1024 * 1024, 3), (None, 1)),
+    "gzip": ((64 * 1024, 6), (1024 * 1024, 5), (None, 1)),
+}
+
+# Tier used for streamed bodies, whose size is unknown
+STREAMING_TIER = 1
+
+compressed_responses_total = metrics.counter(
+    "http_compressed_responses_total", "Compressed responses by encoding and body cache use", ["encoding", "cache"]
+)
+compression_bytes_total = metrics.counter(
+    "http_compression_bytes_total", "Bytes before (in) and after (out) compression", ["encoding", "direction"]
+)
+
+
+class _StreamingGzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _StreamingBrotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _StreamingZstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# One-shot and streaming compressors of each encoding
+CODECS: Dict[str, Tuple[Callable[[bytes, int], bytes], Callable[[int], Any]]] = {
+    "gzip": (lambda data, level: gzip.compress(data, level, mtime=0), _StreamingGzip),
+}
+if brotli is not None:
+    CODECS["br"] = (lambda data, level: brotli.compress(data, quality=level), _StreamingBrotli)
+if zstandard is not None:
+    CODECS["zstd"] = (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), _StreamingZstd)
+
+
+def level_for(encoding: str, size: Optional[int]) -> int:
+    """Compression level of ``encoding`` for a body of ``size`` bytes (None when streamed)."""
+    tiers = LEVELS[encoding]
+    if size is None:
+        return tiers[STREAMING_TIER][1]
+    for limit, level in tiers:
+        if limit is None or size < limit:
+            return level
+    return tiers[-1][1]
+
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Best of the ``preference`` encodings that ``accept_encoding`` allows, or None."""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            qualities[name.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in preference:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies by ETag and encoding, bounded in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+            return body
+
+    def set(self, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[(etag, encoding)] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """Negotiates brotli, zstd or gzip and compresses eligible responses"""
+
+    def __init__(self, app, minimum_size: int = 1000, encodings: str = "br,zstd,gzip",
+                 cache_max_bytes: int = 16 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [name.strip() for name in encodings.split(",") if name.strip() in CODECS]
+        self.cache = CompressedBodyCache(cache_max_bytes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressionResponder(self, encoding, send).send)
+
+
+class _CompressionResponder:
+    """Buffers the response start until the first body chunk decides how to send it"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Dict[str, Any]] = None
+        self.stream = None
+        self.passthrough = False
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+        if self.stream is not None:
+            await self._send_streamed(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if not self._should_compress(headers, body, more_body):
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        self._set_encoding_headers(headers)
+        if more_body:
+            del headers["content-length"]
+            self.stream = CODECS[self.encoding][1](level_for(self.encoding, None))
+            await self._send(self.start_message)
+            await self._send_streamed(message)
+            return
+
+        compressed = self._compress(body, headers.get("etag"))
+        headers["content-length"] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if self.start_message["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").lower()
+        if content_type.startswith(SKIP_CONTENT_TYPES):
+            return False
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+    def _compress(self, body: bytes, etag: Optional[str]) -> bytes:
+        cache = self.middleware.cache
+        if etag:
+            cached = cache.get(etag, self.encoding)
+            if cached is not None:
+                compressed_responses_total.inc(encoding=self.encoding, cache="hit")
+                return cached
+        compressed = CODECS[self.encoding][0](body, level_for(self.encoding, len(body)))
+        compression_bytes_total.inc(len(body), encoding=self.encoding, direction="in")
+        compression_bytes_total.inc(len(compressed), encoding=self.encoding, direction="out")
+        if etag:
+            cache.set(etag, self.encoding, compressed)
+            compressed_responses_total.inc(encoding=self.encoding, cache="miss")
+        else:
+            compressed_responses_total.inc(encoding=self.encoding, cache="none")
+        return compressed
+
+    async def _send_streamed(self, message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        chunk = self.stream.compress(body)
+        compression_bytes_total.inc(len(body), encoding=self.encoding, direction="in")
+        if not more_body:
+            chunk += self.stream.finish()
+            compressed_responses_total.inc(encoding=self.encoding, cache="none")
+        compression_bytes_total.inc(len(chunk), encoding=self.encoding, direction="out")
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
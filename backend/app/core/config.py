@@ -20,15 +20,143 @@ class Settings(BaseSettings):
     debug: bool = False
     secret_key: str = "your-secret-key-here"
 
+    # Database backend: "supabase" for a real project, "memory" for the in-process stand-in
+    database_backend: str = "supabase"
+
+    # In-memory backend fault injection (milliseconds and probabilities)
+    memory_db_latency_ms: float = 0.0
+    memory_db_jitter_ms: float = 0.0
+    memory_db_failure_rate: float = 0.0
+    memory_storage_latency_ms: float = 0.0
+    memory_storage_jitter_ms: float = 0.0
+    memory_storage_failure_rate: float = 0.0
+    memory_auth_latency_ms: float = 0.0
+    memory_backend_seed: Optional[int] = None
+
+    # Tracing (OTLP/JSON written to a file, or sent to a collector when an endpoint is set)
+    tracing_enabled: bool = False
+    trace_export_path: str = "traces/spans.jsonl"
+    trace_otlp_endpoint: Optional[str] = None
+    trace_service_name: str = "school-enrollment-api"
+    trace_sample_rate: float = 1.0
+
+    # Slow database call log served at /debug/slow-queries to holders of DEBUG_API_TOKEN
+    slow_query_log_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    slow_query_log_size: int = 500
+    debug_api_token: Optional[str] = None
+
+    # Connection pool shared by all Supabase database, storage and auth calls
+    supabase_http2: bool = True
+    supabase_http_max_connections: int = 50
+    supabase_http_max_keepalive_connections: int = 20
+    supabase_http_keepalive_expiry_seconds: float = 60.0
+    supabase_http_connect_timeout_seconds: float = 5.0
+    supabase_http_read_timeout_seconds: float = 30.0
+    supabase_http_pool_timeout_seconds: float = 5.0
+
+    # Circuit breakers and bulkheads for the Supabase database, storage and auth APIs
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+    bulkhead_database_limit: int = 30
+    bulkhead_storage_limit: int = 10
+    bulkhead_auth_limit: int = 10
+    bulkhead_wait_seconds: float = 1.0
+
+    # Background dependency probes served at /ready; 0 disables them
+    readiness_probe_interval_seconds: float = 5.0
+    readiness_probe_timeout_seconds: float = 2.0
+
+    # Metrics served at /metrics (off by default; scrapers send METRICS_TOKEN when set)
+    # and event-loop lag monitoring
+    metrics_enabled: bool = False
+    metrics_token: Optional[str] = None
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 50.0
+    loop_lag_threshold_ms: float = 100.0
+
+    # Application cache: memory (per worker), redis (shared) or none
+    cache_backend: str = "memory"
+    cache_ttl_seconds: float = 60.0
+    cache_max_entries: int = 10000
+    cache_redis_url: Optional[str] = None
+    user_index_ttl_seconds: float = 1800.0
+    negative_cache_ttl_seconds: float = 30.0
+    upload_summary_soft_ttl_seconds: float = 5.0
+
+    # Warm the application cache on a user's first authenticated request
+    prefetch_on_login: bool = False
+    prefetch_interval_seconds: float = 1800.0
+    prefetch_workers: int = 4
+
+    # Thread pools for blocking service calls, isolated per class of work
+    executor_uploads_workers: int = 4
+    executor_writes_workers: int = 8
+    executor_reads_workers: int = 16
+
+    # Per-user token buckets for write endpoints (requests per second, burst)
+    rate_limit_enabled: bool = True
+    rate_limit_auto_save_per_second: float = 1.0
+    rate_limit_auto_save_burst: int = 5
+    rate_limit_writes_per_second: float = 1.0
+    rate_limit_writes_burst: int = 20
+    rate_limit_max_keys: int = 100000
+
+    # Replay retried writes that carry an Idempotency-Key header
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_max_entries: int = 10000
+    idempotency_wait_seconds: float = 10.0
+    idempotency_lock_seconds: float = 120.0
+
+    # Asynchronous submissions (Prefer: respond-async) and their job status
+    submission_workers: int = 4
+    submission_queue_size: int = 1000
+    submission_max_jobs: int = 10000
+    submission_job_ttl_seconds: float = 86400.0
+    submission_drain_seconds: float = 30.0
+    submission_webhook_url: Optional[str] = None
+    submission_webhook_timeout_seconds: float = 5.0
+
+    # Response compression; encodings in order of preference
+    compression_encodings: str = "br,zstd,gzip"
+    compression_minimum_size: int = 1000
+    compression_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # Serialize trusted rows directly instead of validating them again
+    fast_responses_enabled: bool = True
+
+    # Production server (python -m app.serve); PORT is set by most hosts
+    port: int = 8000
+    serve_host: str = "0.0.0.0"
+    serve_workers: int = 0
+    serve_backlog: int = 2048
+    serve_keepalive_seconds: int = 75
+    serve_max_requests: int = 10000
+    serve_max_requests_jitter: int = 1000
+    serve_graceful_timeout_seconds: int = 30
+    serve_forwarded_allow_ips: str = "127.0.0.1"
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": False,
         "extra": "ignore"
     }
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Validate required production environment variables
+    def validate_required(self) -> None:
+        """
+        Check the environment variables a Supabase deployment needs.
+
+        Runs in the startup hook and before the Supabase clients are built,
+        not at import, so tools and tests can import the app without them.
+
+        Raises:
+            ValueError: If a required variable is missing
+        """
+        # The in-memory backend needs no Supabase project
+        if self.use_memory_backend:
+            return
+
         missing_vars = []
         if not self.supabase_url:
             missing_vars.append("SUPABASE_URL")
@@ -47,11 +175,16 @@ class Settings(BaseSettings):
             )
             raise ValueError(error_msg)
 
+    @property
+    def use_memory_backend(self) -> bool:
+        """Whether the in-process Supabase stand-in is selected"""
+        return self.database_backend.lower() == "memory"
+
     @property
     def supabase(self):
         """Get Supabase client instance"""
-        from app.db.supabase_client import supabase
-        return supabase
+        from app.db.supabase_client import supabase_clients
+        return supabase_clients.anon
 
 
 settings = Settings()
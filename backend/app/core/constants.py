@@ -28,6 +28,14 @@ DOCUMENT_BUCKET_MAPPING: Dict[str, str] = {
 # Required Documents per Type (currently all require 1)
 REQUIRED_DOCUMENTS_PER_TYPE: int = 1
 
+# Completed uploads needed before a document type counts as complete
+DOCUMENT_REQUIREMENTS: Dict[str, int] = {
+    "proof_of_address": 1,
+    "id_document": 2,
+    "payslip": 3,
+    "bank_statement": 1
+}
+
 # Payment Statuses
 PAYMENT_STATUSES: Dict[str, str] = {
     "PENDING": "pending",
@@ -0,0 +1,125 @@
+"""
+Isolated thread pools for blocking service calls.
+
+The ``async def`` routes call synchronous Supabase and storage code. Run
+directly, that code stalls the event loop; run on one shared pool, a burst of
+large uploads takes every thread and auto-save waits behind it. Routes
+therefore hand their service call to one of three pools:
+
+    uploads  File uploads and deletions (storage plus metadata)
+    writes   Database writes: auto-save, submissions, declarations
+    reads    Database reads
+
+Each pool has its own thread limit (``EXECUTOR_*_WORKERS``), so it can only
+delay its own class of work. Calls keep the request's context, so logs carry
+the request ID and spans nest under the request span. Queue depth, busy
+threads and queue wait are exported per pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+executor_queue_depth = metrics.gauge(
+    "executor_queue_depth", "Calls waiting for a thread of an executor pool", ["pool"]
+)
+executor_active_threads = metrics.gauge(
+    "executor_active_threads", "Threads of an executor pool running a call", ["pool"]
+)
+executor_queue_wait_seconds = metrics.histogram(
+    "executor_queue_wait_seconds", "Time calls waited for a thread of an executor pool", ["pool"],
+    buckets=WAIT_BUCKETS,
+)
+
+
+class ExecutorPool:
+    """Bounded thread pool that counts queued and running calls"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.queued = 0
+        self.active = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def export_metrics(self) -> None:
+        """Report this pool's queue depth and busy threads."""
+        executor_queue_depth.set_function(lambda: self.queued, pool=self.name)
+        executor_active_threads.set_function(lambda: self.active, pool=self.name)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on a thread of this pool, in the caller's context."""
+        with self._lock:
+            if self._executor is None:
+                # Created on first use, so importing the app starts no threads
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"{self.name}-pool")
+            self.queued += 1
+        call = functools.partial(self._call, time.monotonic(), fn, *args, **kwargs)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, call)
+
+    def _call(self, queued_at: float, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        executor_queue_wait_seconds.observe(time.monotonic() - queued_at, pool=self.name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+class ExecutorPools:
+    """The upload, write and read pools, by name"""
+
+    def __init__(self, pools: Dict[str, ExecutorPool]):
+        self.pools = pools
+
+    async def run(self, pool: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on the named pool."""
+        return await self.pools[pool].run(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop every pool, letting running calls finish with ``wait``."""
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait)
+
+
+def create_executor_pools(settings) -> ExecutorPools:
+    """Pools sized by the ``EXECUTOR_*_WORKERS`` settings."""
+    sizes = {
+        "uploads": settings.executor_uploads_workers,
+        "writes": settings.executor_writes_workers,
+        "reads": settings.executor_reads_workers,
+    }
+    pools = {}
+    for name, size in sizes.items():
+        pools[name] = ExecutorPool(name, size)
+        pools[name].export_metrics()
+    return ExecutorPools(pools)
+
+
+# Global instance
+executor_pools = create_executor_pools(settings)
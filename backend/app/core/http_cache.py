@@ -0,0 +1,83 @@
+"""
+ETag and conditional GET helpers.
+
+ETags are strong validators computed from a hash of the data a read endpoint
+is about to return. The tables carry no common version column, so the content
+itself is the version; this keeps ETags identical across workers. When the
+client's ``If-None-Match`` matches, the endpoint answers 304 before building
+and serializing the response model.
+
+The hash is computed by ``load_with_etag`` on the executor thread that loads
+the data, so neither the encoding nor the digest runs on the event loop.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.executors import executor_pools
+from app.core.metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+CACHE_CONTROL = "private, no-cache"
+
+conditional_requests_total = metrics.counter(
+    "http_conditional_requests_total", "Conditional GETs by resource and outcome", ["resource", "outcome"]
+)
+
+
+def compute_etag(resource: str, data: Any) -> str:
+    """Strong ETag for ``data`` served as ``resource``."""
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    digest = hashlib.blake2b(resource.encode() + b":" + encoded, digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+async def load_with_etag(resource: str, pool: str, loader: Callable[..., Any], *args: Any) -> Tuple[Any, str]:
+    """Run ``loader(*args)`` on an executor pool and compute the ETag of its result on the same thread."""
+    def load() -> Tuple[Any, str]:
+        data = loader(*args)
+        return data, compute_etag(resource, data)
+
+    return await executor_pools.run(pool, load)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, response: Response, resource: str, etag: str) -> Optional[Response]:
+    """
+    Handle a conditional GET for data whose ETag is ``etag`` (see ``load_with_etag``).
+
+    Returns a 304 response when the client already has this version; otherwise
+    sets ``ETag`` and ``Cache-Control`` on ``response`` and returns None so the
+    endpoint builds its normal response.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        conditional_requests_total.inc(resource=resource, outcome="not_modified")
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    conditional_requests_total.inc(resource=resource, outcome="modified")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -0,0 +1,208 @@
+"""
+Idempotency keys for write endpoints.
+
+Submissions, uploads and declarations accept an ``Idempotency-Key`` header.
+The first request with a key claims it for its user and runs; its response
+is then stored for ``IDEMPOTENCY_TTL_SECONDS``. Retries with the same key
+get the stored response back, marked ``Idempotent-Replayed: true``, without
+touching the database or storage again.
+
+A duplicate that arrives while the first request is still running waits up
+to ``IDEMPOTENCY_WAIT_SECONDS`` for its result and answers 409 if it does not
+come. Reusing a key for a different request body answers 422. Client errors
+(4xx) are stored like successes, since retrying cannot change them; server
+errors and cancelled requests release the key so that a retry runs again.
+
+Records live in an in-process TTL + LRU store bounded by
+``IDEMPOTENCY_MAX_ENTRIES``, or in Redis with ``CACHE_BACKEND=redis``, so
+duplicates that land on different workers are caught too. Claims are atomic
+(``CacheBackend.add``), and calls to Redis run on the ``reads`` executor pool
+rather than the event loop. If the store fails, requests run unprotected.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.cache import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+from app.core.executors import executor_pools
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+# How often a duplicate checks whether the first request has finished
+POLL_INTERVAL_SECONDS = 0.05
+
+idempotent_requests_total = metrics.counter(
+    "idempotent_requests_total",
+    "Requests with an Idempotency-Key by outcome (executed, replayed, conflict, mismatch)",
+    ["operation", "outcome"],
+)
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Digest of a request body, to detect a key reused for another request."""
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    """Claims idempotency keys and replays the responses stored under them"""
+
+    def __init__(self, backend: CacheBackend, ttl: float = 86400.0, wait: float = 10.0,
+                 lock_ttl: float = 120.0, offload: bool = False):
+        self.backend = backend
+        self.ttl = ttl
+        self.wait = wait
+        self.lock_ttl = lock_ttl
+        # Network-backed stores are called on an executor pool, not the event loop
+        self.offload = offload
+
+    async def run(self, request: Request, user_id: str, operation: str, payload: Any,
+                  handler: Callable[[], Any], status_code: int = 200) -> Any:
+        """
+        Run ``handler`` once per ``Idempotency-Key``.
+
+        Without the header, ``handler`` simply runs. It may return an
+        awaitable, e.g. a call on an executor pool. ``payload`` is the request
+        body (or what identifies it) and is compared across retries.
+        ``status_code`` is the status of a successful response, which
+        replays repeat.
+
+        Raises:
+            HTTPException: 400 for a malformed key, 409 while a duplicate is
+                still running, 422 for a key reused with another payload, or
+                the stored client error of the first request
+        """
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return await self._call(handler)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters")
+
+        record_key = f"idempotency:{user_id}:{operation}:{key}"
+        fingerprint = request_fingerprint(payload)
+        deadline = time.monotonic() + self.wait
+        while True:
+            try:
+                claimed = await self._store(
+                    self.backend.add, record_key, {"state": PENDING, "fingerprint": fingerprint}, self.lock_ttl
+                )
+                record = None if claimed else await self._store(self.backend.get, record_key)
+            except Exception as e:
+                logger.warning(f"Idempotency store failed, running {operation} unprotected: {e}")
+                return await self._call(handler)
+
+            if claimed:
+                idempotent_requests_total.inc(operation=operation, outcome="executed")
+                return await self._execute(record_key, fingerprint, handler, status_code)
+            if record is None:
+                # The first request failed and released the key between our calls
+                continue
+            if record["fingerprint"] != fingerprint:
+                idempotent_requests_total.inc(operation=operation, outcome="mismatch")
+                raise HTTPException(
+                    status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+                )
+            if record["state"] == COMPLETED:
+                idempotent_requests_total.inc(operation=operation, outcome="replayed")
+                return self._replay(record)
+            if time.monotonic() >= deadline:
+                idempotent_requests_total.inc(operation=operation, outcome="conflict")
+                raise HTTPException(
+                    status_code=409, detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress"
+                )
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    @staticmethod
+    async def _call(handler: Callable[[], Any]) -> Any:
+        result = handler()
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _store(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.offload:
+            return await executor_pools.run("reads", fn, *args)
+        return fn(*args)
+
+    async def _execute(self, record_key: str, fingerprint: str, handler: Callable[[], Any],
+                       status_code: int = 200) -> Any:
+        settled = False
+        try:
+            result = await self._call(handler)
+            settled = True
+            await self._complete(record_key, fingerprint, status_code, jsonable_encoder(result))
+            return result
+        except HTTPException as e:
+            if e.status_code < 500:
+                settled = True
+                await self._complete(record_key, fingerprint, e.status_code, e.detail, e.headers)
+            raise
+        finally:
+            if not settled:
+                # Server errors and cancelled requests release the key so that a retry runs again;
+                # shielded so a second cancellation cannot leave it pending
+                await asyncio.shield(self._release(record_key))
+
+    async def _complete(self, record_key: str, fingerprint: str, status_code: int, body: Any,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+        record = {
+            "state": COMPLETED,
+            "fingerprint": fingerprint,
+            "status_code": status_code,
+            "body": jsonable_encoder(body),
+            "headers": dict(headers or {}),
+        }
+        try:
+            await self._store(self.backend.set, record_key, record, self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not store idempotent response: {e}")
+            await self._release(record_key)
+
+    async def _release(self, record_key: str) -> None:
+        try:
+            await self._store(self.backend.delete, record_key)
+        except Exception as e:
+            logger.warning(f"Could not release idempotency key: {e}")
+
+    @staticmethod
+    def _replay(record: Dict[str, Any]) -> JSONResponse:
+        headers = {**record["headers"], REPLAYED_HEADER: "true"}
+        if record["status_code"] >= 400:
+            # Raised, so the error goes through the same handlers as the original
+            raise HTTPException(status_code=record["status_code"], detail=record["body"], headers=headers)
+        return JSONResponse(content=record["body"], status_code=record["status_code"], headers=headers)
+
+
+def create_idempotency_backend(settings) -> CacheBackend:
+    """Shared Redis store with ``CACHE_BACKEND=redis``, else a bounded in-process one."""
+    if settings.cache_backend.lower() == "redis":
+        return RedisCacheBackend(url=settings.cache_redis_url)
+    return InMemoryCacheBackend(max_entries=settings.idempotency_max_entries)
+
+
+# Global instance
+idempotency_store = IdempotencyStore(
+    create_idempotency_backend(settings),
+    ttl=settings.idempotency_ttl_seconds,
+    wait=settings.idempotency_wait_seconds,
+    lock_ttl=settings.idempotency_lock_seconds,
+    offload=settings.cache_backend.lower() == "redis",
+)
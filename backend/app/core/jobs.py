@@ -0,0 +1,310 @@
+"""
+In-process background jobs with status records.
+
+A ``JobQueue`` accepts work from a request, answers at once with a job ID and
+runs the work later on a fixed number of asyncio workers, so at most
+``workers`` jobs run at a time however many requests arrive. Blocking steps
+belong on an executor pool (``app.core.executors``), as in the routes.
+
+Every job has a status record (queued, running, succeeded or failed, the
+state of each named step and whatever results the job reports) kept for
+``ttl`` seconds. Records live in an in-process TTL + LRU store, or in Redis
+with ``CACHE_BACKEND=redis``, so a status request served by another worker
+process still finds them; writes to Redis run on the ``writes`` executor pool
+rather than the event loop. The jobs themselves run in the process that
+accepted them: a process that stops drains its queue for a while, and marks
+what is left as failed so clients know to resubmit. Work a job awaits
+through ``Job.shield`` (a call on an executor thread, which cannot be
+stopped) is waited for instead, and its outcome recorded.
+
+When ``max_pending`` jobs are waiting, new ones are refused with 503 and a
+``Retry-After``.
+"""
+
+import asyncio
+import copy
+import inspect
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from app.core.cache import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.core.executors import executor_pools
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+PENDING = "pending"
+SKIPPED = "skipped"
+
+# Seconds a client is asked to wait when the queue is full
+RETRY_AFTER_SECONDS = 5
+
+jobs_total = metrics.counter("jobs_total", "Finished background jobs by queue and status", ["queue", "status"])
+job_queue_depth = metrics.gauge("job_queue_depth", "Background jobs waiting for a worker", ["queue"])
+job_duration_seconds = metrics.histogram(
+    "job_duration_seconds", "Time from accepting a background job to finishing it", ["queue"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Job:
+    """A running job; handlers report steps and results through it"""
+
+    def __init__(self, queue: "JobQueue", record: Dict[str, Any]):
+        self._queue = queue
+        self.record = record
+        # Cancelled while shielded work was running; the queue records its outcome
+        self.detached = False
+
+    @property
+    def id(self) -> str:
+        return self.record["job_id"]
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self.record["user_id"]
+
+    @asynccontextmanager
+    async def step(self, name: str) -> AsyncIterator[None]:
+        """Mark step ``name`` running, then succeeded, or failed if the block raises."""
+        await self._set_step(name, RUNNING)
+        try:
+            yield
+        except BaseException:
+            if not self.detached:
+                await self._set_step(name, FAILED)
+            raise
+        await self._set_step(name, SUCCEEDED)
+
+    async def shield(self, work: Awaitable[Any], on_result: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Await ``work`` without abandoning it if the job is cancelled.
+
+        For calls on an executor pool: the thread keeps running when the job
+        is cancelled at shutdown, so instead of failing the job, the queue
+        waits for the call and records its outcome. On success ``on_result``
+        (which may be a coroutine function) gets the result, the running step
+        succeeds and the steps left are skipped; on error the job fails.
+        """
+        future = asyncio.ensure_future(work)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.detached = True
+            self._queue._detach(self, future, on_result)
+            raise
+
+    async def skip(self, name: str) -> None:
+        await self._set_step(name, SKIPPED)
+
+    async def update(self, **results: Any) -> None:
+        """Add results to the job's status record."""
+        self.record["result"].update(results)
+        await self._queue.save(self.record)
+
+    async def _set_step(self, name: str, status: str) -> None:
+        self.record["steps"][name] = status
+        await self._queue.save(self.record)
+
+
+class JobQueue:
+    """Bounded queue of background jobs run by a fixed number of workers"""
+
+    def __init__(self, name: str, store: CacheBackend, workers: int = 4, max_pending: int = 1000,
+                 ttl: float = 86400.0, offload: bool = False):
+        self.name = name
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        # Network-backed stores are written on an executor pool, not the event loop
+        self.offload = offload
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._detached: Set[asyncio.Task] = set()
+
+    def export_metrics(self) -> None:
+        """Report how many jobs are waiting for a worker."""
+        job_queue_depth.set_function(lambda: self._queue.qsize() if self._queue else 0, queue=self.name)
+
+    async def enqueue(self, user_id: Optional[str], steps: List[str],
+                      handler: Callable[[Job], Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Accept a job and return its status record.
+
+        Workers are started on first use. ``steps`` names the steps the
+        handler will report, so clients see the whole pipeline from the start.
+
+        Raises:
+            HTTPException: 503 if the queue is full or job status cannot be stored
+        """
+        self._start()
+        if self._queue.qsize() >= self.max_pending:
+            raise HTTPException(
+                status_code=503, detail=f"Too many {self.name} jobs are queued, please retry",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        created_at = _now()
+        record = {
+            "job_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": QUEUED,
+            "steps": dict.fromkeys(steps, PENDING),
+            "result": {},
+            "error": None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        try:
+            await self._store(self.store.set, self._key(record["job_id"]), copy.deepcopy(record), self.ttl)
+        except Exception as e:
+            logger.error(f"Could not store {self.name} job: {e}")
+            raise HTTPException(status_code=503, detail="Background processing is unavailable")
+        self._queue.put_nowait((Job(self, record), handler, asyncio.get_running_loop().time()))
+        return copy.deepcopy(record)
+
+    def get(self, job_id: str, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Status record of a job, or None if it is unknown, expired or not the user's."""
+        record = self.store.get(self._key(job_id))
+        if record is None or str(record.get("user_id")) != str(user_id):
+            return None
+        return record
+
+    async def save(self, record: Dict[str, Any]) -> None:
+        record["updated_at"] = _now()
+        try:
+            # A snapshot, so the write is not affected by later changes to the record
+            await self._store(self.store.set, self._key(record["job_id"]), copy.deepcopy(record), self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not update {self.name} job {record['job_id']}: {e}")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Let queued jobs finish for up to ``timeout`` seconds, then fail the rest.
+
+        Shielded work still running (see ``Job.shield``) is waited for, since
+        its thread would be waited for anyway when the executor pools close.
+        """
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} jobs still pending after {timeout:g}s, failing them")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._detached:
+            logger.warning(f"Waiting for {len(self._detached)} running {self.name} jobs to record their outcome")
+            await asyncio.wait(set(self._detached))
+        while not self._queue.empty():
+            job, _, _ = self._queue.get_nowait()
+            await self._fail(job, 503, "Interrupted by a server restart, please resubmit")
+        self._queue, self._tasks = None, []
+
+    def _start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def _work(self) -> None:
+        while True:
+            job, handler, accepted_at = await self._queue.get()
+            try:
+                await self._run(job, handler)
+            except asyncio.CancelledError:
+                if not job.detached:
+                    await self._fail(job, 503, "Interrupted by a server restart, please resubmit")
+                raise
+            finally:
+                job_duration_seconds.observe(asyncio.get_running_loop().time() - accepted_at, queue=self.name)
+                self._queue.task_done()
+
+    async def _run(self, job: Job, handler: Callable[[Job], Awaitable[Any]]) -> None:
+        job.record["status"] = RUNNING
+        await self.save(job.record)
+        try:
+            await handler(job)
+        except HTTPException as e:
+            await self._fail(job, e.status_code, e.detail)
+            return
+        except Exception as e:
+            logger.error(f"{self.name} job {job.id} failed: {e}")
+            await self._fail(job, 500, "Processing failed")
+            return
+        await self._succeed(job)
+
+    def _detach(self, job: Job, future: asyncio.Future, on_result: Optional[Callable[[Any], Any]]) -> None:
+        """Record the outcome of a cancelled job's shielded work once it finishes."""
+        task = asyncio.ensure_future(self._settle(job, future, on_result))
+        self._detached.add(task)
+        task.add_done_callback(self._detached.discard)
+
+    async def _settle(self, job: Job, future: asyncio.Future, on_result: Optional[Callable[[Any], Any]]) -> None:
+        await asyncio.wait([future])
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled() or error is not None:
+            self._settle_steps(job, FAILED)
+            if isinstance(error, HTTPException):
+                await self._fail(job, error.status_code, error.detail)
+            else:
+                logger.error(f"{self.name} job {job.id} failed: {error}")
+                await self._fail(job, 500, "Processing failed")
+            return
+        if on_result is not None:
+            result = on_result(future.result())
+            if inspect.isawaitable(result):
+                await result
+        self._settle_steps(job, SUCCEEDED)
+        await self._succeed(job)
+
+    @staticmethod
+    def _settle_steps(job: Job, running_status: str) -> None:
+        steps = job.record["steps"]
+        for name, status in steps.items():
+            if status == RUNNING:
+                steps[name] = running_status
+            elif status == PENDING:
+                steps[name] = SKIPPED
+
+    async def _succeed(self, job: Job) -> None:
+        job.record["status"] = SUCCEEDED
+        await self.save(job.record)
+        jobs_total.inc(queue=self.name, status=SUCCEEDED)
+
+    async def _fail(self, job: Job, status_code: int, detail: Any) -> None:
+        job.record["status"] = FAILED
+        job.record["error"] = {"status_code": status_code, "detail": detail}
+        await self.save(job.record)
+        jobs_total.inc(queue=self.name, status=FAILED)
+
+    async def _store(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.offload:
+            return await executor_pools.run("writes", fn, *args)
+        return fn(*args)
+
+    def _key(self, job_id: str) -> str:
+        return f"job:{self.name}:{job_id}"
+
+
+def create_job_store(settings) -> CacheBackend:
+    """Shared Redis store with ``CACHE_BACKEND=redis``, else a bounded in-process one."""
+    if settings.cache_backend.lower() == "redis":
+        return RedisCacheBackend(url=settings.cache_redis_url)
+    return InMemoryCacheBackend(max_entries=settings.submission_max_jobs)
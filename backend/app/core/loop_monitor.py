@@ -0,0 +1,126 @@
+"""
+Event-loop lag monitor.
+
+Synchronous Supabase and storage code run on the event loop stalls it for
+every other request. Routes hand such calls to the executor pools
+(``app.core.executors``); this monitor catches whatever still blocks. It
+measures loop lag continuously and exports it as metrics. A watchdog thread
+notices when the loop has stopped responding and logs the stack of the
+blocking frame while the stall is still in progress, e.g.
+``DocumentService.upload_file`` inside ``storage.upload``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+loop_lag_seconds = metrics.gauge(
+    "event_loop_lag_seconds", "Most recent event loop scheduling lag"
+)
+loop_lag_histogram = metrics.histogram(
+    "event_loop_lag_distribution_seconds", "Event loop scheduling lag", buckets=LAG_BUCKETS
+)
+loop_stalls_total = metrics.counter(
+    "event_loop_stalls_total", "Event loop stalls longer than the lag threshold"
+)
+
+
+def _blocking_summary(frame) -> str:
+    """Innermost application frame of a stack, e.g. ``DocumentService.upload_file (file:line)``."""
+    while frame is not None:
+        if os.path.abspath(frame.f_code.co_filename).startswith(APP_ROOT):
+            return f"{frame.f_code.co_qualname} ({os.path.relpath(frame.f_code.co_filename, os.path.dirname(APP_ROOT))}:{frame.f_lineno})"
+        frame = frame.f_back
+    return "outside application code"
+
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag and reports blocking calls.
+
+    A coroutine sleeps for ``interval`` seconds and records how late it wakes
+    up. A daemon thread checks the coroutine's heartbeat; when it is older than
+    ``interval + threshold`` the loop is blocked, and the stack of the loop
+    thread is logged once for that stall.
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, stack_limit: int = 25):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self._task is not None:
+            return
+        self._stopped.clear()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._heartbeat = time.monotonic()
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled - self.interval)
+            loop_lag_seconds.set(lag)
+            loop_lag_histogram.observe(lag)
+            if lag >= self.threshold:
+                loop_stalls_total.inc()
+                if self._reported_heartbeat != self._heartbeat:
+                    # The stall ended before the watchdog saw it
+                    logger.warning(f"Event loop lag of {lag * 1000:.0f}ms")
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.threshold or self._reported_heartbeat == heartbeat:
+                continue
+            self._reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=self.stack_limit))
+            logger.warning(
+                f"Event loop blocked for {blocked_for * 1000:.0f}ms+ in {_blocking_summary(frame)}\n{stack}"
+            )
+
+
+# Global instance, started by the application startup hook
+loop_monitor = EventLoopMonitor()
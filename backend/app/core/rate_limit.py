@@ -0,0 +1,166 @@
+"""
+Per-user rate limits for write endpoints.
+
+Each limit is a token bucket: a user may send ``burst`` requests at once,
+then ``rate`` per second. Routes opt in with
+``dependencies=[Depends(rate_limit("writes"))]``; the check runs right after
+authentication, so a request over the limit gets ``429 Too Many Requests``
+with ``Retry-After`` before any database work.
+
+Buckets are kept with the generic cell rate algorithm, which stores one
+timestamp per user and limit (the time at which the bucket will be full
+again) instead of a token count and a refill time. In-process timestamps live
+in an LRU bounded by ``RATE_LIMIT_MAX_KEYS``. With ``CACHE_BACKEND=redis``
+they live in Redis and are updated by a Lua script using the Redis clock, so
+every worker draws from the same bucket. If Redis fails, requests are
+admitted.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from fastapi import Depends, HTTPException
+
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+from app.core.metrics import metrics
+from app.core.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+rate_limited_requests_total = metrics.counter(
+    "rate_limited_requests_total", "Requests rejected with 429 by limit", ["limit"]
+)
+
+# Returns the seconds until the request would be admitted, or "0" after admitting it
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if now < allow_at then
+  return tostring(allow_at - now)
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+
+class Limit(NamedTuple):
+    """Token bucket refilled at ``rate`` per second, holding ``burst`` tokens"""
+
+    rate: float
+    burst: int
+
+
+class InMemoryRateLimiter:
+    """Thread-safe buckets held in the worker process"""
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._full_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: Limit) -> float:
+        """Take a token; 0 when admitted, else the seconds until one is available."""
+        interval = 1.0 / limit.rate
+        with self._lock:
+            now = self._clock()
+            full_at = max(self._full_at.get(key, now), now) + interval
+            allow_at = full_at - limit.burst * interval
+            if now < allow_at:
+                return allow_at - now
+            self._full_at[key] = full_at
+            self._full_at.move_to_end(key)
+            # Evicting a key only refills that user's bucket early
+            while len(self._full_at) > self.max_keys:
+                self._full_at.popitem(last=False)
+        return 0.0
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+
+class RedisRateLimiter:
+    """Buckets shared by every worker through Redis"""
+
+    def __init__(self, url: Optional[str] = None, client: Any = None, prefix: str = "enrollment:ratelimit:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ConfigurationError("CACHE_BACKEND=redis requires the 'redis' package")
+            if not url:
+                raise ConfigurationError("CACHE_REDIS_URL must be set when CACHE_BACKEND=redis")
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    def acquire(self, key: str, limit: Limit) -> float:
+        """Take a token; 0 when admitted, else the seconds until one is available."""
+        return float(self._script(keys=[self.prefix + key], args=[1.0 / limit.rate, limit.burst]))
+
+
+class RateLimiter:
+    """Named per-user limits over a bucket store"""
+
+    def __init__(self, store, limits: Dict[str, Limit], enabled: bool = True):
+        self.store = store
+        self.limits = limits
+        self.enabled = enabled
+
+    def check(self, name: str, user_id: Optional[str]) -> None:
+        """
+        Count a request of ``user_id`` against limit ``name``.
+
+        Raises:
+            HTTPException: 429 with ``Retry-After`` if the user is over the limit
+        """
+        if not self.enabled or not user_id:
+            return
+        try:
+            retry_after = self.store.acquire(f"{name}:{user_id}", self.limits[name])
+        except Exception as e:
+            logger.warning(f"Rate limiter failed, admitting request: {e}")
+            return
+        if retry_after > 0:
+            rate_limited_requests_total.inc(limit=name)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+def rate_limit(name: str) -> Callable[..., None]:
+    """Route dependency applying limit ``name`` to the current user."""
+    def dependency(current_user: dict = Depends(get_current_user)) -> None:
+        rate_limiter.check(name, current_user.get("id"))
+    return dependency
+
+
+def create_rate_limiter(settings) -> RateLimiter:
+    """Limits from the ``RATE_LIMIT_*`` settings, shared through Redis with ``CACHE_BACKEND=redis``."""
+    if settings.cache_backend.lower() == "redis":
+        store = RedisRateLimiter(url=settings.cache_redis_url)
+    else:
+        store = InMemoryRateLimiter(max_keys=settings.rate_limit_max_keys)
+    limits = {
+        "auto_save": Limit(settings.rate_limit_auto_save_per_second, settings.rate_limit_auto_save_burst),
+        "writes": Limit(settings.rate_limit_writes_per_second, settings.rate_limit_writes_burst),
+    }
+    return RateLimiter(store, limits, enabled=settings.rate_limit_enabled)
+
+
+# Global instance
+rate_limiter = create_rate_limiter(settings)
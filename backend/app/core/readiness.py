@@ -0,0 +1,153 @@
+"""
+Readiness probes for the Supabase database, storage and auth APIs.
+
+``/health`` only says the process is up. ``/ready`` says whether it can serve
+requests: each dependency is probed in the background every
+``READINESS_PROBE_INTERVAL_SECONDS`` with a cheap call (one row from
+``applications``, the bucket list, GoTrue's ``/health``), and ``/ready``
+returns the cached results. Load balancers can therefore poll it as often as
+they like without adding load on Supabase.
+
+A probe that fails, or takes longer than ``READINESS_PROBE_TIMEOUT_SECONDS``,
+marks the instance not ready until a later probe succeeds. So do results
+older than ``STALE_INTERVALS`` intervals, which means the probe loop itself
+is stuck. Probes go through the shared HTTP pool, so an open circuit breaker
+shows up here too.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.supabase_client import SupabaseClients, supabase_clients
+
+logger = logging.getLogger(__name__)
+
+# Results older than this many probe intervals count as failures
+STALE_INTERVALS = 3
+
+readiness_probe_up = metrics.gauge(
+    "readiness_probe_up", "Whether the last probe of a dependency succeeded", ["dependency"]
+)
+readiness_probe_latency_seconds = metrics.gauge(
+    "readiness_probe_latency_seconds", "Duration of the last probe of a dependency", ["dependency"]
+)
+
+
+def create_probes(clients: SupabaseClients, settings) -> Dict[str, Callable[[], Any]]:
+    """Cheap calls that succeed only when each Supabase API is reachable."""
+
+    def database() -> Any:
+        return clients.service.table("applications").select("id").limit(1).execute()
+
+    def storage() -> Any:
+        return clients.service.storage.list_buckets()
+
+    def auth() -> Any:
+        if settings.use_memory_backend:
+            return clients.service.auth.health()
+        response = clients.http_client.get(
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/health",
+            headers={"apikey": settings.supabase_anon_key},
+        )
+        response.raise_for_status()
+        return response
+
+    return {"database": database, "storage": storage, "auth": auth}
+
+
+class ReadinessMonitor:
+    """Runs dependency probes on an interval and caches their results"""
+
+    def __init__(self, probes: Dict[str, Callable[[], Any]], interval: float = 5.0, timeout: float = 2.0):
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._running: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start probing from the running event loop."""
+        if self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Readiness probes started (every {self.interval:g}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check(self) -> None:
+        """Probe every dependency once, concurrently."""
+        await asyncio.gather(*(self._probe(name, probe) for name, probe in self.probes.items()))
+
+    def report(self) -> Tuple[bool, Dict[str, Any]]:
+        """Whether every dependency is up, and the body served by ``/ready``."""
+        if not self._results:
+            return False, {"status": "starting", "checks": {}}
+        stale_before = time.monotonic() - STALE_INTERVALS * self.interval
+        checks = {}
+        for name in self.probes:
+            result = dict(self._results.get(name, {"status": "unknown"}))
+            if result["status"] == "up" and self._checked_at[name] < stale_before:
+                result.update(status="down", error="probe results are stale")
+            checks[name] = result
+        ready = all(check["status"] == "up" for check in checks.values())
+        return ready, {"status": "ready" if ready else "not_ready", "checks": checks}
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self, name: str, probe: Callable[[], Any]) -> None:
+        if name in self._running:
+            # A probe that timed out is still blocking its thread; don't pile up more
+            self._record(name, self.timeout, "previous probe has not returned")
+            return
+        self._running.add(name)
+        start = time.monotonic()
+        future = asyncio.get_running_loop().run_in_executor(None, probe)
+        future.add_done_callback(lambda _: self._running.discard(name))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            error = None
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self._record(name, time.monotonic() - start, error)
+
+    def _record(self, name: str, latency: float, error: Optional[str]) -> None:
+        result = {
+            "status": "up" if error is None else "down",
+            "latency_ms": round(latency * 1000, 1),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if error is not None:
+            result["error"] = error
+            if self._results.get(name, {}).get("status") != "down":
+                logger.warning(f"Readiness probe for {name} failed: {error}")
+        self._results[name] = result
+        self._checked_at[name] = time.monotonic()
+        readiness_probe_up.set(1 if error is None else 0, dependency=name)
+        readiness_probe_latency_seconds.set(latency, dependency=name)
+
+
+# Global instance, started by the application startup hook
+readiness_monitor = ReadinessMonitor(
+    create_probes(supabase_clients, settings),
+    interval=settings.readiness_probe_interval_seconds,
+    timeout=settings.readiness_probe_timeout_seconds,
+)
@@ -0,0 +1,210 @@
+"""
+Circuit breakers and bulkheads for external dependencies.
+
+Each dependency (the Supabase database, storage and auth APIs) gets its own
+``Dependency``: a bulkhead that bounds how many calls may be in flight at
+once, and a circuit breaker that opens after consecutive failures. While a
+breaker is open, calls fail immediately with ``ExternalServiceError`` instead
+of waiting out timeouts. After ``CIRCUIT_BREAKER_RESET_SECONDS`` one trial
+call is let through; its outcome closes or reopens the breaker. A full
+bulkhead also fails fast, after a short wait for a free slot, so one slow
+dependency cannot hold every worker thread.
+
+Breaker states, transitions, rejections and in-flight calls are exported as
+metrics.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceError
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Exported value of each breaker state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+dependency_circuit_state = metrics.gauge(
+    "dependency_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["dependency"]
+)
+dependency_circuit_transitions_total = metrics.counter(
+    "dependency_circuit_transitions_total", "Circuit breaker state changes", ["dependency", "state"]
+)
+dependency_rejections_total = metrics.counter(
+    "dependency_rejections_total", "Calls failed fast (circuit_open or bulkhead_full)", ["dependency", "reason"]
+)
+dependency_in_flight = metrics.gauge(
+    "dependency_in_flight", "Calls in flight per dependency", ["dependency"]
+)
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; in half-open state only one trial at a time."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._transition(HALF_OPEN)
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel(self) -> None:
+        """Give back a trial that was allowed but never made."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = self._clock()
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        # Called with the lock held
+        self._state = state
+        dependency_circuit_transitions_total.inc(dependency=self.name, state=state)
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit breaker for {self.name} is now {state}")
+
+
+class Bulkhead:
+    """Bounds the calls in flight to one dependency"""
+
+    def __init__(self, limit: int, wait: float = 0.0):
+        self.limit = limit
+        self.wait = wait
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting up to ``wait`` seconds for one."""
+        if self.wait > 0:
+            acquired = self._semaphore.acquire(timeout=self.wait)
+        else:
+            acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+
+class Dependency:
+    """Circuit breaker and bulkhead guarding one external dependency"""
+
+    def __init__(self, name: str, service: str, breaker: CircuitBreaker, bulkhead: Bulkhead):
+        self.name = name
+        self.service = service
+        self.breaker = breaker
+        self.bulkhead = bulkhead
+
+    def export_metrics(self) -> None:
+        """Report this dependency's breaker state and in-flight calls."""
+        dependency_circuit_state.set_function(lambda: STATE_VALUES[self.breaker.state], dependency=self.name)
+        dependency_in_flight.set_function(lambda: self.bulkhead.in_flight, dependency=self.name)
+
+    def call(self, fn: Callable[[], T], is_failure: Optional[Callable[[T], bool]] = None) -> T:
+        """
+        Run ``fn`` through the bulkhead and circuit breaker.
+
+        Exceptions raised by ``fn`` count as failures, as do results for
+        which ``is_failure`` returns True.
+
+        Raises:
+            ExternalServiceError: If the circuit is open or the bulkhead is full
+        """
+        if not self.breaker.allow():
+            dependency_rejections_total.inc(dependency=self.name, reason="circuit_open")
+            raise ExternalServiceError(self.service, "temporarily unavailable, failing fast")
+        if not self.bulkhead.acquire():
+            self.breaker.cancel()
+            dependency_rejections_total.inc(dependency=self.name, reason="bulkhead_full")
+            raise ExternalServiceError(self.service, "too many concurrent requests")
+
+        try:
+            result = fn()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.bulkhead.release()
+
+        if is_failure is not None and is_failure(result):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+
+def create_dependencies(settings) -> Dict[str, Dependency]:
+    """Guards for the Supabase database, storage and auth APIs, from settings."""
+    limits = {
+        "database": ("Database", settings.bulkhead_database_limit),
+        "storage": ("Storage", settings.bulkhead_storage_limit),
+        "auth": ("Auth", settings.bulkhead_auth_limit),
+    }
+    dependencies = {}
+    for name, (service, limit) in limits.items():
+        breaker = CircuitBreaker(
+            name,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_seconds,
+        )
+        dependencies[name] = Dependency(name, service, breaker, Bulkhead(limit, wait=settings.bulkhead_wait_seconds))
+        dependencies[name].export_metrics()
+    return dependencies
+
+
+# Global instance
+dependencies = create_dependencies(settings)
@@ -1,15 +1,20 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
 from app.core.config import settings
+from app.core.tracing import traced
 import logging
+import secrets
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def get_supabase_client():
     """Get Supabase service client for auth operations"""
-    from app.db.supabase_client import supabase_service
+    from app.db.supabase_client import supabase_clients
+    supabase_service = supabase_clients.service
     if not supabase_service:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -17,12 +22,24 @@ def get_supabase_client():
         )
     return supabase_service
 
+@traced("auth.get_current_user")
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Validate Supabase JWT token using official Supabase client"""
-    token = credentials.credentials
+    user = authenticate_token(credentials.credentials)
+    if settings.prefetch_on_login:
+        # Warm the cache for the screens that follow login
+        from app.services.prefetch_service import prefetch_service
+        prefetch_service.schedule(user["id"])
+    return user
 
+
+def authenticate_token(token: str) -> dict:
+    """Resolve the user of a bearer token"""
     # For development/testing, allow requests without authentication if no real Supabase is configured
-    if not settings.supabase_url or settings.supabase_url == "https://your-project.supabase.co":
+    # The in-memory backend resolves users from the token itself
+    if not settings.use_memory_backend and (
+        not settings.supabase_url or settings.supabase_url == "https://your-project.supabase.co"
+    ):
         logger.warning("Using mock authentication - Supabase not properly configured")
         return {
             "id": "mock-user-id",
@@ -77,3 +94,33 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def verify_service_token(expected: Optional[str], credentials: Optional[HTTPAuthorizationCredentials]) -> None:
+    """
+    Admit an operator endpoint's caller only with the endpoint's configured token.
+
+    Parent JWTs are not accepted. Without a configured token the endpoint
+    does not exist (404).
+    """
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid service token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def require_debug_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> None:
+    """Allow the /debug endpoints only with ``DEBUG_API_TOKEN``"""
+    verify_service_token(settings.debug_api_token, credentials)
+
+
+def require_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> None:
+    """Serve /metrics only with ``METRICS_ENABLED``, and only with ``METRICS_TOKEN`` when one is set"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    if settings.metrics_token:
+        verify_service_token(settings.metrics_token, credentials)
@@ -0,0 +1,110 @@
+"""
+Fast response serialization for trusted database rows.
+
+Read endpoints return rows that came from our own tables through the
+repositories, so validating them again through the endpoint's
+``response_model`` only costs CPU. ``trusted_response`` projects a row onto
+the fields the response model declares (missing fields get the model's
+defaults, extra columns are dropped, nested models are projected
+recursively) and renders the result directly with a fast JSON encoder:
+``orjson`` when it is installed, otherwise ``pydantic_core.to_json``.
+Timestamp columns are sent as stored (ISO 8601 strings from PostgREST)
+rather than re-formatted, so ``+00:00`` is not rewritten to ``Z``.
+
+The ``response_model`` stays on the route, so the OpenAPI schema is unchanged.
+Set ``FAST_RESPONSES_ENABLED=false`` to go back to full response validation,
+e.g. while debugging a schema change.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union, get_args, get_origin
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return pydantic_core.to_json(content, fallback=str)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the fast encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# (field name, default, nested model, nested value is a list)
+_FieldPlan = Tuple[str, Any, Optional[Type[BaseModel]], bool]
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """The model nested in ``annotation`` (``Model``, ``Optional[Model]`` or ``List[Model]``)."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        for arg in get_args(annotation):
+            if arg is not type(None):
+                return _nested_model(arg)
+        return None, False
+    if origin in (list, List):
+        args = get_args(annotation)
+        model, _ = _nested_model(args[0]) if args else (None, False)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _field_plan(model: Type[BaseModel]) -> Tuple[_FieldPlan, ...]:
+    plan = []
+    for name, field in model.model_fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        nested, is_list = _nested_model(field.annotation)
+        plan.append((name, default, nested, is_list))
+    return tuple(plan)
+
+
+def project(model: Type[BaseModel], row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Shape a trusted row like ``model(**row).model_dump(mode="json")`` without validating it."""
+    projected = {}
+    for name, default, nested, is_list in _field_plan(model):
+        value = row.get(name, default)
+        if nested is not None and value is not None:
+            if is_list:
+                value = [project(nested, item) for item in value]
+            else:
+                value = project(nested, value)
+        projected[name] = value
+    return projected
+
+
+def trusted_response(model: Type[BaseModel], row: Optional[Mapping[str, Any]],
+                     headers: Optional[Mapping[str, str]] = None) -> Union[FastJSONResponse, BaseModel, None]:
+    """
+    Response for a row read from our own tables.
+
+    Args:
+        model: Response model declared on the route
+        row: Trusted row, or None for an empty response
+        headers: Headers to send, e.g. the ETag set by ``conditional_response``
+
+    Returns:
+        A rendered response, or the validated model when fast responses are
+        disabled (FastAPI then serializes it as usual)
+    """
+    if not settings.fast_responses_enabled:
+        return model(**row) if row is not None else None
+    content = project(model, row) if row is not None else None
+    return FastJSONResponse(content, headers=dict(headers) if headers else None)
@@ -0,0 +1,363 @@
+"""
+Lightweight request tracing.
+
+Opens nested spans across routers, services, repositories and storage calls
+and exports them in the OTLP/JSON trace format, either as JSON lines in a local
+file or by POSTing to an OTLP/HTTP collector (``{endpoint}/v1/traces``).
+
+The request ID of the current request is kept in a context variable, reused as
+the trace ID and attached to every span and log record. When tracing is
+disabled, span helpers return immediately without allocating anything.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Request ID of the request being handled, if any."""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]) -> contextvars.Token:
+    """Bind a request ID to the current context."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+class RequestIdLogFilter(logging.Filter):
+    """Adds ``request_id`` to log records so formatters can include it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or "-"
+        return True
+
+
+@dataclass
+class Span:
+    """A timed unit of work within a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status_code: int = STATUS_OK
+    status_message: str = ""
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error)
+        self.events.append({
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": _otlp_attributes({
+                "exception.type": error.__class__.__name__,
+                "exception.message": str(error),
+            }),
+        })
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON ``ExportTraceServiceRequest`` per batch to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """Sends batches to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        response = self.client.post(self.url, json=payload)
+        response.raise_for_status()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to a background batch exporter.
+
+    Spans are buffered in memory and flushed every ``flush_interval`` seconds or
+    once ``max_batch_size`` spans are pending, so exporting never blocks a
+    request.
+    """
+
+    def __init__(self, service_name: str = "school-enrollment-api", exporter=None,
+                 sample_rate: float = 1.0, flush_interval: float = 2.0, max_batch_size: int = 512):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, exporter, service_name: Optional[str] = None, sample_rate: Optional[float] = None) -> None:
+        self.exporter = exporter
+        if service_name:
+            self.service_name = service_name
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if exporter is not None and self._worker is None:
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._worker.start()
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL,
+                   attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """Start a child of the current span, or a new trace if there is none."""
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return None
+        if parent is None:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return None
+            request_id = _request_id.get()
+            trace_id = _trace_id_from_request_id(request_id)
+            parent_span_id = None
+        else:
+            trace_id = parent.trace_id
+            parent_span_id = parent.span_id
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent_span_id,
+            kind=kind,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        request_id = _request_id.get()
+        if request_id:
+            span.attributes.setdefault("request.id", request_id)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        with self._lock:
+            self._pending.append(span)
+            full = len(self._pending) >= self.max_batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Export all pending spans now."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch or self.exporter is None:
+            return
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otlp() for span in batch],
+                }],
+            }]
+        }
+        try:
+            self.exporter.export(payload)
+        except Exception as e:
+            logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    def shutdown(self) -> None:
+        self._stopped = True
+        self._wakeup.set()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def _trace_id_from_request_id(request_id: Optional[str]) -> str:
+    """Reuse UUID request IDs as trace IDs so logs and traces line up."""
+    if request_id:
+        try:
+            return uuid.UUID(request_id).hex
+        except ValueError:
+            pass
+    return os.urandom(16).hex()
+
+
+# Marks the context of a trace dropped by sampling so its children are dropped too
+_UNSAMPLED = Span(name="unsampled", trace_id="", span_id="")
+
+# Global tracer, configured at startup
+tracer = Tracer()
+
+
+def configure_tracing(settings) -> None:
+    """Enable tracing from application settings."""
+    if not settings.tracing_enabled:
+        return
+    if settings.trace_otlp_endpoint:
+        exporter = OTLPHttpSpanExporter(settings.trace_otlp_endpoint)
+    else:
+        exporter = FileSpanExporter(settings.trace_export_path)
+    tracer.configure(exporter, service_name=settings.trace_service_name, sample_rate=settings.trace_sample_rate)
+    logger.info("Tracing enabled")
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL,
+         attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+    """Trace a block of code as a child of the current span."""
+    if not tracer.enabled:
+        yield None
+        return
+    current = tracer.start_span(name, kind, attributes)
+    if current is None:
+        token = _current_span.set(_UNSAMPLED)
+        try:
+            yield None
+        finally:
+            _current_span.reset(token)
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(current)
+
+
+def traced(name: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL) -> Callable:
+    """Decorator tracing every call of a sync or async function."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(cls: type) -> type:
+    """
+    Class decorator tracing every public method defined on the class.
+
+    Span names are ``ClassName.method``; the table of repositories is added as
+    the ``db.table`` attribute.
+    """
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        setattr(cls, attr_name, _traced_method(cls.__name__, attr))
+    return cls
+
+
+def _traced_method(class_name: str, func: Callable) -> Callable:
+    span_name = f"{class_name}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not tracer.enabled:
+            return func(self, *args, **kwargs)
+        with span(span_name, attributes={"db.table": getattr(self, "table_name", None)}):
+            return func(self, *args, **kwargs)
+
+    return wrapper
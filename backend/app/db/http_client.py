@@ -0,0 +1,133 @@
+"""
+Shared HTTP client for the Supabase clients.
+
+Left to itself, supabase-py builds a separate httpx client, and so a separate
+connection pool, for PostgREST, storage, auth and functions in every Supabase
+client. All of them accept an ``httpx.Client`` instead. ``create_http_client``
+builds the one client that the anon and service clients share, so database,
+storage and auth calls reuse the same kept-alive (and, over HTTP/2,
+multiplexed) connections.
+
+Each request is counted by whether it opened a new connection or reused a
+pooled one. New connections that needed a TLS handshake are counted too.
+
+With ``CIRCUIT_BREAKER_ENABLED``, every request also goes through the circuit
+breaker and bulkhead of its API (``app.core.resilience``), picked from the
+URL path. Transport errors and 5xx responses count as failures; 4xx
+responses are the caller's problem and count as successes.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.metrics import metrics
+from app.core.resilience import Dependency, dependencies as supabase_dependencies
+
+logger = logging.getLogger(__name__)
+
+supabase_http_requests_total = metrics.counter(
+    "supabase_http_requests_total",
+    "Requests to Supabase by connection use (new, reused, failed) and HTTP version",
+    ["connection", "http_version"],
+)
+supabase_tls_handshakes_total = metrics.counter(
+    "supabase_tls_handshakes_total", "TLS handshakes performed for new Supabase connections"
+)
+supabase_http_pool_connections = metrics.gauge(
+    "supabase_http_pool_connections", "Connections in the shared Supabase pool", ["state"]
+)
+
+# Supabase API path prefixes and the dependency guarding each
+DEPENDENCY_PATHS = (
+    ("/rest/v1/", "database"),
+    ("/storage/v1/", "storage"),
+    ("/auth/v1/", "auth"),
+)
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """HTTP transport that records whether each request reused a pooled connection"""
+
+    def __init__(self, dependencies: Optional[Dict[str, Dependency]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.dependencies = dependencies or {}
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        dependency = self._dependency(request.url.path)
+        if dependency is None:
+            return self._send(request)
+        return dependency.call(
+            lambda: self._send(request), is_failure=lambda response: response.status_code >= 500
+        )
+
+    def _dependency(self, path: str) -> Optional[Dependency]:
+        for prefix, name in DEPENDENCY_PATHS:
+            if path.startswith(prefix):
+                return self.dependencies.get(name)
+        return None
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        events: List[str] = []
+        caller_trace = request.extensions.get("trace")
+
+        def trace(name: str, info: Dict[str, Any]) -> None:
+            if name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                events.append(name)
+            if caller_trace is not None:
+                caller_trace(name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            supabase_http_requests_total.inc(connection="failed", http_version="none")
+            raise
+
+        opened = "connection.connect_tcp.complete" in events
+        supabase_http_requests_total.inc(
+            connection="new" if opened else "reused",
+            http_version=response.extensions.get("http_version", b"HTTP/1.1").decode("ascii"),
+        )
+        if "connection.start_tls.complete" in events:
+            supabase_tls_handshakes_total.inc()
+        return response
+
+    def pool_connections(self, predicate: Optional[Callable[[Any], bool]] = None) -> int:
+        """Number of pooled connections, optionally only those matching ``predicate``."""
+        connections = self._pool.connections
+        if predicate is None:
+            return len(connections)
+        return sum(1 for connection in connections if predicate(connection))
+
+
+def create_http_client(settings) -> httpx.Client:
+    """Build the pooled client described by the ``SUPABASE_HTTP_*`` settings."""
+    transport = InstrumentedTransport(
+        dependencies=supabase_dependencies if settings.circuit_breaker_enabled else None,
+        http2=settings.supabase_http2,
+        limits=httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry_seconds,
+        ),
+    )
+    supabase_http_pool_connections.set_function(transport.pool_connections, state="open")
+    supabase_http_pool_connections.set_function(
+        lambda: transport.pool_connections(lambda connection: connection.is_idle()), state="idle"
+    )
+
+    logger.info(
+        f"Supabase HTTP pool: http2={settings.supabase_http2}, "
+        f"max_connections={settings.supabase_http_max_connections}"
+    )
+    return httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(
+            settings.supabase_http_read_timeout_seconds,
+            connect=settings.supabase_http_connect_timeout_seconds,
+            pool=settings.supabase_http_pool_timeout_seconds,
+        ),
+        follow_redirects=True,
+    )
@@ -0,0 +1,189 @@
+"""
+Slow database call recorder.
+
+Wraps the Supabase client so every PostgREST ``execute()`` issued by a
+repository is timed. Calls slower than the configured threshold are kept in a
+bounded ring buffer with the repository method, table, operation, selected
+columns, filter columns (never their values), row count, payload size and
+duration.
+
+Only the timing runs on every call; everything else is computed for slow
+calls alone.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.tracing import get_request_id
+
+# Query builder methods that add a filter on their first argument
+FILTER_METHODS = frozenset({
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "match", "filter", "not_",
+})
+
+# Query builder methods that start an operation
+OPERATION_METHODS = frozenset({"select", "insert", "update", "upsert", "delete"})
+
+MAX_FRAMES_SEARCHED = 40
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of slow database calls."""
+
+    def __init__(self, threshold_ms: float = 200.0, capacity: int = 500):
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.total_recorded = 0
+
+    def configure(self, threshold_ms: float, capacity: int) -> None:
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.capacity = capacity
+            self._entries = deque(self._entries, maxlen=capacity)
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self.total_recorded += 1
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent entries first."""
+        with self._lock:
+            items = list(self._entries)
+        items.reverse()
+        return items[:limit] if limit else items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _calling_repository_method() -> Optional[str]:
+    """
+    Name of the outermost repository method on the stack, e.g.
+    ``EnrollmentRepository.get_full_application``.
+    """
+    frame = sys._getframe(2)
+    found = None
+    for _ in range(MAX_FRAMES_SEARCHED):
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.repositories."):
+            found = frame.f_code.co_qualname
+        elif module.startswith(("app.services.", "app.api.")):
+            break
+        frame = frame.f_back
+    return found
+
+
+def _payload_bytes(payload: Any) -> int:
+    if payload is None:
+        return 0
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class InstrumentedQuery:
+    """Proxy over a PostgREST request builder that times ``execute()``."""
+
+    def __init__(self, builder: Any, log: SlowQueryLog, table: str, operation: str = "select",
+                 payload: Any = None):
+        self._builder = builder
+        self._log = log
+        self._table = table
+        self._operation = operation
+        self._payload = payload
+        self._columns: Optional[str] = None
+        self._filter_columns: List[str] = []
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            if name in OPERATION_METHODS:
+                self._operation = name
+                if name == "select":
+                    self._columns = ",".join(args) if args else "*"
+                elif args:
+                    self._payload = args[0]
+            elif name in FILTER_METHODS and args:
+                self._filter_columns.append(str(args[0]))
+            result = attribute(*args, **kwargs)
+            if name == "execute":
+                return result
+            self._builder = result
+            return self
+
+        if name == "execute":
+            return self._timed_execute(call)
+        return call
+
+    def _timed_execute(self, call):
+        def execute(*args, **kwargs):
+            start = time.perf_counter()
+            error = None
+            result = None
+            try:
+                result = call(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                if duration_ms >= self._log.threshold_ms:
+                    self._record(duration_ms, result, error)
+        return execute
+
+    def _record(self, duration_ms: float, result: Any, error: Optional[Exception]) -> None:
+        data = getattr(result, "data", None)
+        self._log.record({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "repository_method": _calling_repository_method(),
+            "table": self._table,
+            "operation": self._operation,
+            "columns": self._columns,
+            "filter_columns": list(self._filter_columns),
+            "row_count": len(data) if isinstance(data, list) else None,
+            "payload_bytes": _payload_bytes(self._payload),
+            "duration_ms": round(duration_ms, 2),
+            "error": error.__class__.__name__ if error else None,
+            "request_id": get_request_id(),
+        })
+
+
+class InstrumentedClient:
+    """Supabase client proxy whose table queries and RPCs are timed."""
+
+    def __init__(self, client: Any, log: SlowQueryLog):
+        self._client = client
+        self.slow_query_log = log
+
+    def table(self, table_name: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.table(table_name), self.slow_query_log, table_name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, *args, **kwargs) -> InstrumentedQuery:
+        builder = self._client.rpc(fn, params or {}, *args, **kwargs)
+        return InstrumentedQuery(builder, self.slow_query_log, f"rpc:{fn}", operation="rpc", payload=params)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+# Global slow query log, configured from settings when the client is created
+slow_query_log = SlowQueryLog()
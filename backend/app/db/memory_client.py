@@ -0,0 +1,616 @@
+"""
+In-process stand-in for the Supabase client.
+
+Implements the subset of the supabase-py API used by the repositories and
+services (table queries, upserts with ``on_conflict``, the
+``mark_upload_complete`` and ``submit_application`` RPCs, storage buckets
+and ``auth.get_user``) on top of plain Python dictionaries. Latency and
+failure rates can be injected so the whole stack can be load tested and
+profiled without a real project.
+
+Select it with ``DATABASE_BACKEND=memory``.
+"""
+
+import copy
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import jwt
+from postgrest import APIResponse
+from postgrest.exceptions import APIError
+from storage3.exceptions import StorageApiError
+
+# Tables and the columns PostgREST resolves upsert conflicts on by default
+TABLE_CONFLICT_KEYS: Dict[str, Tuple[str, ...]] = {
+    "applications": ("id",),
+    "students": ("application_id",),
+    "medical_info": ("application_id",),
+    "family_info": ("application_id",),
+    "fee_responsibility": ("application_id",),
+    "academic_history": ("application_id",),
+    "financing_selections": ("application_id",),
+    "declarations": ("application_id",),
+    "documents": ("id",),
+    "application_documents": ("id",),
+    "application_progress": ("application_id",),
+}
+
+# Nullable columns of each table, returned as NULL when never written
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "applications": (
+        "user_id", "status", "submitted_at", "documents_completed",
+        "agree_audit_storage", "agree_affordability_processing",
+    ),
+    "students": (
+        "application_id", "surname", "first_name", "middle_name", "preferred_name",
+        "date_of_birth", "gender", "home_language", "id_number", "previous_grade",
+        "grade_applied_for", "previous_school",
+    ),
+    "medical_info": ("application_id", "medical_aid_name", "member_number", "conditions", "allergies"),
+    "family_info": (
+        "application_id",
+        "father_surname", "father_first_name", "father_id_number", "father_mobile", "father_email",
+        "mother_surname", "mother_first_name", "mother_id_number", "mother_mobile", "mother_email",
+        "next_of_kin_surname", "next_of_kin_first_name", "next_of_kin_relationship",
+        "next_of_kin_mobile", "next_of_kin_email",
+    ),
+    "fee_responsibility": ("application_id", "fee_person", "relationship", "fee_terms_accepted", "selected_plan"),
+    "academic_history": (
+        "application_id", "school_name", "school_type", "last_grade_completed",
+        "academic_year_completed", "reason_for_leaving", "principal_name", "school_phone_number",
+        "school_email", "school_address", "additional_notes", "report_card_url",
+    ),
+    "financing_selections": ("application_id", "plan_type", "discount_rate", "cost_of_credit", "repayment_term"),
+    "declarations": (
+        "application_id", "agree_truth", "agree_policies", "agree_financial", "agree_verification",
+        "agree_data_processing", "full_name", "city", "date_signed", "status",
+    ),
+    "documents": (
+        "application_id", "filename", "original_filename", "file_size", "content_type",
+        "document_type", "bucket_name", "file_path", "download_url", "uploaded_by",
+    ),
+    "application_documents": ("user_id", "application_id", "document_type", "file_url", "upload_status"),
+    "application_progress": ("user_id", "status", "financing_plan"),
+}
+
+# Columns with unique constraints enforced on plain inserts
+TABLE_UNIQUE_KEYS: Dict[str, Tuple[str, ...]] = {
+    table: keys for table, keys in TABLE_CONFLICT_KEYS.items() if keys != ("id",)
+}
+
+STORAGE_BUCKETS: Tuple[str, ...] = (
+    "proof_of_address", "id_documents", "payslips", "bank_statements",
+    "academic_history", "report_card",
+)
+
+PUBLIC_BASE_URL = "http://memory.supabase.local"
+
+
+@dataclass
+class FaultInjector:
+    """Latency and failure injection for a class of operations."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    rng: random.Random = None
+
+    def __post_init__(self):
+        if self.rng is None:
+            self.rng = random.Random()
+
+    def apply(self, raise_error: Callable[[], None]) -> None:
+        """Sleep for the configured latency, then fail with the configured probability."""
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self.rng.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise_error()
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _injected_db_error() -> None:
+    raise APIError({
+        "message": "Injected failure from in-memory backend",
+        "code": "503",
+        "hint": None,
+        "details": "memory backend failure_rate",
+    })
+
+
+def _injected_storage_error() -> None:
+    raise StorageApiError("Injected failure from in-memory backend", "InternalError", 503)
+
+
+class MemoryQueryBuilder:
+    """Chainable query builder mirroring the PostgREST request builder."""
+
+    def __init__(self, client: "MemorySupabaseClient", table_name: str):
+        self._client = client
+        self._table_name = table_name
+        self._operation = "select"
+        self._columns: Optional[List[str]] = None
+        self._payload: Union[Dict[str, Any], List[Dict[str, Any]], None] = None
+        self._on_conflict: Optional[Tuple[str, ...]] = None
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._order: Optional[Tuple[str, bool]] = None
+        self._range: Optional[Tuple[int, int]] = None
+
+    # Operations
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "MemoryQueryBuilder":
+        self._operation = "select"
+        joined = ",".join(columns) if columns else "*"
+        parsed = [c.strip() for c in joined.split(",") if c.strip()]
+        self._columns = None if "*" in parsed else parsed
+        return self
+
+    def insert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], **kwargs) -> "MemoryQueryBuilder":
+        self._operation = "insert"
+        self._payload = data
+        return self
+
+    def upsert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+               on_conflict: Union[str, List[str], None] = None, **kwargs) -> "MemoryQueryBuilder":
+        self._operation = "upsert"
+        self._payload = data
+        if on_conflict:
+            if isinstance(on_conflict, str):
+                on_conflict = on_conflict.split(",")
+            self._on_conflict = tuple(c.strip() for c in on_conflict)
+        return self
+
+    def update(self, data: Dict[str, Any], **kwargs) -> "MemoryQueryBuilder":
+        self._operation = "update"
+        self._payload = data
+        return self
+
+    def delete(self, **kwargs) -> "MemoryQueryBuilder":
+        self._operation = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def eq(self, column: str, value: Any) -> "MemoryQueryBuilder":
+        self._filters.append(("eq", column, value))
+        return self
+
+    def neq(self, column: str, value: Any) -> "MemoryQueryBuilder":
+        self._filters.append(("neq", column, value))
+        return self
+
+    def is_(self, column: str, value: Any) -> "MemoryQueryBuilder":
+        self._filters.append(("is", column, value))
+        return self
+
+    def in_(self, column: str, values: List[Any]) -> "MemoryQueryBuilder":
+        self._filters.append(("in", column, list(values)))
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> "MemoryQueryBuilder":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size: int, **kwargs) -> "MemoryQueryBuilder":
+        self._range = (0, size - 1)
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> "MemoryQueryBuilder":
+        self._range = (start, end)
+        return self
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        for op, column, value in self._filters:
+            current = row.get(column)
+            if op == "eq" and str(current) != str(value):
+                return False
+            if op == "neq" and str(current) == str(value):
+                return False
+            if op == "is" and current is not value and not (value in (None, "null") and current is None):
+                return False
+            if op == "in" and str(current) not in {str(v) for v in value}:
+                return False
+        return True
+
+    def execute(self) -> APIResponse:
+        self._client.db_faults.apply(_injected_db_error)
+        with self._client.lock:
+            handler = getattr(self, f"_execute_{self._operation}")
+            rows = handler()
+        return APIResponse(data=copy.deepcopy(rows), count=None)
+
+    def _execute_select(self) -> List[Dict[str, Any]]:
+        rows = [row for row in self._client.rows(self._table_name) if self._matches(row)]
+        if self._order:
+            column, desc = self._order
+            rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        if self._range:
+            start, end = self._range
+            rows = rows[start:end + 1]
+        if self._columns:
+            rows = [{c: row.get(c) for c in self._columns} for row in rows]
+        return rows
+
+    def _payload_rows(self) -> List[Dict[str, Any]]:
+        if isinstance(self._payload, list):
+            return [dict(row) for row in self._payload]
+        return [dict(self._payload or {})]
+
+    def _execute_insert(self) -> List[Dict[str, Any]]:
+        table = self._client.table_rows(self._table_name)
+        inserted = []
+        for row in self._payload_rows():
+            self._client.check_unique(self._table_name, row)
+            inserted.append(self._client.new_row(self._table_name, row))
+        table.extend(inserted)
+        return inserted
+
+    def _execute_upsert(self) -> List[Dict[str, Any]]:
+        return [
+            self._client.upsert_row(self._table_name, row, self._on_conflict)
+            for row in self._payload_rows()
+        ]
+
+    def _execute_update(self) -> List[Dict[str, Any]]:
+        updated = []
+        for row in self._client.table_rows(self._table_name):
+            if self._matches(row):
+                row.update(self._payload or {})
+                row["updated_at"] = _now()
+                updated.append(row)
+        return updated
+
+    def _execute_delete(self) -> List[Dict[str, Any]]:
+        table = self._client.table_rows(self._table_name)
+        deleted = [row for row in table if self._matches(row)]
+        table[:] = [row for row in table if not self._matches(row)]
+        return deleted
+
+
+class MemoryRPC:
+    """Pending RPC call, executed on ``execute()`` like the PostgREST builder."""
+
+    def __init__(self, client: "MemorySupabaseClient", name: str, params: Dict[str, Any]):
+        self._client = client
+        self._name = name
+        self._params = params or {}
+
+    def execute(self) -> APIResponse:
+        self._client.db_faults.apply(_injected_db_error)
+        function = self._client.functions.get(self._name)
+        if function is None:
+            raise APIError({
+                "message": f"Could not find the function public.{self._name} in the schema cache",
+                "code": "PGRST202",
+                "hint": None,
+                "details": None,
+            })
+        with self._client.lock:
+            data = function(self._client, **self._params)
+        return APIResponse(data=copy.deepcopy(data) if data is not None else [], count=None)
+
+
+def _mark_upload_complete(client: "MemorySupabaseClient", app_id: str, doc_type: str) -> None:
+    """Mark every uploaded document of a type as completed for an application."""
+    for row in client.table_rows("application_documents"):
+        if str(row.get("application_id")) == str(app_id) and row.get("document_type") == doc_type:
+            row["upload_status"] = "completed"
+            row["updated_at"] = _now()
+    return None
+
+
+# Section parameters of submit_application and the tables and progress flags they fill
+SUBMIT_SECTIONS: Tuple[Tuple[str, str, str], ...] = (
+    ("p_student", "students", "student_completed"),
+    ("p_medical", "medical_info", "medical_completed"),
+    ("p_family", "family_info", "family_completed"),
+    ("p_fee", "fee_responsibility", "fee_completed"),
+    ("p_academic_history", "academic_history", "academic_history_completed"),
+)
+
+
+def _submit_application(client: "MemorySupabaseClient", p_user_id: str,
+                        p_declaration: Optional[Dict[str, Any]] = None,
+                        **sections: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply a whole submission like the ``submit_application`` database function.
+
+    Runs under the client lock and restores the touched tables if any step
+    fails, so the submission is all-or-nothing.
+    """
+    touched = ("applications", "application_progress") + tuple(table for _, table, _ in SUBMIT_SECTIONS)
+    snapshot = {table: copy.deepcopy(client.table_rows(table)) for table in touched}
+    try:
+        application = next(
+            (row for row in client.table_rows("applications") if str(row.get("user_id")) == str(p_user_id)),
+            None,
+        )
+        if application is None:
+            application = client.new_row("applications", {"user_id": p_user_id, "status": "submitted"})
+            client.table_rows("applications").append(application)
+            client.table_rows("application_progress").append(client.new_row("application_progress", {
+                "application_id": application["id"],
+                "user_id": p_user_id,
+                "status": "submitted",
+                "student_completed": False,
+                "medical_completed": False,
+                "family_completed": False,
+                "fee_completed": False,
+                "document_types_completed": [],
+                "academic_history_completed": False,
+                "declaration_signed": False,
+            }))
+        application_id = application["id"]
+
+        changes: Dict[str, Any] = {"status": "submitted"}
+        for param, table, flag in SUBMIT_SECTIONS:
+            row = sections.pop(param, None)
+            if row is not None:
+                client.upsert_row(table, {**row, "application_id": application_id})
+                changes[flag] = True
+        if sections:
+            raise TypeError(f"submit_application() got unexpected parameters {sorted(sections)}")
+
+        application["status"] = "submitted"
+        application["submitted_at"] = _now()
+        for flag in ("agree_audit_storage", "agree_affordability_processing"):
+            if (p_declaration or {}).get(flag) is not None:
+                application[flag] = p_declaration[flag]
+        application["updated_at"] = _now()
+
+        progress = next(
+            (row for row in client.table_rows("application_progress") if str(row.get("application_id")) == str(application_id)),
+            None,
+        )
+        if progress is not None:
+            progress.update(changes)
+            progress["updated_at"] = _now()
+    except Exception:
+        for table, rows in snapshot.items():
+            client.tables[table] = rows
+        raise
+    return [{"application_id": application_id, "progress": progress}]
+
+
+def _application_upload_summary(client: "MemorySupabaseClient") -> List[Dict[str, Any]]:
+    """Compute the ``application_upload_summary`` view from application_documents."""
+    completed: Dict[str, set] = {}
+    for row in client.table_rows("application_documents"):
+        if row.get("upload_status") == "completed":
+            completed.setdefault(str(row.get("application_id")), set()).add(row.get("document_type"))
+    return [
+        {
+            "application_id": application_id,
+            "completed_categories": len(types),
+            "uploaded_types": sorted(types),
+        }
+        for application_id, types in completed.items()
+    ]
+
+
+class MemoryBucket:
+    """A single storage bucket."""
+
+    def __init__(self, client: "MemorySupabaseClient", name: str):
+        self._client = client
+        self.name = name
+        self.objects: Dict[str, Dict[str, Any]] = {}
+
+    def upload(self, path: str, file: bytes, file_options: Optional[Dict[str, Any]] = None) -> SimpleNamespace:
+        self._client.storage_faults.apply(_injected_storage_error)
+        options = file_options or {}
+        upsert = str(options.get("upsert", "false")).lower() == "true"
+        with self._client.lock:
+            if path in self.objects and not upsert:
+                raise StorageApiError("The resource already exists", "Duplicate", 409)
+            self.objects[path] = {
+                "content": bytes(file),
+                "content_type": options.get("content-type", "application/octet-stream"),
+                "created_at": _now(),
+            }
+        return SimpleNamespace(path=path, full_path=f"{self.name}/{path}")
+
+    def get_public_url(self, path: str, options: Optional[Dict[str, Any]] = None) -> str:
+        return f"{PUBLIC_BASE_URL}/storage/v1/object/public/{self.name}/{path}"
+
+    def download(self, path: str, options: Optional[Dict[str, Any]] = None) -> bytes:
+        self._client.storage_faults.apply(_injected_storage_error)
+        with self._client.lock:
+            stored = self.objects.get(path)
+        if stored is None:
+            raise StorageApiError("Object not found", "not_found", 404)
+        return stored["content"]
+
+    def remove(self, paths: List[str]) -> List[Dict[str, Any]]:
+        self._client.storage_faults.apply(_injected_storage_error)
+        removed = []
+        with self._client.lock:
+            for path in paths:
+                if self.objects.pop(path, None) is not None:
+                    removed.append({"name": path, "bucket_id": self.name})
+        return removed
+
+
+class MemoryStorage:
+    """Storage client exposing buckets through ``from_``."""
+
+    def __init__(self, client: "MemorySupabaseClient", bucket_names: Tuple[str, ...]):
+        self._client = client
+        self.buckets: Dict[str, MemoryBucket] = {name: MemoryBucket(client, name) for name in bucket_names}
+
+    def from_(self, bucket_name: str) -> MemoryBucket:
+        bucket = self.buckets.get(bucket_name)
+        if bucket is None:
+            raise StorageApiError("Bucket not found", "NoSuchBucket", 404)
+        return bucket
+
+    def list_buckets(self) -> List[SimpleNamespace]:
+        self._client.storage_faults.apply(_injected_storage_error)
+        with self._client.lock:
+            return [SimpleNamespace(id=name, name=name) for name in self.buckets]
+
+    def create_bucket(self, bucket_name: str, options: Optional[Dict[str, Any]] = None) -> None:
+        self.buckets.setdefault(bucket_name, MemoryBucket(self._client, bucket_name))
+
+
+class MemoryAuth:
+    """Auth client resolving users from the ``sub`` claim of a bearer token."""
+
+    def __init__(self, client: "MemorySupabaseClient"):
+        self._client = client
+
+    def health(self) -> Dict[str, str]:
+        """What GoTrue's ``/health`` endpoint returns."""
+        self._client.auth_faults.apply(_injected_db_error)
+        return {"name": "GoTrue", "version": "memory", "description": "In-memory auth"}
+
+    def get_user(self, token: str) -> Optional[SimpleNamespace]:
+        self._client.auth_faults.apply(_injected_db_error)
+        claims = jwt.decode(token, options={"verify_signature": False})
+        if not claims.get("sub"):
+            return None
+        user = SimpleNamespace(
+            id=claims["sub"],
+            email=claims.get("email"),
+            role=claims.get("role", "authenticated"),
+        )
+        return SimpleNamespace(user=user)
+
+
+class MemorySupabaseClient:
+    """
+    In-process replacement for ``supabase.Client``.
+
+    Rows live in per-table lists guarded by a single lock. Every ``execute()``
+    first passes through the fault injector for its operation class, so the
+    latency profile of a remote project can be approximated locally.
+    """
+
+    def __init__(self, db_faults: Optional[FaultInjector] = None,
+                 storage_faults: Optional[FaultInjector] = None,
+                 auth_faults: Optional[FaultInjector] = None):
+        self.lock = threading.RLock()
+        self.tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in TABLE_CONFLICT_KEYS}
+        self.views: Dict[str, Callable[["MemorySupabaseClient"], List[Dict[str, Any]]]] = {
+            "application_upload_summary": _application_upload_summary,
+        }
+        self.functions: Dict[str, Callable[..., Any]] = {
+            "mark_upload_complete": _mark_upload_complete,
+            "submit_application": _submit_application,
+        }
+        self.db_faults = db_faults or FaultInjector()
+        self.storage_faults = storage_faults or FaultInjector()
+        self.auth_faults = auth_faults or FaultInjector()
+        self.storage = MemoryStorage(self, STORAGE_BUCKETS)
+        self.auth = MemoryAuth(self)
+
+    def table(self, table_name: str) -> MemoryQueryBuilder:
+        return MemoryQueryBuilder(self, table_name)
+
+    # supabase-py exposes ``from_`` as an alias of ``table``
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> MemoryRPC:
+        return MemoryRPC(self, fn, params or {})
+
+    def rows(self, table_name: str) -> List[Dict[str, Any]]:
+        """Rows of a table or view, for reads."""
+        view = self.views.get(table_name)
+        if view is not None:
+            return view(self)
+        return self.table_rows(table_name)
+
+    def table_rows(self, table_name: str) -> List[Dict[str, Any]]:
+        """Mutable row list of a table."""
+        if table_name not in self.tables:
+            raise APIError({
+                "message": f"relation \"public.{table_name}\" does not exist",
+                "code": "42P01",
+                "hint": None,
+                "details": None,
+            })
+        return self.tables[table_name]
+
+    def new_row(self, table_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the columns the database would default."""
+        now = _now()
+        created = dict.fromkeys(TABLE_COLUMNS.get(table_name, ()))
+        created.update({"id": str(uuid.uuid4()), "created_at": now, "updated_at": now})
+        created.update({k: v for k, v in row.items() if v is not None or k not in created})
+        return created
+
+    def upsert_row(self, table_name: str, row: Dict[str, Any],
+                   conflict_keys: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """Update the row matching ``row`` on the conflict keys, or insert it."""
+        table = self.table_rows(table_name)
+        conflict_keys = conflict_keys or TABLE_CONFLICT_KEYS.get(table_name, ("id",))
+        existing = None
+        if all(row.get(k) is not None for k in conflict_keys):
+            existing = next(
+                (r for r in table if all(str(r.get(k)) == str(row[k]) for k in conflict_keys)),
+                None,
+            )
+        if existing is not None:
+            existing.update(row)
+            existing["updated_at"] = _now()
+            return existing
+        created = self.new_row(table_name, row)
+        table.append(created)
+        return created
+
+    def check_unique(self, table_name: str, row: Dict[str, Any]) -> None:
+        """Reject inserts that violate a unique constraint."""
+        keys = TABLE_UNIQUE_KEYS.get(table_name, ())
+        candidates = [("id",)] + ([keys] if keys else [])
+        for columns in candidates:
+            if not all(row.get(c) is not None for c in columns):
+                continue
+            for existing in self.tables[table_name]:
+                if all(str(existing.get(c)) == str(row[c]) for c in columns):
+                    raise APIError({
+                        "message": f"duplicate key value violates unique constraint \"{table_name}_{'_'.join(columns)}_key\"",
+                        "code": "23505",
+                        "hint": None,
+                        "details": None,
+                    })
+
+    def reset(self) -> None:
+        """Drop all rows and stored objects."""
+        with self.lock:
+            for rows in self.tables.values():
+                rows.clear()
+            for bucket in self.storage.buckets.values():
+                bucket.objects.clear()
+
+
+def create_memory_client(settings) -> MemorySupabaseClient:
+    """Build the in-memory client from application settings."""
+    rng = random.Random(settings.memory_backend_seed)
+    return MemorySupabaseClient(
+        db_faults=FaultInjector(
+            latency_ms=settings.memory_db_latency_ms,
+            jitter_ms=settings.memory_db_jitter_ms,
+            failure_rate=settings.memory_db_failure_rate,
+            rng=rng,
+        ),
+        storage_faults=FaultInjector(
+            latency_ms=settings.memory_storage_latency_ms,
+            jitter_ms=settings.memory_storage_jitter_ms,
+            failure_rate=settings.memory_storage_failure_rate,
+            rng=rng,
+        ),
+        auth_faults=FaultInjector(
+            latency_ms=settings.memory_auth_latency_ms,
+            rng=rng,
+        ),
+    )
@@ -1,35 +1,157 @@
-from supabase import create_client, Client
-import os
-from app.core.config import settings
+"""
+Supabase clients, built on first use.
+
+Importing ``supabase`` and building the clients and their connection pool
+takes a large share of the process start-up, so nothing is built at import.
+``supabase_clients`` builds everything the first time a client is used; the
+startup hook does that on a worker thread, so the server accepts connections
+without waiting and the first request usually finds the clients ready.
+
+``from app.db.supabase_client import supabase_service`` (and ``supabase``,
+``http_client``) still works, but builds the clients at that point.
+"""
+
+import asyncio
 import logging
+import threading
+from typing import Any, Optional
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Initialize Supabase client with anon key for auth operations
-# Try direct env vars first, then VITE_ prefixed ones
-supabase_url = settings.supabase_url or settings.vite_supabase_url
-supabase_anon_key = settings.supabase_anon_key or settings.vite_supabase_anon_key
-supabase_service_key = settings.supabase_service_key or settings.vite_supabase_service_key
-
-if supabase_url and supabase_anon_key:
-    try:
-        supabase: Client = create_client(supabase_url, supabase_anon_key)
-        logger.info("Supabase client initialized successfully with anon key")
-    except Exception as e:
-        logger.error(f"Failed to initialize Supabase client: {e}")
-        supabase = None
-else:
-    supabase = None
-    logger.warning("Supabase not configured - database operations will fail")
-
-# Initialize Supabase service client with service key for server-side operations
-if supabase_url and supabase_service_key:
-    try:
-        supabase_service: Client = create_client(supabase_url, supabase_service_key)
-        logger.info("Supabase service client initialized successfully with service key")
-    except Exception as e:
-        logger.error(f"Failed to initialize Supabase service client: {e}")
-        supabase_service = None
-else:
-    supabase_service = None
-    logger.warning("Supabase service key not configured - server operations may fail")
+
+class SupabaseClients:
+    """Anon and service Supabase clients sharing one connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._anon: Any = None
+        self._service: Any = None
+        self._http_client: Any = None
+        self._background_build: Optional[asyncio.Future] = None
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    @property
+    def anon(self) -> Any:
+        """Client with the anon key, or None if not configured"""
+        self.build()
+        return self._anon
+
+    @property
+    def service(self) -> Any:
+        """Client with the service key for server-side operations, or None if not configured"""
+        self.build()
+        return self._service
+
+    @property
+    def http_client(self) -> Any:
+        """HTTP client shared by both Supabase clients, or None for the in-memory backend"""
+        self.build()
+        return self._http_client
+
+    def build(self) -> None:
+        """Build the clients unless they already exist."""
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            if settings.use_memory_backend:
+                self._build_memory()
+            else:
+                self._build_supabase()
+
+            # Time every database call made through the service client
+            if self._service is not None and settings.slow_query_log_enabled:
+                from app.db.instrumentation import InstrumentedClient, slow_query_log
+                slow_query_log.configure(settings.slow_query_threshold_ms, settings.slow_query_log_size)
+                self._service = InstrumentedClient(self._service, slow_query_log)
+            self._built = True
+
+    def build_in_background(self) -> asyncio.Future:
+        """Start building the clients on the loop's default executor.
+
+        A failed build is logged; the clients are then built again on first use.
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, self.build)
+        future.add_done_callback(self._log_build_failure)
+        self._background_build = future
+        return future
+
+    async def wait_for_build(self) -> None:
+        """Wait for a background build that is still running, whatever its outcome."""
+        if self._background_build is not None:
+            await asyncio.wait([self._background_build])
+
+    @staticmethod
+    def _log_build_failure(future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Building the Supabase clients failed; retrying on first use: {error}")
+
+    def close(self) -> None:
+        """Close the shared connection pool, if it was ever opened."""
+        if self._http_client is not None:
+            self._http_client.close()
+
+    def _build_memory(self) -> None:
+        # In-process stand-in; anon and service clients share the same data
+        from app.db.memory_client import create_memory_client
+        self._anon = self._service = create_memory_client(settings)
+        logger.warning("Using in-memory Supabase backend - data is not persisted")
+
+    def _build_supabase(self) -> None:
+        from supabase import create_client, ClientOptions
+        from app.db.http_client import create_http_client
+        settings.validate_required()
+
+        # Try direct env vars first, then VITE_ prefixed ones
+        supabase_url = settings.supabase_url or settings.vite_supabase_url
+        supabase_anon_key = settings.supabase_anon_key or settings.vite_supabase_anon_key
+        supabase_service_key = settings.supabase_service_key or settings.vite_supabase_service_key
+
+        # One connection pool for database, storage and auth calls of both clients
+        self._http_client = create_http_client(settings)
+
+        if supabase_url and supabase_anon_key:
+            try:
+                self._anon = create_client(
+                    supabase_url, supabase_anon_key, ClientOptions(httpx_client=self._http_client)
+                )
+                logger.info("Supabase client initialized successfully with anon key")
+            except Exception as e:
+                logger.error(f"Failed to initialize Supabase client: {e}")
+        else:
+            logger.warning("Supabase not configured - database operations will fail")
+
+        if supabase_url and supabase_service_key:
+            try:
+                self._service = create_client(
+                    supabase_url, supabase_service_key, ClientOptions(httpx_client=self._http_client)
+                )
+                logger.info("Supabase service client initialized successfully with service key")
+            except Exception as e:
+                logger.error(f"Failed to initialize Supabase service client: {e}")
+        else:
+            logger.warning("Supabase service key not configured - server operations may fail")
+
+
+def __getattr__(name: str) -> Optional[Any]:
+    if name == "supabase":
+        return supabase_clients.anon
+    if name == "supabase_service":
+        return supabase_clients.service
+    if name == "http_client":
+        return supabase_clients.http_client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Global instance
+supabase_clients = SupabaseClients()
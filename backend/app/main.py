@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import logging
 import uuid
@@ -8,13 +8,69 @@ import os
 import time
 
 from app.core.config import settings
-from app.core.security import get_current_user
-from app.api.v1.routers import enrollment_router, documents_router, academic_router, financing_router
+from app.core.security import get_current_user, require_metrics_token
+from app.core.tracing import (
+    tracer, configure_tracing, span, set_request_id, reset_request_id,
+    RequestIdLogFilter, SPAN_KIND_SERVER
+)
+from app.core.metrics import metrics
+from app.core.loop_monitor import loop_monitor
+from app.core.cache import application_cache
+from app.core.compression import CompressionMiddleware
+from app.core.readiness import readiness_monitor
+from app.core.executors import executor_pools
+from app.db.supabase_client import supabase_clients
+from app.api.v1.routers import enrollment_router, documents_router, academic_router, financing_router, debug_router
+from app.services.submission_service import submission_queue
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s')
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIdLogFilter())
 logger = logging.getLogger(__name__)
 
+REQUEST_ID_HEADER = "x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
+
+class RequestContextMiddleware:
+    """Binds a request ID to each request and opens the root tracing span"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER.encode():
+                candidate = value.decode("latin-1").strip()
+                if 0 < len(candidate) <= MAX_REQUEST_ID_LENGTH and candidate.isprintable():
+                    request_id = candidate
+                break
+        request_id = request_id or str(uuid.uuid4())
+        token = set_request_id(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append([b"X-Request-ID", request_id.encode()])
+                message["headers"] = headers
+                if root_span is not None:
+                    root_span.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        try:
+            with span(f"{scope['method']} {scope['path']}", SPAN_KIND_SERVER, {
+                "http.method": scope["method"],
+                "http.target": scope["path"],
+            }) as root_span:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_request_id(token)
+
 class PerformanceMiddleware:
     def __init__(self, app):
         self.app = app
@@ -46,14 +102,22 @@ app = FastAPI(
 # Performance monitoring middleware
 app.add_middleware(PerformanceMiddleware)
 
+# Request ID and tracing middleware (wraps the timing middleware above)
+app.add_middleware(RequestContextMiddleware)
+
 # Security middleware - Trusted hosts
 app.add_middleware(
     TrustedHostMiddleware,
     allowed_hosts=["*"]
 )
 
-# Compression middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Compression middleware (brotli, zstd or gzip)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    encodings=settings.compression_encodings,
+    cache_max_bytes=settings.compression_cache_max_bytes,
+)
 
 # CORS middleware - Production ready
 allowed_origins = []
@@ -96,7 +160,44 @@ app.include_router(academic_router, prefix="/api/v1/academic", tags=["academic"]
 async def health_check():
     return {"status": "healthy"}
 
+# Readiness for load balancers: cached results of the background dependency probes
+@app.get("/ready")
+async def readiness_check():
+    ready, report = readiness_monitor.report()
+    return JSONResponse(report, status_code=200 if ready else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+         dependencies=[Depends(require_metrics_token)])
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.on_event("startup")
 async def startup():
-    pass
+    settings.validate_required()
+    configure_tracing(settings)
+    if settings.loop_monitor_enabled:
+        loop_monitor.interval = settings.loop_monitor_interval_ms / 1000
+        loop_monitor.threshold = settings.loop_lag_threshold_ms / 1000
+        loop_monitor.start()
+    # Build the Supabase clients off the event loop, without delaying startup
+    supabase_clients.build_in_background()
+    if settings.readiness_probe_interval_seconds > 0:
+        readiness_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await loop_monitor.stop()
+    await readiness_monitor.stop()
+    # Let background work that is already running finish before closing the pool
+    await submission_queue.stop(settings.submission_drain_seconds)
+    if settings.prefetch_on_login:
+        from app.services.prefetch_service import prefetch_service
+        prefetch_service.shutdown(wait=True)
+    application_cache.shutdown(wait=True)
+    executor_pools.shutdown(wait=True)
+    tracer.shutdown()
+    # A build still running at shutdown would open the pool after close
+    await supabase_clients.wait_for_build()
+    supabase_clients.close()
 app.include_router(financing_router, prefix='/api/v1', tags=['financing'])
+app.include_router(debug_router, prefix='/debug', tags=['debug'])
@@ -10,10 +10,13 @@ from app.api.v1.schemas.academic import (
     AcademicHistoryCreate, AcademicHistoryUpdate
 )
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
+from app.repositories.progress_repository import progress_repository
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class AcademicRepository(BaseRepository):
     """
     Repository for academic-related database operations.
@@ -42,6 +45,7 @@ class AcademicRepository(BaseRepository):
             insert_data = data.model_dump()
             logger.info(f"Upserting academic history data: {insert_data}")
             result = self.upsert(insert_data, on_conflict_fields=["application_id"])
+            progress_repository.update_progress(data.application_id, academic_history_completed=True)
             logger.info(f"Upsert result: {result}")
             return str(result.get("application_id", ""))
         except Exception as e:
@@ -50,7 +54,7 @@ class AcademicRepository(BaseRepository):
 
     def get_academic_history_by_application(self, application_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get academic history by application ID.
+        Get academic history by application ID, through the application cache.
 
         Args:
             application_id: Application ID to retrieve academic history for
@@ -61,6 +65,9 @@ class AcademicRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "academic_history", lambda: self._load_academic_history(application_id))
+
+    def _load_academic_history(self, application_id: str) -> Optional[Dict[str, Any]]:
         try:
             result = self.supabase.table(self.table_name).select("*").eq("application_id", application_id).execute()
             return result.data[0] if result.data else None
@@ -83,6 +90,7 @@ class AcademicRepository(BaseRepository):
             update_data = data.model_dump(exclude_unset=True)
             if update_data:
                 result = self.supabase.table(self.table_name).update(update_data).eq("application_id", application_id).execute()
+                self._invalidate(application_id)
                 if not result.data:
                     logger.warning(f"No academic history record found for application_id {application_id}")
         except Exception as e:
@@ -104,6 +112,7 @@ class AcademicRepository(BaseRepository):
             update_data = data.model_dump(exclude_unset=True)
             if update_data:
                 result = self.supabase.table(self.table_name).update(update_data).eq("application_id", application_id).execute()
+                self._invalidate(application_id)
                 if not result.data:
                     logger.warning(f"No academic history record found for application_id {application_id}")
                 logger.info(f"Update result: {result}")
@@ -123,6 +132,8 @@ class AcademicRepository(BaseRepository):
         """
         try:
             result = self.supabase.table(self.table_name).delete().eq("application_id", application_id).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, academic_history_completed=False)
             if not result.data:
                 logger.warning(f"No academic history record found for application_id {application_id}")
         except Exception as e:
@@ -3,9 +3,11 @@ Base repository classes providing common database operations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, TypeVar, Generic
-from app.db.supabase_client import supabase_service
+from typing import Callable, Dict, Any, List, Optional, TypeVar, Generic
+from app.db.supabase_client import supabase_clients
+from app.core.cache import application_cache
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,7 @@ logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
 
+@trace_methods
 class BaseRepository(ABC, Generic[T]):
     """
     Base repository class providing common database operations.
@@ -29,13 +32,51 @@ class BaseRepository(ABC, Generic[T]):
             table_name: Name of the database table
         """
         self.table_name = table_name
-        self.supabase = supabase_service
+        self._supabase = None
+        self.cache = application_cache
+
+    @property
+    def supabase(self):
+        """Service client, built on first use, unless another client was assigned."""
+        if self._supabase is None:
+            return supabase_clients.service
+        return self._supabase
+
+    @supabase.setter
+    def supabase(self, client) -> None:
+        self._supabase = client
+
+    @supabase.deleter
+    def supabase(self) -> None:
+        self._supabase = None
 
     def _check_supabase(self) -> None:
         """Check if Supabase is configured and available."""
         if not self.supabase:
             raise ExternalServiceError("Database", "Database not configured")
 
+    def _cached(self, application_id: str, section: str, loader: Callable[[], Any],
+                cache_missing: bool = False) -> Any:
+        """Read an application section through the application cache."""
+        return self.cache.get_or_load(application_id, section, loader, cache_missing=cache_missing)
+
+    def _cached_stale_while_revalidate(self, application_id: str, section: str,
+                                       loader: Callable[[], Any], soft_ttl: float) -> Any:
+        """Read a frequently polled section, refreshing it in the background once stale."""
+        return self.cache.get_stale_while_revalidate(application_id, section, loader, soft_ttl)
+
+    def _invalidate(self, application_id: Optional[str]) -> None:
+        """Drop cached sections of an application after a write."""
+        self.cache.invalidate(application_id)
+
+    def _application_id_of(self, record_id: Optional[str], data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Application a written record belongs to, if it can be told."""
+        if data and data.get("application_id"):
+            return data["application_id"]
+        if self.table_name == "applications":
+            return record_id
+        return None
+
     def insert(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Insert a new record.
@@ -54,6 +95,7 @@ class BaseRepository(ABC, Generic[T]):
             logger.info(f"Inserting into {self.table_name}: {data}")
             result = self.supabase.table(self.table_name).insert(data).execute()
             logger.info(f"Insert result for {self.table_name}: {result}")
+            self._invalidate(self._application_id_of(None, data))
             return result.data[0] if result.data else {}
         except Exception as e:
             logger.error(f"Failed to insert into {self.table_name}: {e.__class__.__name__} - {e}")
@@ -78,6 +120,7 @@ class BaseRepository(ABC, Generic[T]):
         self._check_supabase()
         try:
             result = self.supabase.table(self.table_name).update(data).eq("id", record_id).execute()
+            self._invalidate(self._application_id_of(record_id, data))
             return result.data[0] if result.data else {}
         except Exception as e:
             logger.error(f"Failed to update {self.table_name} with id {record_id}: {str(e)}")
@@ -142,6 +185,8 @@ class BaseRepository(ABC, Generic[T]):
         self._check_supabase()
         try:
             result = self.supabase.table(self.table_name).delete().eq("id", record_id).execute()
+            for row in result.data:
+                self._invalidate(self._application_id_of(record_id, row))
             return len(result.data) > 0
         except Exception as e:
             logger.error(f"Failed to delete {self.table_name} with id {record_id}: {str(e)}")
@@ -190,6 +235,7 @@ class BaseRepository(ABC, Generic[T]):
                 result = self.supabase.table(self.table_name).upsert(data, on_conflict=on_conflict_fields).execute()
             else:
                 result = self.supabase.table(self.table_name).upsert(data).execute()
+            self._invalidate(self._application_id_of(None, data))
             return result.data[0] if result.data else {}
         except Exception as e:
             logger.error(f"Failed to upsert into {self.table_name}: {str(e)}")
@@ -7,10 +7,13 @@ from datetime import datetime
 import logging
 from app.repositories.base import BaseRepository
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
+from app.repositories.progress_repository import progress_repository
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class DeclarationRepository(BaseRepository):
     """
     Repository for declaration-related database operations.
@@ -52,13 +55,15 @@ class DeclarationRepository(BaseRepository):
             filtered_data = {k: v for k, v in data.items() if k in allowed_fields}
 
             self.supabase.table(self.table_name).upsert(filtered_data).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, declaration_signed=filtered_data.get("status") == "completed")
         except Exception as e:
             logger.error(f"Failed to save declaration for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save declaration information")
 
     def get_declaration(self, application_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get declaration by application ID.
+        Get declaration by application ID, through the application cache.
 
         Args:
             application_id: Application ID to retrieve declaration for
@@ -69,6 +74,9 @@ class DeclarationRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "declaration", lambda: self._load_declaration(application_id))
+
+    def _load_declaration(self, application_id: str) -> Optional[Dict[str, Any]]:
         try:
             result = self.supabase.table(self.table_name).select("*").eq("application_id", application_id).execute()
             return result.data[0] if result.data else None
@@ -8,11 +8,16 @@ from datetime import datetime
 import logging
 from app.repositories.base import BaseRepository
 from app.api.v1.schemas.documents import DocumentType
+from app.core.config import settings
 from app.core.exceptions import ExternalServiceError
+from app.core.constants import DOCUMENT_REQUIREMENTS
+from app.core.tracing import trace_methods
+from app.repositories.progress_repository import progress_repository
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class DocumentRepository(BaseRepository):
     """
     Repository for document-related database operations.
@@ -51,6 +56,8 @@ class DocumentRepository(BaseRepository):
             "upload_status": upload_status
         }
         result = self.insert(data)
+        self._invalidate(application_id)
+        progress_repository.refresh_documents(application_id)
         return str(result["id"])
 
     def save_file_record(self, application_id: str, filename: str, original_filename: str,
@@ -94,6 +101,7 @@ class DocumentRepository(BaseRepository):
                 "created_at": datetime.now().isoformat()
             }
             result = self.supabase.table("documents").insert(data).execute()
+            self._invalidate(application_id)
             return str(result.data[0]["id"])
         except Exception as e:
             logger.error(f"Failed to save file record for application {application_id}: {str(e)}")
@@ -101,7 +109,7 @@ class DocumentRepository(BaseRepository):
 
     def get_document_status(self, application_id: str) -> List[Dict[str, Any]]:
         """
-        Get document upload status for application.
+        Get document upload status for application, through the application cache.
 
         Args:
             application_id: Application ID
@@ -112,25 +120,18 @@ class DocumentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "document_status", lambda: self._load_document_status(application_id))
+
+    def _load_document_status(self, application_id: str) -> List[Dict[str, Any]]:
         try:
             docs_result = self.supabase.table("application_documents").select("*").eq("application_id", application_id).execute()
 
             # Group by document type
             summary = []
-            doc_types = ["proof_of_address", "id_document", "payslip", "bank_statement"]
-
-            # Define requirements for each document type
-            requirements = {
-                "proof_of_address": 1,
-                "id_document": 2,
-                "payslip": 3,
-                "bank_statement": 1
-            }
 
-            for doc_type in doc_types:
+            for doc_type, required_count in DOCUMENT_REQUIREMENTS.items():
                 type_docs = [doc for doc in docs_result.data if doc.get("document_type") == doc_type]
                 completed_count = len([doc for doc in type_docs if doc.get("upload_status") == "completed"])
-                required_count = requirements.get(doc_type, 1)
 
                 summary.append({
                     "document_type": doc_type,
@@ -150,7 +151,7 @@ class DocumentRepository(BaseRepository):
 
     def get_uploaded_files(self, application_id: str) -> List[Dict[str, Any]]:
         """
-        Get uploaded files for application.
+        Get uploaded files for application, through the application cache.
 
         Args:
             application_id: Application ID
@@ -161,6 +162,9 @@ class DocumentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "uploaded_files", lambda: self._load_uploaded_files(application_id))
+
+    def _load_uploaded_files(self, application_id: str) -> List[Dict[str, Any]]:
         try:
             files_result = self.supabase.table("documents").select("*").eq("application_id", application_id).execute()
 
@@ -207,6 +211,8 @@ class DocumentRepository(BaseRepository):
             # Delete from both tables
             self.supabase.table("documents").delete().eq("id", file_id).execute()
             self.supabase.table("application_documents").delete().eq("file_url", file_data["download_url"]).execute()
+            self._invalidate(application_id)
+            progress_repository.refresh_documents(application_id)
 
             return file_data
         except Exception as e:
@@ -227,13 +233,14 @@ class DocumentRepository(BaseRepository):
             self.supabase.table("applications").update({
                 "documents_completed": True
             }).eq("id", application_id).execute()
+            self._invalidate(application_id)
         except Exception as e:
             logger.error(f"Failed to mark upload complete for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to mark upload complete")
 
     def get_upload_summary(self, application_id: str) -> Dict[str, Any]:
         """
-        Get upload summary for application.
+        Get upload summary for application, served stale-while-revalidate.
 
         Args:
             application_id: Application ID
@@ -244,6 +251,13 @@ class DocumentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached_stale_while_revalidate(
+            application_id, "document_upload_summary",
+            lambda: self._load_upload_summary(application_id),
+            settings.upload_summary_soft_ttl_seconds,
+        )
+
+    def _load_upload_summary(self, application_id: str) -> Dict[str, Any]:
         try:
             summary_result = self.supabase.table("application_upload_summary").select("*").eq("application_id", application_id).execute()
             if summary_result.data:
@@ -272,6 +286,8 @@ class DocumentRepository(BaseRepository):
                 "app_id": application_id,
                 "doc_type": doc_type
             }).execute()
+            self._invalidate(application_id)
+            progress_repository.refresh_documents(application_id)
         except Exception as e:
             logger.error(f"Failed to mark document type {doc_type} complete for {application_id}: {str(e)}")
             raise ExternalServiceError("Database", f"Failed to mark {doc_type} complete")
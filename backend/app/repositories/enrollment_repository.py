@@ -5,17 +5,50 @@ Repository for enrollment-related database operations.
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
+import re
+import uuid
 from app.repositories.base import BaseRepository
 from app.api.v1.schemas.enrollment import (
     StudentInfo, MedicalInfo, FamilyInfo, FeeResponsibilityInfo,
     ApplicationStatus, StudentInfoPartial, MedicalInfoPartial,
     FamilyInfoPartial, FeeResponsibilityInfoPartial
 )
+from app.core.config import settings
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
+from app.core.validation import dump_set_fields
+from app.repositories.progress_repository import progress_repository, section_complete
 
 logger = logging.getLogger(__name__)
 
 
+def is_uuid(value: Any) -> bool:
+    """Whether ``value`` is a UUID string."""
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+
+def sanitize_family_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the casing and characters of next-of-kin fields, in place."""
+    if "next_of_kin_surname" in data:
+        data["next_of_kin_surname"] = str(data["next_of_kin_surname"]).strip().title()
+    if "next_of_kin_first_name" in data:
+        data["next_of_kin_first_name"] = str(data["next_of_kin_first_name"]).strip().title()
+    if "next_of_kin_relationship" in data:
+        data["next_of_kin_relationship"] = str(data["next_of_kin_relationship"]).strip().lower()
+    if "next_of_kin_mobile" in data:
+        # Sanitize mobile number - keep only digits, spaces, hyphens, parentheses, plus
+        mobile = str(data["next_of_kin_mobile"]).strip()
+        data["next_of_kin_mobile"] = re.sub(r'[^\d\s\-\(\)\+]', '', mobile)
+    if "next_of_kin_email" in data:
+        data["next_of_kin_email"] = str(data["next_of_kin_email"]).strip().lower()
+    return data
+
+
+@trace_methods
 class EnrollmentRepository(BaseRepository):
     """
     Repository for enrollment-related database operations.
@@ -46,11 +79,16 @@ class EnrollmentRepository(BaseRepository):
             "status": status.value
         }
         result = self.insert(data)
-        return str(result["id"])
+        application_id = str(result["id"])
+        # Drop any negative entry left by earlier lookups of this ID
+        self._invalidate(application_id)
+        self.cache.remember_user_application(user_id, application_id)
+        progress_repository.initialize_progress(application_id, user_id, status.value)
+        return application_id
 
     def get_application_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get application by ID regardless of ownership.
+        Get application by ID regardless of ownership, through the application cache.
 
         Args:
             application_id: Application ID to retrieve
@@ -61,6 +99,13 @@ class EnrollmentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        if not is_uuid(application_id):
+            # applications.id is a UUID; malformed IDs cannot exist and are not worth a cache entry
+            return None
+        return self._cached(application_id, "application", lambda: self._load_application(application_id),
+                            cache_missing=True)
+
+    def _load_application(self, application_id: str) -> Optional[Dict[str, Any]]:
         try:
             result = self.supabase.table(self.table_name).select("*").eq("id", application_id).execute()
             return result.data[0] if result.data else None
@@ -72,6 +117,9 @@ class EnrollmentRepository(BaseRepository):
         """
         Get application by ID and verify ownership.
 
+        Ownership is checked against the cached application row, so repeated
+        checks by the services do not query the database.
+
         Args:
             application_id: Application ID to retrieve
             user_id: User ID for ownership verification
@@ -82,16 +130,12 @@ class EnrollmentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
-        try:
-            if user_id is None:
-                # Handle NULL user_id case
-                result = self.supabase.table(self.table_name).select("*").eq("id", application_id).is_("user_id", None).execute()
-            else:
-                result = self.supabase.table(self.table_name).select("*").eq("id", application_id).eq("user_id", user_id).execute()
-            return result.data[0] if result.data else None
-        except Exception as e:
-            logger.error(f"Failed to get application {application_id} for user {user_id}: {str(e)}")
-            raise ExternalServiceError("Database", "Failed to retrieve application")
+        application = self.get_application_by_id(application_id)
+        if not application:
+            return None
+        owner = application.get("user_id")
+        owned = owner == user_id if owner is None or user_id is None else str(owner) == str(user_id)
+        return application if owned else None
 
     def get_user_application(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -113,6 +157,32 @@ class EnrollmentRepository(BaseRepository):
             logger.error(f"Failed to get application for user {user_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to retrieve application")
 
+    def get_user_application_id(self, user_id: str) -> Optional[str]:
+        """
+        Get the ID of the user's application (any status) from the user index.
+
+        The index is filled on first lookup and on creation, so repeated
+        auto-saves do not query the applications table.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Application ID or None if the user has no application
+
+        Raises:
+            ExternalServiceError: If database operation fails
+        """
+        return self.cache.get_user_application_id(user_id, lambda: self._load_user_application_id(user_id))
+
+    def _load_user_application_id(self, user_id: str) -> Optional[str]:
+        try:
+            result = self.supabase.table(self.table_name).select("id").eq("user_id", user_id).limit(1).execute()
+            return str(result.data[0]["id"]) if result.data else None
+        except Exception as e:
+            logger.error(f"Failed to get application for user {user_id}: {str(e)}")
+            raise ExternalServiceError("Database", "Failed to retrieve application")
+
     def update_application_status(self, application_id: str, status: ApplicationStatus, submitted_at: bool = False) -> None:
         """
         Update application status.
@@ -128,7 +198,64 @@ class EnrollmentRepository(BaseRepository):
         data = {"status": status.value}
         if submitted_at:
             data["submitted_at"] = datetime.now().isoformat()
-        self.update(application_id, data)
+        updated = self.update(application_id, data)
+        self.cache.forget_user_application(updated.get("user_id"))
+        progress_repository.update_progress(application_id, status=status.value)
+
+    def submit_application(self, user_id: str, student: Optional[StudentInfo] = None,
+                           medical: Optional[MedicalInfo] = None, family: Optional[FamilyInfo] = None,
+                           fee: Optional[FeeResponsibilityInfo] = None,
+                           academic_history: Optional[Dict[str, Any]] = None,
+                           declaration: Optional[Dict[str, bool]] = None) -> str:
+        """
+        Submit a user's application in one database transaction.
+
+        Calls the ``submit_application`` database function, which finds or
+        creates the user's application, upserts the provided sections and
+        academic history, sets the declaration flags, marks the application
+        submitted and updates its progress snapshot. Either everything is
+        written or nothing is.
+
+        Args:
+            user_id: Owner of the application
+            student: Student information to save
+            medical: Medical information to save
+            family: Family information to save
+            fee: Fee responsibility information to save
+            academic_history: Academic history row (without application_id)
+            declaration: Declaration flags (agree_audit_storage, agree_affordability_processing)
+
+        Returns:
+            Application ID
+
+        Raises:
+            ExternalServiceError: If database operation fails
+        """
+        params = {
+            "p_user_id": user_id,
+            "p_student": student.model_dump(mode="json") if student else None,
+            "p_medical": medical.model_dump(mode="json") if medical else None,
+            "p_family": sanitize_family_data(family.model_dump(mode="json")) if family else None,
+            "p_fee": fee.model_dump(mode="json") if fee else None,
+            "p_academic_history": academic_history,
+            "p_declaration": declaration or None,
+        }
+        try:
+            result = self.supabase.rpc("submit_application", params).execute()
+        except Exception as e:
+            logger.error(f"Failed to submit application for user {user_id}: {str(e)}")
+            raise ExternalServiceError("Database", "Failed to submit application")
+
+        submitted = result.data[0]
+        application_id = str(submitted["application_id"])
+        self._invalidate(application_id)
+        self.cache.remember_user_application(user_id, application_id)
+        progress = submitted.get("progress")
+        if progress:
+            self.cache.set_progress(application_id, progress)
+        else:
+            self.cache.forget_progress(application_id)
+        return application_id
 
     def save_student_data(self, application_id: str, student_data: StudentInfo) -> None:
         """
@@ -145,6 +272,8 @@ class EnrollmentRepository(BaseRepository):
             data = student_data.model_dump()
             data["application_id"] = application_id
             self.supabase.table("students").upsert(data).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, student_completed=True)
         except Exception as e:
             logger.error(f"Failed to save student data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save student information")
@@ -164,6 +293,8 @@ class EnrollmentRepository(BaseRepository):
             data = medical_data.model_dump()
             data["application_id"] = application_id
             self.supabase.table("medical_info").upsert(data).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, medical_completed=True)
         except Exception as e:
             logger.error(f"Failed to save medical data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save medical information")
@@ -183,24 +314,12 @@ class EnrollmentRepository(BaseRepository):
             data = family_data.model_dump()
             data["application_id"] = application_id
 
-            # Sanitize and validate inputs with correct casing
-            if "next_of_kin_surname" in data:
-                data["next_of_kin_surname"] = str(data["next_of_kin_surname"]).strip().title()
-            if "next_of_kin_first_name" in data:
-                data["next_of_kin_first_name"] = str(data["next_of_kin_first_name"]).strip().title()
-            if "next_of_kin_relationship" in data:
-                data["next_of_kin_relationship"] = str(data["next_of_kin_relationship"]).strip().lower()
-            if "next_of_kin_mobile" in data:
-                # Sanitize mobile number - keep only digits, spaces, hyphens, parentheses, plus
-                mobile = str(data["next_of_kin_mobile"]).strip()
-                import re
-                mobile = re.sub(r'[^\d\s\-\(\)\+]', '', mobile)
-                data["next_of_kin_mobile"] = mobile
-            if "next_of_kin_email" in data:
-                data["next_of_kin_email"] = str(data["next_of_kin_email"]).strip().lower()
+            sanitize_family_data(data)
 
             # Fields are already in correct snake_case casing for database
             self.supabase.table("family_info").upsert(data).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, family_completed=True)
         except Exception as e:
             logger.error(f"Failed to save family data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save family information")
@@ -224,6 +343,8 @@ class EnrollmentRepository(BaseRepository):
             # This method no longer populates selected_plan to avoid conflicts
 
             self.supabase.table("fee_responsibility").upsert(data).execute()
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, fee_completed=True)
         except Exception as e:
             logger.error(f"Failed to save fee data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save fee responsibility information")
@@ -240,10 +361,13 @@ class EnrollmentRepository(BaseRepository):
             ExternalServiceError: If database operation fails
         """
         try:
-            data = student_data.model_dump(exclude_unset=True)
+            data = dump_set_fields(student_data)
             if data:  # Only update if there's data to update
                 data["application_id"] = application_id
-                self.supabase.table("students").upsert(data).execute()
+                result = self.supabase.table("students").upsert(data).execute()
+                self._invalidate(application_id)
+                row = result.data[0] if result.data else None
+                progress_repository.update_progress(application_id, student_completed=section_complete("students", row))
         except Exception as e:
             logger.error(f"Failed to save partial student data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save student information")
@@ -260,10 +384,13 @@ class EnrollmentRepository(BaseRepository):
             ExternalServiceError: If database operation fails
         """
         try:
-            data = medical_data.model_dump(exclude_unset=True)
+            data = dump_set_fields(medical_data)
             if data:  # Only update if there's data to update
                 data["application_id"] = application_id
-                self.supabase.table("medical_info").upsert(data).execute()
+                result = self.supabase.table("medical_info").upsert(data).execute()
+                self._invalidate(application_id)
+                row = result.data[0] if result.data else None
+                progress_repository.update_progress(application_id, medical_completed=section_complete("medical_info", row))
         except Exception as e:
             logger.error(f"Failed to save partial medical data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save medical information")
@@ -280,28 +407,17 @@ class EnrollmentRepository(BaseRepository):
             ExternalServiceError: If database operation fails
         """
         try:
-            data = family_data.model_dump(exclude_unset=True)
+            data = dump_set_fields(family_data)
             if data:  # Only update if there's data to update
                 data["application_id"] = application_id
 
-                # Sanitize and validate inputs with correct casing
-                if "next_of_kin_surname" in data:
-                    data["next_of_kin_surname"] = str(data["next_of_kin_surname"]).strip().title()
-                if "next_of_kin_first_name" in data:
-                    data["next_of_kin_first_name"] = str(data["next_of_kin_first_name"]).strip().title()
-                if "next_of_kin_relationship" in data:
-                    data["next_of_kin_relationship"] = str(data["next_of_kin_relationship"]).strip().lower()
-                if "next_of_kin_mobile" in data:
-                    # Sanitize mobile number - keep only digits, spaces, hyphens, parentheses, plus
-                    mobile = str(data["next_of_kin_mobile"]).strip()
-                    import re
-                    mobile = re.sub(r'[^\d\s\-\(\)\+]', '', mobile)
-                    data["next_of_kin_mobile"] = mobile
-                if "next_of_kin_email" in data:
-                    data["next_of_kin_email"] = str(data["next_of_kin_email"]).strip().lower()
+                sanitize_family_data(data)
 
                 # Fields are already in correct snake_case casing for database
-                self.supabase.table("family_info").upsert(data).execute()
+                result = self.supabase.table("family_info").upsert(data).execute()
+                self._invalidate(application_id)
+                row = result.data[0] if result.data else None
+                progress_repository.update_progress(application_id, family_completed=section_complete("family_info", row))
         except Exception as e:
             logger.error(f"Failed to save partial family data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save family information")
@@ -318,21 +434,24 @@ class EnrollmentRepository(BaseRepository):
             ExternalServiceError: If database operation fails
         """
         try:
-            data = fee_data.model_dump(exclude_unset=True)
+            data = dump_set_fields(fee_data)
             if data:  # Only update if there's data to update
                 data["application_id"] = application_id
 
                 # Note: selected_plan is now automatically managed by financing_service.save_financing_selection
                 # This method no longer populates selected_plan to avoid conflicts
 
-                self.supabase.table("fee_responsibility").upsert(data).execute()
+                result = self.supabase.table("fee_responsibility").upsert(data).execute()
+                self._invalidate(application_id)
+                row = result.data[0] if result.data else None
+                progress_repository.update_progress(application_id, fee_completed=section_complete("fee_responsibility", row))
         except Exception as e:
             logger.error(f"Failed to save partial fee data for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save fee responsibility information")
 
     def get_full_application(self, application_id: str) -> Dict[str, Any]:
         """
-        Get complete application with all related data.
+        Get complete application with all related data, through the application cache.
 
         Args:
             application_id: Application ID to retrieve
@@ -343,6 +462,9 @@ class EnrollmentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "full_application", lambda: self._load_full_application(application_id))
+
+    def _load_full_application(self, application_id: str) -> Dict[str, Any]:
         try:
             application = self.get_by_id(application_id)
             if not application:
@@ -371,7 +493,7 @@ class EnrollmentRepository(BaseRepository):
 
     def get_upload_summary(self, application_id: str) -> Dict[str, Any]:
         """
-        Get upload summary for application.
+        Get upload summary for application, served stale-while-revalidate.
 
         Args:
             application_id: Application ID
@@ -382,6 +504,13 @@ class EnrollmentRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached_stale_while_revalidate(
+            application_id, "upload_summary",
+            lambda: self._load_upload_summary(application_id),
+            settings.upload_summary_soft_ttl_seconds,
+        )
+
+    def _load_upload_summary(self, application_id: str) -> Dict[str, Any]:
         try:
             # First try the view
             summary_result = self.supabase.table("application_upload_summary").select("*").eq("application_id", application_id).execute()
@@ -6,10 +6,13 @@ from typing import Dict, Any, Optional
 import logging
 from app.repositories.base import BaseRepository
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
+from app.repositories.progress_repository import progress_repository
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class FinancingRepository(BaseRepository):
     """
     Repository for financing-related database operations.
@@ -60,18 +63,19 @@ class FinancingRepository(BaseRepository):
             if existing.data and len(existing.data) > 0:
                 # Update existing record
                 result = self.supabase.table(self.table_name).update(data).eq("application_id", application_id).execute()
-                return str(result.data[0]["id"])
             else:
                 # Insert new record
                 result = self.supabase.table(self.table_name).insert(data).execute()
-                return str(result.data[0]["id"])
+            self._invalidate(application_id)
+            progress_repository.update_progress(application_id, financing_plan=plan_type)
+            return str(result.data[0]["id"])
         except Exception as e:
             logger.error(f"Failed to save financing selection for application {application_id}: {str(e)}")
             raise ExternalServiceError("Database", "Failed to save financing selection")
 
     def get_financing_selection(self, application_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get financing selection for an application.
+        Get financing selection for an application, through the application cache.
 
         Args:
             application_id: Application ID
@@ -82,6 +86,9 @@ class FinancingRepository(BaseRepository):
         Raises:
             ExternalServiceError: If database operation fails
         """
+        return self._cached(application_id, "financing_selection", lambda: self._load_financing_selection(application_id))
+
+    def _load_financing_selection(self, application_id: str) -> Optional[Dict[str, Any]]:
         try:
             result = self.supabase.table(self.table_name).select("*").eq("application_id", application_id).execute()
             return result.data[0] if result.data else None
@@ -122,6 +129,7 @@ class FinancingRepository(BaseRepository):
             self.supabase.table("fee_responsibility").update({
                 "selected_plan": selected_plan
             }).eq("application_id", application_id).execute()
+            self._invalidate(application_id)
 
             logger.info(f"Updated selected_plan to '{selected_plan}' for application {application_id}")
         except Exception as e:
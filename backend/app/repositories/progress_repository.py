@@ -0,0 +1,222 @@
+"""
+Repository for the per-application progress snapshot.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Type
+import logging
+from pydantic import BaseModel
+from app.repositories.base import BaseRepository
+from app.api.v1.schemas.enrollment import StudentInfo, MedicalInfo, FamilyInfo, FeeResponsibilityInfo
+from app.core.constants import DOCUMENT_REQUIREMENTS
+from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
+
+logger = logging.getLogger(__name__)
+
+# Section tables and the progress flag each one sets
+SECTION_TABLES = {
+    "students": "student_completed",
+    "medical_info": "medical_completed",
+    "family_info": "family_completed",
+    "fee_responsibility": "fee_completed",
+}
+
+# Section tables and the schema whose required fields complete them
+SECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "students": StudentInfo,
+    "medical_info": MedicalInfo,
+    "family_info": FamilyInfo,
+    "fee_responsibility": FeeResponsibilityInfo,
+}
+
+
+def section_complete(table: str, row: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a saved section row has every field its full schema requires.
+
+    Auto-save stores whatever fields a parent has filled so far, so a partial
+    save only completes its section once the row holds all required fields.
+    """
+    if not row:
+        return False
+    return all(
+        row.get(name) not in (None, "")
+        for name, field in SECTION_MODELS[table].model_fields.items()
+        if field.is_required()
+    )
+
+
+def completed_document_types(documents: Iterable[Dict[str, Any]]) -> List[str]:
+    """Document types with enough completed uploads, in requirement order."""
+    completed_counts: Dict[str, int] = {}
+    for doc in documents:
+        if doc.get("upload_status") == "completed":
+            doc_type = doc.get("document_type")
+            completed_counts[doc_type] = completed_counts.get(doc_type, 0) + 1
+    return [
+        doc_type for doc_type, required_count in DOCUMENT_REQUIREMENTS.items()
+        if completed_counts.get(doc_type, 0) >= required_count
+    ]
+
+
+@trace_methods
+class ProgressRepository(BaseRepository):
+    """
+    Repository for the application progress snapshot.
+
+    Keeps one row per application recording which sections are filled, which
+    document types are complete, whether academic history exists, the chosen
+    financing plan and whether the declaration is signed. Write paths update
+    the fields they change; the row is rebuilt from the source tables when it
+    is missing.
+    """
+
+    def __init__(self):
+        super().__init__("application_progress")
+
+    def get_progress(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress snapshot of an application, through the application cache.
+
+        Args:
+            application_id: Application ID
+
+        Returns:
+            Progress snapshot or None if the application does not exist
+
+        Raises:
+            ExternalServiceError: If database operation fails
+        """
+        progress = self.cache.get_progress(application_id)
+        if progress is not None:
+            return progress
+
+        try:
+            result = self.supabase.table(self.table_name).select("*").eq("application_id", application_id).execute()
+        except Exception as e:
+            logger.error(f"Failed to get progress for application {application_id}: {str(e)}")
+            raise ExternalServiceError("Database", "Failed to retrieve application progress")
+
+        progress = result.data[0] if result.data else self.rebuild_progress(application_id)
+        if progress:
+            self.cache.set_progress(application_id, progress)
+        return progress
+
+    def initialize_progress(self, application_id: str, user_id: Optional[str], status: str) -> None:
+        """
+        Create the snapshot of a new application.
+
+        Args:
+            application_id: Application ID
+            user_id: Owner of the application
+            status: Initial application status
+        """
+        try:
+            self._write(application_id, {
+                "user_id": user_id,
+                "status": status,
+                "student_completed": False,
+                "medical_completed": False,
+                "family_completed": False,
+                "fee_completed": False,
+                "document_types_completed": [],
+                "academic_history_completed": False,
+                "financing_plan": None,
+                "declaration_signed": False,
+            })
+        except Exception as e:
+            # The snapshot is rebuilt on first read
+            logger.warning(f"Failed to initialize progress for application {application_id}: {str(e)}")
+
+    def update_progress(self, application_id: str, **changes: Any) -> None:
+        """
+        Write changed fields to the snapshot.
+
+        The fields are always written: the cached snapshot may be stale, so
+        it cannot tell whether the row already holds these values. Failures
+        are logged and never fail the write that triggered the update.
+
+        Args:
+            application_id: Application ID
+            **changes: Progress fields to set
+        """
+        try:
+            current = self.get_progress(application_id)
+            if current is None:
+                return
+            self._write(application_id, changes, current)
+        except Exception as e:
+            logger.warning(f"Failed to update progress for application {application_id}: {str(e)}")
+            self.cache.forget_progress(application_id)
+
+    def refresh_documents(self, application_id: str) -> None:
+        """
+        Recompute the completed document types after a document write.
+
+        Args:
+            application_id: Application ID
+        """
+        try:
+            docs_result = self.supabase.table("application_documents").select("document_type, upload_status").eq("application_id", application_id).execute()
+        except Exception as e:
+            logger.warning(f"Failed to refresh document progress for application {application_id}: {str(e)}")
+            self.cache.forget_progress(application_id)
+            return
+        self.update_progress(application_id, document_types_completed=completed_document_types(docs_result.data))
+
+    def rebuild_progress(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Compute the snapshot from the source tables and store it.
+
+        Args:
+            application_id: Application ID
+
+        Returns:
+            Progress snapshot or None if the application does not exist
+
+        Raises:
+            ExternalServiceError: If database operation fails
+        """
+        try:
+            app_result = self.supabase.table("applications").select("id, user_id, status").eq("id", application_id).execute()
+            if not app_result.data:
+                return None
+            application = app_result.data[0]
+
+            progress = {
+                "user_id": application.get("user_id"),
+                "status": application.get("status"),
+            }
+            for table, flag in SECTION_TABLES.items():
+                result = self.supabase.table(table).select("*").eq("application_id", application_id).limit(1).execute()
+                progress[flag] = section_complete(table, result.data[0] if result.data else None)
+
+            docs_result = self.supabase.table("application_documents").select("document_type, upload_status").eq("application_id", application_id).execute()
+            progress["document_types_completed"] = completed_document_types(docs_result.data)
+
+            academic_result = self.supabase.table("academic_history").select("application_id").eq("application_id", application_id).limit(1).execute()
+            progress["academic_history_completed"] = bool(academic_result.data)
+
+            financing_result = self.supabase.table("financing_selections").select("plan_type").eq("application_id", application_id).limit(1).execute()
+            progress["financing_plan"] = financing_result.data[0].get("plan_type") if financing_result.data else None
+
+            declaration_result = self.supabase.table("declarations").select("status").eq("application_id", application_id).limit(1).execute()
+            progress["declaration_signed"] = bool(declaration_result.data) and declaration_result.data[0].get("status") == "completed"
+        except Exception as e:
+            logger.error(f"Failed to rebuild progress for application {application_id}: {str(e)}")
+            raise ExternalServiceError("Database", "Failed to rebuild application progress")
+
+        return self._write(application_id, progress)
+
+    def _write(self, application_id: str, changes: Dict[str, Any],
+               current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = dict(changes)
+        data["application_id"] = application_id
+        result = self.supabase.table(self.table_name).upsert(data).execute()
+        progress = result.data[0] if result.data else {**(current or {}), **data}
+        self.cache.set_progress(application_id, progress)
+        return progress
+
+
+# Global instance
+progress_repository = ProgressRepository()
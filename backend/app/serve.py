@@ -0,0 +1,223 @@
+"""
+Production server for ``app.main:app``.
+
+Usage:
+    python -m app.serve --workers 4 --port $PORT
+
+Several workers need ``CACHE_BACKEND=redis``: caches, idempotency keys, rate
+limits and job records must be shared, so the server refuses to start more
+than one worker without it.
+
+The supervisor imports the application once, binds the listening socket and
+forks the workers, so every worker starts from the already imported app
+(nothing that must not cross a fork is built at import; see
+``app.db.supabase_client``). Each worker runs uvicorn with uvloop and the
+httptools parser.
+
+A worker that has served ``SERVE_MAX_REQUESTS`` requests (plus a random
+jitter, so workers do not all restart together) finishes its open requests
+and exits, and the supervisor starts a replacement. On SIGTERM or SIGINT the
+workers stop accepting connections, wait up to
+``SERVE_GRACEFUL_TIMEOUT_SECONDS`` for in-flight requests, then run the
+shutdown hook, which also drains background work and flushes spans.
+"""
+
+import argparse
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.serve")
+
+# Exit status of a worker whose startup hook failed (uvicorn's own convention)
+STARTUP_FAILURE = 3
+
+# Workers that die sooner than this are replaced only after a pause
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def worker_config(app, args: argparse.Namespace) -> uvicorn.Config:
+    """uvicorn configuration of one worker, with its own max-requests jitter."""
+    limit = None
+    if args.max_requests > 0:
+        limit = args.max_requests + random.randint(0, max(args.max_requests_jitter, 0))
+    return uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        backlog=args.backlog,
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_max_requests=limit,
+        access_log=args.access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+
+
+def run_worker(app, sock: socket.socket, args: argparse.Namespace) -> None:
+    """Body of a forked worker process; never returns."""
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    # The fork copied the supervisor's random state; jitter must differ per worker
+    random.seed()
+    status = 0
+    try:
+        server = uvicorn.Server(worker_config(app, args))
+        server.run(sockets=[sock])
+        if not server.started:
+            status = STARTUP_FAILURE
+    except BaseException:
+        logger.exception("Worker crashed")
+        status = 1
+    finally:
+        logging.shutdown()
+        os._exit(status)
+
+
+class Supervisor:
+    """Forks the workers and replaces the ones that exit"""
+
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.app, self.sock, self.args)
+        self.workers[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+
+    def stop(self, sig: int, frame=None) -> None:
+        if not self.stopping:
+            logger.info(f"Received {signal.Signals(sig).name}; stopping {len(self.workers)} workers")
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        status = 0
+        while self.workers:
+            try:
+                pid, wait_status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self.workers.pop(pid, time.monotonic())
+            code = os.waitstatus_to_exitcode(wait_status)
+
+            if self.stopping:
+                continue
+            if code == STARTUP_FAILURE:
+                logger.error(f"Worker {pid} failed to start; shutting down")
+                status = STARTUP_FAILURE
+                self.stop(signal.SIGTERM)
+                continue
+            if code == 0:
+                logger.info(f"Worker {pid} reached its request limit; replacing it")
+            else:
+                logger.warning(f"Worker {pid} exited with status {code}; replacing it")
+                if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+                    time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+            self.spawn()
+
+        self.sock.close()
+        return status
+
+
+def default_workers() -> int:
+    """``SERVE_WORKERS``, else one per CPU when state is shared through Redis, else one."""
+    if settings.serve_workers:
+        return settings.serve_workers
+    if settings.cache_backend.lower() == "redis":
+        return os.cpu_count() or 1
+    return 1
+
+
+def check_worker_count(workers: int) -> None:
+    """Refuse several workers unless their per-process state is shared through Redis."""
+    if workers <= 1:
+        return
+    if settings.cache_backend.lower() != "redis":
+        raise SystemExit(
+            f"CACHE_BACKEND={settings.cache_backend} cannot run {workers} workers: each would keep its own "
+            "application cache, progress snapshots, idempotency keys, rate limits and submission jobs, "
+            "so a write on one worker leaves the others serving stale data. "
+            "Set CACHE_BACKEND=redis or use --workers 1."
+        )
+    if settings.use_memory_backend:
+        logger.warning("DATABASE_BACKEND=memory with several workers: each worker has its own data")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the enrollment API with forked uvicorn workers")
+    parser.add_argument("--host", default=settings.serve_host, help="Address to bind")
+    parser.add_argument("--port", type=int, default=settings.port, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Worker processes (default: one per CPU with CACHE_BACKEND=redis, else 1)")
+    parser.add_argument("--backlog", type=int, default=settings.serve_backlog,
+                        help="Pending connections the kernel queues")
+    parser.add_argument("--keepalive", type=int, default=settings.serve_keepalive_seconds,
+                        help="Seconds an idle keep-alive connection stays open")
+    parser.add_argument("--max-requests", type=int, default=settings.serve_max_requests,
+                        help="Requests after which a worker is replaced (0: never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.serve_max_requests_jitter,
+                        help="Random extra requests per worker, so workers restart at different times")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.serve_graceful_timeout_seconds,
+                        help="Seconds to wait for in-flight requests on shutdown")
+    parser.add_argument("--forwarded-allow-ips", default=settings.serve_forwarded_allow_ips,
+                        help="Proxies trusted for X-Forwarded-* headers")
+    parser.add_argument("--access-log", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # Preload: the workers are forked from a process that already imported the app
+    from app.main import app
+
+    check_worker_count(args.workers)
+    sock = bind_socket(args.host, args.port, args.backlog)
+    logger.info(
+        f"Serving on {args.host}:{args.port} with {args.workers} workers "
+        f"(uvloop, httptools, backlog {args.backlog}, keep-alive {args.keepalive}s)"
+    )
+    sys.exit(Supervisor(app, sock, args).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,12 @@ from app.repositories.enrollment_repository import enrollment_repository
 from app.api.v1.schemas.academic import (
     AcademicHistoryCreate, AcademicHistoryResponse, AcademicHistoryUpdate
 )
+from app.core.tracing import trace_methods
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class AcademicService:
     """Service for academic business logic"""
 
@@ -55,17 +57,20 @@ class AcademicService:
 
     def get_academic_history(self, application_id: str, user_id: str) -> Optional[AcademicHistoryResponse]:
         """Get academic history by application ID"""
+        record = self.get_academic_history_data(application_id, user_id)
+        if not record:
+            return None
+        return AcademicHistoryResponse(**record)
+
+    def get_academic_history_data(self, application_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get the raw academic history record, before building the response model"""
         try:
             # Verify user owns this application
             app_check = self.enrollment_repository.get_application_by_id_and_user(application_id, user_id)
             if not app_check:
                 raise HTTPException(status_code=403, detail="Access denied")
 
-            record = self.repository.get_academic_history_by_application(application_id)
-            if not record:
-                return None
-
-            return AcademicHistoryResponse(**record)
+            return self.repository.get_academic_history_by_application(application_id)
         except HTTPException:
             raise
         except Exception as e:
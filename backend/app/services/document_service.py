@@ -10,11 +10,13 @@ from app.api.v1.schemas.documents import (
     DeleteFileResponse, CompleteUploadResponse, UploadSummaryResponse
 )
 from app.core.config import settings
-from app.db.supabase_client import supabase_service
+from app.db.supabase_client import supabase_clients
+from app.core.tracing import trace_methods, span, SPAN_KIND_CLIENT
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class DocumentService:
     """Service for document management business logic"""
 
@@ -22,8 +24,17 @@ class DocumentService:
         self.repository = document_repository
         self.enrollment_repo = enrollment_repository
 
+    @property
+    def storage(self):
+        """Storage API of the service client"""
+        return supabase_clients.service.storage
+
     def get_document_status(self, application_id: str, user_id: str) -> DocumentStatusResponse:
         """Get document upload status"""
+        return DocumentStatusResponse(**self.get_document_status_data(application_id, user_id))
+
+    def get_document_status_data(self, application_id: str, user_id: str) -> Dict[str, Any]:
+        """Get raw document upload status, before building the response model"""
         try:
             # Verify user owns this application
             app_check = self.enrollment_repo.get_application_by_id_and_user(application_id, user_id)
@@ -32,10 +43,10 @@ class DocumentService:
 
             summary = self.repository.get_document_status(application_id)
 
-            return DocumentStatusResponse(
-                application_id=application_id,
-                summary=summary
-            )
+            return {
+                "application_id": application_id,
+                "summary": summary
+            }
         except HTTPException:
             raise
         except Exception as e:
@@ -97,14 +108,18 @@ class DocumentService:
             # Upload to Supabase Storage
             bucket_name = bucket_mapping[document_type]
             try:
-                storage_response = supabase_service.storage.from_(bucket_name).upload(
-                    unique_filename,
-                    file_content,
-                    file_options={
-                        "content-type": file.content_type or "application/pdf",
-                        "upsert": False
-                    }
-                )
+                with span("storage.upload", SPAN_KIND_CLIENT, {
+                    "storage.bucket": bucket_name,
+                    "storage.bytes": len(file_content),
+                }):
+                    storage_response = self.storage.from_(bucket_name).upload(
+                        unique_filename,
+                        file_content,
+                        file_options={
+                            "content-type": file.content_type or "application/pdf",
+                            "upsert": False
+                        }
+                    )
             except Exception as storage_error:
                 raise HTTPException(
                     status_code=500,
@@ -112,7 +127,8 @@ class DocumentService:
                 )
 
             # Get public URL
-            file_url = supabase_service.storage.from_(bucket_name).get_public_url(unique_filename)
+            with span("storage.get_public_url", SPAN_KIND_CLIENT, {"storage.bucket": bucket_name}):
+                file_url = self.storage.from_(bucket_name).get_public_url(unique_filename)
 
             # Save document metadata
             doc_id = self.repository.save_document_metadata(user_id, application_id, document_type, file_url)
@@ -153,6 +169,10 @@ class DocumentService:
 
     def get_uploaded_files(self, application_id: str, user_id: str) -> UploadedFilesResponse:
         """Get uploaded files for application"""
+        return UploadedFilesResponse(**self.get_uploaded_files_data(application_id, user_id))
+
+    def get_uploaded_files_data(self, application_id: str, user_id: str) -> Dict[str, Any]:
+        """Get raw uploaded files for application, before building the response model"""
         try:
             # Verify user owns this application
             app_check = self.enrollment_repo.get_application_by_id_and_user(application_id, user_id)
@@ -161,7 +181,7 @@ class DocumentService:
 
             files = self.repository.get_uploaded_files(application_id)
 
-            return UploadedFilesResponse(files=files)
+            return {"files": files}
         except HTTPException:
             raise
         except Exception as e:
@@ -182,7 +202,8 @@ class DocumentService:
 
             # Delete from storage
             try:
-                supabase_service.storage.from_(file_data["bucket_name"]).remove([file_data["file_path"]])
+                with span("storage.remove", SPAN_KIND_CLIENT, {"storage.bucket": file_data["bucket_name"]}):
+                    self.storage.from_(file_data["bucket_name"]).remove([file_data["file_path"]])
             except Exception as e:
                 # Log but don't fail if storage deletion fails
                 logger.warning(f"Failed to delete from storage: {str(e)}")
@@ -5,17 +5,20 @@ from fastapi import HTTPException
 
 from app.repositories.enrollment_repository import enrollment_repository
 from app.repositories.declaration_repository import declaration_repository
+from app.repositories.progress_repository import progress_repository
 from app.api.v1.schemas.enrollment import (
     AutoSaveRequest, AutoSaveResponse, EnrollmentData,
     SubmitEnrollmentResponse, ApplicationResponse,
     UploadSummaryResponse, SubmitApplicationRequest,
-    SubmitApplicationResponse, ApplicationStatus,
+    SubmitApplicationResponse, ApplicationStatus, ApplicationProgressResponse,
     StudentInfoPartial, MedicalInfoPartial, FamilyInfoPartial, FeeResponsibilityInfoPartial
 )
+from app.core.tracing import trace_methods
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class EnrollmentService:
     """Service for enrollment business logic"""
 
@@ -26,9 +29,8 @@ class EnrollmentService:
         """Auto-save enrollment progress"""
         try:
             # Check if user already has ANY application (in_progress or submitted)
-            existing_app = self.repository.get_user_application(user_id)
-            if existing_app:
-                application_id = str(existing_app['id'])
+            application_id = self.repository.get_user_application_id(user_id)
+            if application_id:
                 logger.info(f"Using existing application: {application_id}")
             else:
                 # Create new application if none exists
@@ -93,9 +95,8 @@ class EnrollmentService:
         """Submit complete enrollment"""
         try:
             # Check if user already has an application
-            existing_app = self.repository.get_user_application(user_id)
-            if existing_app:
-                application_id = str(existing_app['id'])
+            application_id = self.repository.get_user_application_id(user_id)
+            if application_id:
                 # Update status to submitted
                 self.repository.update_application_status(application_id, ApplicationStatus.SUBMITTED, submitted_at=True)
                 logger.info(f"Updating existing application {application_id} to submitted status")
@@ -123,6 +124,10 @@ class EnrollmentService:
 
     def get_application(self, application_id: str, user_id: str) -> ApplicationResponse:
         """Get application by ID"""
+        return ApplicationResponse(**self.get_application_data(application_id, user_id))
+
+    def get_application_data(self, application_id: str, user_id: str) -> Dict[str, Any]:
+        """Get raw application data by ID, before building the response model"""
         try:
             # First check if user owns this application
             app_check = self.repository.get_application_by_id_and_user(application_id, user_id)
@@ -134,9 +139,7 @@ class EnrollmentService:
                 else:
                     raise HTTPException(status_code=403, detail="Access denied")
 
-            application_data = self.repository.get_full_application(application_id)
-
-            return ApplicationResponse(**application_data)
+            return self.repository.get_full_application(application_id)
         except HTTPException:
             raise
         except Exception as e:
@@ -160,35 +163,35 @@ class EnrollmentService:
             logger.error(f"Failed to get upload summary for {application_id}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to get upload summary: {str(e)}")
 
-    def submit_application(self, data: SubmitApplicationRequest, user_id: str) -> SubmitApplicationResponse:
-        """Submit full application"""
-        try:
-            # Check if user already has an application
-            existing_app = self.repository.get_user_application(user_id)
-            if existing_app:
-                application_id = str(existing_app['id'])
-                logger.info(f"Using existing application {application_id} for submission")
-            else:
-                # Create new application if none exists (shouldn't happen in normal flow)
-                application_id = self.repository.create_application(user_id, ApplicationStatus.SUBMITTED)
-                logger.info(f"Created new submitted application with ID: {application_id}")
+    def get_progress(self, application_id: str, user_id: str) -> ApplicationProgressResponse:
+        """Get the progress snapshot of an application"""
+        return ApplicationProgressResponse(**self.get_progress_data(application_id, user_id))
 
-            # Save all provided data sections
-            if data.student:
-                self.repository.save_student_data(application_id, data.student)
-            if data.medical:
-                self.repository.save_medical_data(application_id, data.medical)
-            if data.family:
-                self.repository.save_family_data(application_id, data.family)
-            if data.fee:
-                self.repository.save_fee_data(application_id, data.fee)
-
-            # Save academic history if provided
-            if data.academic_history:
-                from app.repositories.academic_repository import academic_repository
-                from app.api.v1.schemas.academic import AcademicHistoryCreate
-                academic_data = AcademicHistoryCreate(
-                    application_id=application_id,
+    def get_progress_data(self, application_id: str, user_id: str) -> Dict[str, Any]:
+        """Get the raw progress snapshot; ownership is checked against the snapshot itself"""
+        try:
+            progress = progress_repository.get_progress(application_id)
+            if not progress or str(progress.get("user_id")) != str(user_id):
+                raise HTTPException(status_code=404, detail="Application not found")
+            return progress
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get progress for {application_id}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to get application progress: {str(e)}")
+
+    def prepare_submission(self, data: SubmitApplicationRequest) -> Dict[str, Any]:
+        """Validate a submission and map it to the repository's submit arguments"""
+        from fastapi.encoders import jsonable_encoder
+        from pydantic import ValidationError
+        from app.api.v1.schemas.academic import AcademicHistoryCreate
+
+        academic_history = None
+        if data.academic_history:
+            try:
+                academic_history = AcademicHistoryCreate(
+                    # Set by the database function
+                    application_id="",
                     school_name=data.academic_history.get("schoolName") or "N/A",
                     school_type=data.academic_history.get("schoolType") or "public",
                     last_grade_completed=data.academic_history.get("lastGradeCompleted") or "N/A",
@@ -200,21 +203,32 @@ class EnrollmentService:
                     school_address=data.academic_history.get("schoolAddress") or None,
                     additional_notes=data.academic_history.get("additionalNotes") or None,
                     report_card_url=data.academic_history.get("reportCardUrl") or ""
-                )
-                academic_repository.create_academic_history(academic_data)
-
-            # Update declaration fields if provided
-            if data.declaration:
-                update_data = {}
-                if "agreeAuditStorage" in data.declaration:
-                    update_data["agree_audit_storage"] = data.declaration["agreeAuditStorage"]
-                if "agreeAffordabilityProcessing" in data.declaration:
-                    update_data["agree_affordability_processing"] = data.declaration["agreeAffordabilityProcessing"]
-                if update_data:
-                    self.repository.update(application_id, update_data)
-
-            # Update application status to submitted
-            self.repository.update_application_status(application_id, ApplicationStatus.SUBMITTED, submitted_at=True)
+                ).model_dump(mode="json", exclude={"application_id"})
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors(include_url=False)))
+
+        declaration = {}
+        if data.declaration:
+            if "agreeAuditStorage" in data.declaration:
+                declaration["agree_audit_storage"] = data.declaration["agreeAuditStorage"]
+            if "agreeAffordabilityProcessing" in data.declaration:
+                declaration["agree_affordability_processing"] = data.declaration["agreeAffordabilityProcessing"]
+
+        return {
+            "student": data.student,
+            "medical": data.medical,
+            "family": data.family,
+            "fee": data.fee,
+            "academic_history": academic_history,
+            "declaration": declaration,
+        }
+
+    def submit_application(self, data: SubmitApplicationRequest, user_id: str) -> SubmitApplicationResponse:
+        """Submit full application in a single database transaction"""
+        try:
+            # Sections, academic history, declaration flags and status in one round trip
+            application_id = self.repository.submit_application(user_id, **self.prepare_submission(data))
+            logger.info(f"Submitted application {application_id}")
 
             return SubmitApplicationResponse(
                 message="Application submitted successfully",
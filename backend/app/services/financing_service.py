@@ -6,10 +6,12 @@ from typing import Dict, Any, Optional
 import logging
 from app.repositories.financing_repository import financing_repository
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_methods
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class FinancingService:
     """Service for financing business logic"""
 
@@ -0,0 +1,102 @@
+"""
+Service warming the application cache after login.
+
+The first screen after login requests the application, document status,
+uploaded files, academic history, financing selection and progress one after
+another. When ``PREFETCH_ON_LOGIN`` is enabled, a parent's first authenticated
+request loads all of them into the application cache on a background thread,
+so the requests that follow are served from memory. A user is warmed at most
+once per ``PREFETCH_INTERVAL_SECONDS``.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.core.cache import application_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.repositories.academic_repository import academic_repository
+from app.repositories.document_repository import document_repository
+from app.repositories.enrollment_repository import enrollment_repository
+from app.repositories.financing_repository import financing_repository
+from app.repositories.progress_repository import progress_repository
+
+logger = logging.getLogger(__name__)
+
+prefetch_total = metrics.counter(
+    "prefetch_total", "Login-time application prefetches by result", ["result"]
+)
+
+
+class PrefetchService:
+    """Warms the application cache for a user in the background"""
+
+    def __init__(self, workers: int = 4, interval: float = 1800.0):
+        self.cache = application_cache
+        self.workers = workers
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def schedule(self, user_id: Optional[str]) -> bool:
+        """
+        Warm a user's application unless it was warmed recently.
+
+        Args:
+            user_id: Authenticated user ID
+
+        Returns:
+            True if a warm-up was scheduled
+        """
+        if not self.cache.claim_prefetch(user_id, self.interval):
+            return False
+        with self._lock:
+            if self._executor is None:
+                # Created on first use, so importing the app starts no threads
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+            self._executor.submit(self.warm, user_id)
+        return True
+
+    def warm(self, user_id: str) -> None:
+        """
+        Load a user's application bundle into the application cache.
+
+        Failures are logged and counted; the requests that follow simply
+        load what is missing themselves.
+
+        Args:
+            user_id: Authenticated user ID
+        """
+        try:
+            application_id = enrollment_repository.get_user_application_id(user_id)
+            if not application_id:
+                prefetch_total.inc(result="no_application")
+                return
+
+            enrollment_repository.get_application_by_id(application_id)
+            enrollment_repository.get_full_application(application_id)
+            document_repository.get_document_status(application_id)
+            document_repository.get_uploaded_files(application_id)
+            academic_repository.get_academic_history_by_application(application_id)
+            financing_repository.get_financing_selection(application_id)
+            progress_repository.get_progress(application_id)
+            prefetch_total.inc(result="warmed")
+        except Exception as e:
+            prefetch_total.inc(result="error")
+            logger.warning(f"Prefetch failed for user {user_id}: {str(e)}")
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Drop queued warm-ups; with ``wait``, let running ones finish first."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instance
+prefetch_service = PrefetchService(
+    workers=settings.prefetch_workers,
+    interval=settings.prefetch_interval_seconds,
+)
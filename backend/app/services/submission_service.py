@@ -0,0 +1,133 @@
+"""
+Service running application submissions in the background.
+
+With ``Prefer: respond-async``, ``/enrollment/submit-application`` validates
+the payload, queues a submission job and answers 202 with the job's status
+instead of waiting for the database. At most ``SUBMISSION_WORKERS`` jobs run
+at a time, each in three steps:
+
+    apply            Save the sections, academic history, declaration flags
+                     and submitted status in one transaction
+    check_documents  List the required document types still incomplete
+    notify           POST an ``application.submitted`` event to
+                     ``SUBMISSION_WEBHOOK_URL`` (skipped when unset)
+
+A failed ``apply`` fails the job. The later steps run after the application
+is submitted, so their failures are logged and shown on the step, and the job
+still succeeds. An ``apply`` still running at shutdown is waited for, and the
+job records whether the application was submitted, with the later steps
+skipped. ``GET /enrollment/submissions/{job_id}`` reports the job.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from app.api.v1.schemas.enrollment import SubmitApplicationRequest
+from app.core.config import settings
+from app.core.constants import DOCUMENT_REQUIREMENTS
+from app.core.executors import executor_pools
+from app.core.jobs import Job, JobQueue, create_job_store
+from app.core.metrics import metrics
+from app.repositories.progress_repository import progress_repository
+from app.services.enrollment_service import enrollment_service
+
+logger = logging.getLogger(__name__)
+
+STEPS = ("apply", "check_documents", "notify")
+
+submission_notifications_total = metrics.counter(
+    "submission_notifications_total", "Submitted-application webhook calls by result", ["result"]
+)
+
+
+class SubmissionService:
+    """Service for asynchronous application submissions"""
+
+    def __init__(self, queue: JobQueue, webhook_url: Optional[str] = None, webhook_timeout: float = 5.0):
+        self.queue = queue
+        self.webhook_url = webhook_url
+        self.webhook_timeout = webhook_timeout
+
+    async def enqueue(self, data: SubmitApplicationRequest, user_id: str) -> Dict[str, Any]:
+        """Validate a submission and queue it; returns the job's status record"""
+        # Reject invalid payloads now rather than in a failed job
+        enrollment_service.prepare_submission(data)
+        return await self.queue.enqueue(user_id, list(STEPS), lambda job: self._process(job, data))
+
+    def get_status(self, job_id: str, user_id: str) -> Dict[str, Any]:
+        """Get a submission job of the user"""
+        try:
+            record = self.queue.get(job_id, user_id)
+        except Exception as e:
+            logger.error(f"Failed to get submission job {job_id}: {str(e)}")
+            raise HTTPException(status_code=503, detail="Submission status is unavailable")
+        if record is None:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return record
+
+    def missing_documents(self, application_id: str) -> List[str]:
+        """Required document types that are not complete yet"""
+        progress = progress_repository.get_progress(application_id) or {}
+        completed = set(progress.get("document_types_completed") or [])
+        return [doc_type for doc_type in DOCUMENT_REQUIREMENTS if doc_type not in completed]
+
+    def notify(self, event: Dict[str, Any]) -> None:
+        """POST a submission event to the configured webhook"""
+        response = httpx.post(self.webhook_url, json=event, timeout=self.webhook_timeout)
+        response.raise_for_status()
+
+    async def _process(self, job: Job, data: SubmitApplicationRequest) -> None:
+        async with job.step("apply"):
+            # Shielded: a submission caught by shutdown still finishes in its thread, and is recorded
+            submitted = await job.shield(
+                executor_pools.run("writes", enrollment_service.submit_application, data, job.user_id),
+                on_result=lambda done: job.update(application_id=done.application_id),
+            )
+        application_id = submitted.application_id
+        await job.update(application_id=application_id)
+
+        checked, missing = await self._post_submit(job, "check_documents", "reads", self.missing_documents, application_id)
+        if checked:
+            await job.update(missing_documents=missing)
+
+        if not self.webhook_url:
+            await job.skip("notify")
+            return
+        event = {
+            "event": "application.submitted",
+            "application_id": application_id,
+            "user_id": job.user_id,
+            "missing_documents": missing,
+        }
+        notified, _ = await self._post_submit(job, "notify", "writes", self.notify, event)
+        submission_notifications_total.inc(result="sent" if notified else "failed")
+
+    async def _post_submit(self, job: Job, step: str, pool: str, fn: Callable[..., Any],
+                           *args: Any) -> Tuple[bool, Any]:
+        """Run a step after the application is submitted; returns whether it succeeded and its result"""
+        try:
+            async with job.step(step):
+                return True, await executor_pools.run(pool, fn, *args)
+        except Exception as e:
+            logger.warning(f"Submission job {job.id}: {step} failed: {str(e)}")
+            return False, None
+
+
+# Global instance
+submission_queue = JobQueue(
+    "submission",
+    create_job_store(settings),
+    workers=settings.submission_workers,
+    max_pending=settings.submission_queue_size,
+    ttl=settings.submission_job_ttl_seconds,
+    offload=settings.cache_backend.lower() == "redis",
+)
+submission_queue.export_metrics()
+submission_service = SubmissionService(
+    submission_queue,
+    webhook_url=settings.submission_webhook_url,
+    webhook_timeout=settings.submission_webhook_timeout_seconds,
+)
@@ -0,0 +1,365 @@
+"""
+Unit tests for the application cache.
+
+Tests TTL/LRU eviction, generation-based invalidation, the Redis backend
+encoding, write-through invalidation in repositories, the user index,
+negative caching of missing applications and stale-while-revalidate reads.
+"""
+
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+from app.api.v1.schemas.enrollment import ApplicationStatus
+from app.core.cache import ApplicationCache, InMemoryCacheBackend, RedisCacheBackend
+from app.db.memory_client import MemorySupabaseClient
+from app.repositories.academic_repository import AcademicRepository
+from app.repositories.document_repository import DocumentRepository
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.financing_repository import FinancingRepository
+from app.repositories.progress_repository import progress_repository
+
+
+class FakeRedis:
+    """Dictionary standing in for a Redis connection"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [k for k in list(self.data) if k.startswith(match.rstrip("*"))]
+
+
+class TestInMemoryCacheBackend:
+    """Test cases for InMemoryCacheBackend"""
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL"""
+        backend = InMemoryCacheBackend()
+        backend.set("key", {"a": 1}, ttl=0.01)
+        assert backend.get("key") == {"a": 1}
+        time.sleep(0.02)
+        assert backend.get("key") is None
+
+    def test_lru_eviction_and_copies(self):
+        """Test least recently used entries are evicted and values are copied"""
+        backend = InMemoryCacheBackend(max_entries=2)
+        backend.set("a", {"n": 1}, ttl=60)
+        backend.set("b", {"n": 2}, ttl=60)
+        backend.get("a")["n"] = 99
+        backend.set("c", {"n": 3}, ttl=60)
+
+        assert backend.get("a") == {"n": 1}
+        assert backend.get("b") is None
+        assert backend.get("c") == {"n": 3}
+
+
+class TestApplicationCache:
+    """Test cases for ApplicationCache"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+
+    def test_read_through_and_invalidate(self):
+        """Test a second read is served from the cache until invalidated"""
+        loader = Mock(return_value={"plan_type": "bnpl"})
+
+        assert self.cache.get_or_load("app123", "financing_selection", loader) == {"plan_type": "bnpl"}
+        self.cache.get_or_load("app123", "financing_selection", loader)
+        assert loader.call_count == 1
+
+        self.cache.invalidate("app123")
+        self.cache.get_or_load("app123", "financing_selection", loader)
+        assert loader.call_count == 2
+
+    def test_invalidate_is_per_application(self):
+        """Test invalidating one application keeps the others cached"""
+        loader = Mock(return_value={"id": "x"})
+        self.cache.get_or_load("app1", "declaration", loader)
+        self.cache.get_or_load("app2", "declaration", loader)
+
+        self.cache.invalidate("app1")
+        self.cache.get_or_load("app1", "declaration", loader)
+        self.cache.get_or_load("app2", "declaration", loader)
+
+        assert loader.call_count == 3
+
+    def test_reader_never_replaces_concurrent_generation(self):
+        """Test a reader creating the generation keeps the token of an invalidation that raced it"""
+        backend = InMemoryCacheBackend()
+        cache = ApplicationCache(backend, ttl=60)
+        real_get = backend.get
+        tokens = []
+
+        def racing_get(key):
+            value = real_get(key)
+            if key.endswith(":generation") and not tokens:
+                # A write invalidates the application between the reader's get and its create
+                cache.invalidate("app123")
+                tokens.append(real_get(key))
+            return value
+
+        with patch.object(backend, "get", side_effect=racing_get):
+            cache.get_or_load("app123", "declaration", Mock(return_value={"id": "x"}))
+
+        assert real_get("app:app123:generation") == tokens[0]
+
+    def test_prefetch_claim_is_taken_once(self):
+        """Test a user can be claimed for prefetching once per TTL, including on Redis"""
+        assert self.cache.claim_prefetch("user123", ttl=60) is True
+        assert self.cache.claim_prefetch("user123", ttl=60) is False
+
+        shared = ApplicationCache(RedisCacheBackend(client=FakeRedis()), ttl=60)
+        assert shared.claim_prefetch("user123", ttl=60) is True
+        assert shared.claim_prefetch("user123", ttl=60) is False
+
+    def test_empty_results_not_cached(self):
+        """Test None results always reach the loader"""
+        loader = Mock(return_value=None)
+        self.cache.get_or_load("app123", "declaration", loader)
+        self.cache.get_or_load("app123", "declaration", loader)
+        assert loader.call_count == 2
+
+    def test_backend_errors_fall_back_to_loader(self):
+        """Test a failing backend does not fail the read"""
+        backend = Mock()
+        backend.get.side_effect = ConnectionError("down")
+        cache = ApplicationCache(backend, ttl=60)
+
+        assert cache.get_or_load("app123", "declaration", lambda: {"id": "d1"}) == {"id": "d1"}
+
+    def test_redis_backend(self):
+        """Test the Redis backend round-trips JSON values"""
+        cache = ApplicationCache(RedisCacheBackend(client=FakeRedis()), ttl=60)
+        loader = Mock(return_value={"school_name": "Test School"})
+
+        cache.get_or_load("app123", "academic_history", loader)
+        assert cache.get_or_load("app123", "academic_history", loader) == {"school_name": "Test School"}
+        assert loader.call_count == 1
+
+
+class TestRepositoryInvalidation:
+    """Test cases for repository write-through invalidation"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+        self.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+        self.repository = FinancingRepository()
+        self.repository.supabase = self.client
+        self.repository.cache = self.cache
+        self.patches = [
+            patch.object(progress_repository, "_supabase", self.client),
+            patch.object(progress_repository, "cache", self.cache),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        """Restore the shared progress repository"""
+        for p in self.patches:
+            p.stop()
+
+    def test_write_invalidates_cached_read(self):
+        """Test saving a selection makes the next read see it"""
+        self.repository.save_financing_selection("app123", "monthly_flat")
+        assert self.repository.get_financing_selection("app123")["plan_type"] == "monthly_flat"
+
+        self.repository.save_financing_selection("app123", "bnpl")
+        assert self.repository.get_financing_selection("app123")["plan_type"] == "bnpl"
+
+    def test_cached_read_skips_database(self):
+        """Test a cache hit issues no query"""
+        academic = AcademicRepository()
+        academic.supabase = self.client
+        academic.cache = self.cache
+        self.client.table("academic_history").insert({"application_id": "app123", "school_name": "S"}).execute()
+
+        academic.get_academic_history_by_application("app123")
+        academic.supabase = Mock()
+        assert academic.get_academic_history_by_application("app123")["school_name"] == "S"
+        academic.supabase.table.assert_not_called()
+
+
+class TestUserApplicationIndex:
+    """Test cases for the user -> application_id index"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+        self.repository = EnrollmentRepository()
+        self.repository.supabase = self.client
+        self.repository.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+        self.patches = [
+            patch.object(progress_repository, "_supabase", self.client),
+            patch.object(progress_repository, "cache", self.repository.cache),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        """Restore the shared progress repository"""
+        for p in self.patches:
+            p.stop()
+
+    def test_creation_fills_index(self):
+        """Test a created application is found without a query"""
+        application_id = self.repository.create_application("user123")
+
+        self.repository.supabase = Mock()
+        assert self.repository.get_user_application_id("user123") == application_id
+        self.repository.supabase.table.assert_not_called()
+
+    def test_first_lookup_fills_index_and_status_change_clears_it(self):
+        """Test the index is filled on lookup and dropped on status changes"""
+        row = self.client.table("applications").insert({"user_id": "user123", "status": "in_progress"}).execute().data[0]
+
+        assert self.repository.get_user_application_id("user123") == row["id"]
+        assert self.repository.cache.backend.get("user:user123:application_id") == row["id"]
+
+        self.repository.update_application_status(row["id"], ApplicationStatus.SUBMITTED, submitted_at=True)
+        assert self.repository.cache.backend.get("user:user123:application_id") is None
+        assert self.repository.get_user_application_id("user123") == row["id"]
+
+    def test_unknown_user(self):
+        """Test users without an application are not indexed"""
+        assert self.repository.get_user_application_id("nobody") is None
+        assert self.repository.cache.backend.get("user:nobody:application_id") is None
+
+
+class TestNegativeCache:
+    """Test cases for negative caching of application lookups"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+        self.repository = EnrollmentRepository()
+        self.repository.supabase = self.client
+        self.repository.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60, negative_ttl=60)
+        self.patches = [
+            patch.object(progress_repository, "_supabase", self.client),
+            patch.object(progress_repository, "cache", self.repository.cache),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        """Restore the shared progress repository"""
+        for p in self.patches:
+            p.stop()
+
+    def test_missing_application_is_remembered(self):
+        """Test repeated lookups of an unknown ID query the database once"""
+        unknown = "5f0c2f7e-1111-4a4a-9b9b-000000000000"
+        assert self.repository.get_application_by_id(unknown) is None
+
+        self.repository.supabase = Mock()
+        assert self.repository.get_application_by_id(unknown) is None
+        assert self.repository.get_application_by_id_and_user(unknown, "user123") is None
+        self.repository.supabase.table.assert_not_called()
+
+    def test_malformed_id_never_queries(self):
+        """Test IDs that are not UUIDs are treated as missing without a query"""
+        self.repository.supabase = Mock()
+        assert self.repository.get_application_by_id("../etc/passwd") is None
+        self.repository.supabase.table.assert_not_called()
+        assert len(self.repository.cache.backend) == 0
+
+    def test_unknown_ids_leave_one_short_lived_entry_each(self):
+        """Test a lookup of an unknown ID stores only its negative entry"""
+        backend = self.repository.cache.backend
+        for n in range(100):
+            assert self.repository.get_application_by_id(str(uuid.UUID(int=n))) is None
+
+        assert len(backend) == 100
+        assert backend.get(f"app:{uuid.UUID(int=0)}:generation") is None
+
+    def test_creation_drops_negative_entry(self):
+        """Test creating an application invalidates a negative entry for its ID"""
+        application_id = "5f0c2f7e-2222-4a4a-9b9b-000000000000"
+        assert self.repository.get_application_by_id(application_id) is None
+
+        self.client.table("applications").insert({"id": application_id, "user_id": "user123", "status": "in_progress"}).execute()
+        with patch.object(self.repository, "insert", return_value={"id": application_id}):
+            self.repository.create_application("user123")
+
+        assert self.repository.get_application_by_id(application_id)["user_id"] == "user123"
+
+    def test_negative_entries_expire(self):
+        """Test negative entries only live for the negative TTL"""
+        cache = ApplicationCache(InMemoryCacheBackend(), ttl=60, negative_ttl=0.01)
+        loader = Mock(return_value=None)
+
+        cache.get_or_load("app123", "application", loader, cache_missing=True)
+        cache.get_or_load("app123", "application", loader, cache_missing=True)
+        assert loader.call_count == 1
+
+        time.sleep(0.02)
+        cache.get_or_load("app123", "application", loader, cache_missing=True)
+        assert loader.call_count == 2
+
+
+class TestStaleWhileRevalidate:
+    """Test cases for stale-while-revalidate reads"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+        self.loads = []
+
+    def loader(self):
+        self.loads.append(1)
+        return len(self.loads)
+
+    def wait_for_refresh(self):
+        self.cache.shutdown(wait=True)
+
+    def test_fresh_entry_is_served(self):
+        """Test a fresh entry is returned without reloading"""
+        assert self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=60) == 1
+        assert self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=60) == 1
+        assert len(self.loads) == 1
+
+    def test_stale_entry_served_then_refreshed(self):
+        """Test a stale entry is returned immediately and reloaded in the background"""
+        self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=0)
+
+        assert self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=0) == 1
+        self.wait_for_refresh()
+        assert self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=60) == 2
+
+    def test_invalidation_forces_fresh_load(self):
+        """Test the first read after a write loads synchronously"""
+        self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=60)
+        self.cache.invalidate("app1")
+        assert self.cache.get_stale_while_revalidate("app1", "summary", self.loader, soft_ttl=60) == 2
+
+    def test_upload_refreshes_summary(self):
+        """Test a recorded upload shows up in the next summary"""
+        client = MemorySupabaseClient()
+        repository = DocumentRepository()
+        repository.supabase = client
+        repository.cache = self.cache
+        with patch.object(progress_repository, "_supabase", client), \
+                patch.object(progress_repository, "cache", self.cache):
+            application_id = str(uuid.uuid4())
+            with patch.object(repository, "_load_upload_summary", side_effect=[
+                {"completed_categories": 0, "uploaded_types": []},
+                {"completed_categories": 1, "uploaded_types": ["proof_of_address"]},
+            ]):
+                assert repository.get_upload_summary(application_id)["completed_categories"] == 0
+                repository.save_document_metadata("user123", application_id, "proof_of_address", "url")
+                assert repository.get_upload_summary(application_id)["completed_categories"] == 1
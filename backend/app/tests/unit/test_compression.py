@@ -0,0 +1,118 @@
+"""
+Unit tests for response compression.
+
+Tests Accept-Encoding negotiation, size-based levels, skipped content types,
+streamed bodies and the compressed-body cache for responses with an ETag.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CODECS, CompressionMiddleware, level_for, negotiate
+
+PAYLOAD = {"rows": [{"id": i, "name": "Applicant", "status": "submitted"} for i in range(200)]}
+
+
+async def etagged(request):
+    return JSONResponse(PAYLOAD, headers={"ETag": '"v1"'})
+
+
+async def pdf(request):
+    return Response(b"%PDF" + b"0" * 5000, media_type="application/pdf")
+
+
+async def small(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def streamed(request):
+    async def chunks():
+        for _ in range(3):
+            yield b"x" * 2000
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def make_app(encodings="br,zstd,gzip"):
+    app = Starlette(routes=[Route(path, endpoint) for path, endpoint in (
+        ("/etagged", etagged), ("/pdf", pdf), ("/small", small), ("/streamed", streamed),
+    )])
+    return CompressionMiddleware(app, minimum_size=1000, encodings=encodings)
+
+
+def get(app, path, accept_encoding):
+    async def call():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+            return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+    return asyncio.run(call())
+
+
+class TestNegotiation:
+    """Test cases for negotiate and level_for"""
+
+    def test_quality_then_preference(self):
+        """Test the highest q-value wins and ties go to the server's order"""
+        preference = ["br", "zstd", "gzip"]
+        assert negotiate("gzip, br, zstd", preference) == "br"
+        assert negotiate("br;q=0.5, gzip", preference) == "gzip"
+        assert negotiate("*;q=0.1, br;q=0", preference) == "zstd"
+        assert negotiate("identity", preference) is None
+        assert negotiate("", preference) is None
+
+    def test_levels_drop_with_size(self):
+        """Test larger bodies are compressed at lower levels"""
+        assert level_for("gzip", 1000) > level_for("gzip", 10 * 1024 * 1024)
+        assert level_for("gzip", None) == level_for("gzip", 100 * 1024)
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware"""
+
+    def test_gzip_with_weak_etag(self):
+        """Test a gzip response decodes to the original body and carries a weak ETag"""
+        response = get(make_app("gzip"), "/etagged", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == PAYLOAD
+
+    def test_skips_small_and_compressed_content(self):
+        """Test small bodies and already-compressed types are sent as they are"""
+        app = make_app("gzip")
+        for path in ("/small", "/pdf"):
+            response = get(app, path, "gzip")
+            assert "content-encoding" not in response.headers
+
+    def test_streamed_body(self):
+        """Test streamed responses are compressed chunk by chunk"""
+        response = get(make_app("gzip"), "/streamed", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "x" * 6000
+
+    def test_etag_bodies_compressed_once(self, monkeypatch):
+        """Test repeated responses with the same ETag reuse the compressed body"""
+        app = make_app("gzip")
+        compress, streaming = CODECS["gzip"]
+        calls = []
+        monkeypatch.setitem(CODECS, "gzip", (lambda data, level: calls.append(level) or compress(data, level), streaming))
+
+        bodies = {get(app, "/etagged", "gzip").content for _ in range(3)}
+
+        assert len(calls) == 1
+        assert len(bodies) == 1
+        assert bodies.pop() == JSONResponse(PAYLOAD).body
+
+    @pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+    def test_optional_encodings(self, encoding, module):
+        """Test brotli and zstd are negotiated when their packages are installed"""
+        pytest.importorskip(module)
+        response = get(make_app(), "/etagged", f"gzip, {encoding}")
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.json() == PAYLOAD
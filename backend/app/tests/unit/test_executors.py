@@ -0,0 +1,54 @@
+"""
+Unit tests for the executor pools.
+
+Tests that each pool bounds its own concurrency and reports its queue, that
+a saturated pool does not delay the others, and that calls keep the
+request's context.
+"""
+
+import asyncio
+import threading
+
+from app.core.executors import ExecutorPool, ExecutorPools, executor_queue_depth
+from app.core.tracing import get_request_id, reset_request_id, set_request_id
+
+
+class TestExecutorPools:
+    """Test cases for ExecutorPool and ExecutorPools"""
+
+    def test_saturated_pool_does_not_delay_others(self):
+        """Test queued uploads are counted while reads on another pool run immediately"""
+        uploads, reads = ExecutorPool("test_uploads", 1), ExecutorPool("test_reads", 1)
+        uploads.export_metrics()
+        pools = ExecutorPools({"uploads": uploads, "reads": reads})
+        release = threading.Event()
+
+        async def scenario():
+            pending = [asyncio.ensure_future(pools.run("uploads", release.wait, 5)) for _ in range(3)]
+            try:
+                while uploads.active < 1:
+                    await asyncio.sleep(0.01)
+                assert (uploads.active, uploads.queued) == (1, 2)
+                assert executor_queue_depth.value(pool="test_uploads") == 2
+                return await asyncio.wait_for(pools.run("reads", lambda: "read"), 1)
+            finally:
+                release.set()
+                await asyncio.gather(*pending)
+
+        assert asyncio.run(scenario()) == "read"
+        assert (uploads.active, uploads.queued) == (0, 0)
+        pools.shutdown()
+
+    def test_calls_keep_request_context(self):
+        """Test the request ID bound in the route is visible inside the pool thread"""
+        pool = ExecutorPool("test_context", 1)
+
+        async def scenario():
+            token = set_request_id("req-123")
+            try:
+                return await pool.run(get_request_id)
+            finally:
+                reset_request_id(token)
+
+        assert asyncio.run(scenario()) == "req-123"
+        pool.shutdown()
@@ -0,0 +1,57 @@
+"""
+Unit tests for ETag and conditional GET helpers.
+
+Tests ETag stability and If-None-Match matching.
+"""
+
+import asyncio
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.core.http_cache import compute_etag, conditional_response, etag_matches, load_with_etag
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestHttpCache:
+    """Test cases for the ETag helpers"""
+
+    def test_etag_ignores_key_order_and_depends_on_resource(self):
+        """Test equal content gives equal ETags only for the same resource"""
+        first = compute_etag("application", {"id": "app123", "student": {"surname": "Doe"}})
+        second = compute_etag("application", {"student": {"surname": "Doe"}, "id": "app123"})
+
+        assert first == second
+        assert first.startswith('"') and first.endswith('"')
+        assert compute_etag("uploaded_files", {"id": "app123", "student": {"surname": "Doe"}}) != first
+        assert compute_etag("application", {"id": "app123", "student": {"surname": "Smith"}}) != first
+
+    def test_etag_matches_lists_weak_and_wildcard(self):
+        """Test If-None-Match parsing"""
+        etag = '"abc"'
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"xyz", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"xyz"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_conditional_response(self):
+        """Test 304 on a matching ETag and headers on a fresh response"""
+        data, etag = asyncio.run(load_with_etag("uploaded_files", "reads", lambda: {"files": []}))
+        response = Response()
+
+        assert data == {"files": []}
+        assert etag == compute_etag("uploaded_files", data)
+        assert conditional_response(make_request(), response, "uploaded_files", etag) is None
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        not_modified = conditional_response(make_request(etag), Response(), "uploaded_files", etag)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
@@ -0,0 +1,106 @@
+"""
+Unit tests for the shared Supabase HTTP client.
+
+Tests that requests reuse pooled connections, that the reuse metrics count
+them and that database and storage calls of different Supabase clients share
+one pool while keeping their own keys.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from supabase import ClientOptions, create_client
+
+from app.db.http_client import create_http_client, supabase_http_requests_total
+
+ANON_KEY = "anon.key.token"
+SERVICE_KEY = "service.key.token"
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering every request with an empty JSON list"""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def _respond(self):
+        length = int(self.headers.get("content-length") or 0)
+        self.rfile.read(length)
+        self.requests.append((self.command, self.path, self.headers.get("apikey")))
+        body = json.dumps([]).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def pool_settings(**overrides):
+    values = dict(
+        supabase_http2=False,
+        supabase_http_max_connections=10,
+        supabase_http_max_keepalive_connections=5,
+        supabase_http_keepalive_expiry_seconds=60.0,
+        supabase_http_connect_timeout_seconds=5.0,
+        supabase_http_read_timeout_seconds=5.0,
+        supabase_http_pool_timeout_seconds=5.0,
+        circuit_breaker_enabled=False,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestSharedHttpClient:
+    """Test cases for create_http_client"""
+
+    def setup_method(self):
+        """Start a local keep-alive server"""
+        RecordingHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = create_http_client(pool_settings())
+
+    def teardown_method(self):
+        """Stop the server and close the pool"""
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def counts(self):
+        return (supabase_http_requests_total.value(connection="new", http_version="HTTP/1.1"),
+                supabase_http_requests_total.value(connection="reused", http_version="HTTP/1.1"))
+
+    def test_connection_is_reused(self):
+        """Test sequential requests open one connection and reuse it"""
+        new, reused = self.counts()
+
+        for _ in range(3):
+            assert self.client.get(f"{self.url}/rest/v1/applications").status_code == 200
+
+        assert self.counts() == (new + 1, reused + 2)
+        assert self.client._transport.pool_connections() == 1
+
+    def test_supabase_clients_share_pool(self):
+        """Test database and storage calls of the anon and service clients share connections"""
+        anon = create_client(self.url, ANON_KEY, ClientOptions(httpx_client=self.client))
+        service = create_client(self.url, SERVICE_KEY, ClientOptions(httpx_client=self.client))
+        new, _ = self.counts()
+
+        anon.table("applications").select("*").execute()
+        service.table("applications").select("*").execute()
+        service.storage.from_("documents").list()
+
+        assert self.counts()[0] == new + 1
+        assert [(method, path.split("?")[0], key) for method, path, key in RecordingHandler.requests] == [
+            ("GET", "/rest/v1/applications", ANON_KEY),
+            ("GET", "/rest/v1/applications", SERVICE_KEY),
+            ("POST", "/storage/v1/object/list/documents", SERVICE_KEY),
+        ]
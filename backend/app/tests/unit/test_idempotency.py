@@ -0,0 +1,142 @@
+"""
+Unit tests for idempotency keys.
+
+Tests that retries replay the stored response, that concurrent duplicates
+wait for the first request, and how key reuse, client errors, server
+errors and cancelled requests are handled.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.cache import InMemoryCacheBackend
+from app.core.idempotency import PENDING, IdempotencyStore, request_fingerprint
+
+
+def keyed_request(key="key-1"):
+    return SimpleNamespace(headers={"Idempotency-Key": key})
+
+
+def make_store(**kwargs):
+    return IdempotencyStore(InMemoryCacheBackend(max_entries=100), **kwargs)
+
+
+class TestIdempotencyStore:
+    """Test cases for IdempotencyStore"""
+
+    def test_retry_replays_response(self):
+        """Test a retry with the same key gets the first response without running again"""
+        store = make_store()
+        handler = Mock(return_value={"message": "Application submitted successfully"})
+
+        first = asyncio.run(store.run(keyed_request(), "user1", "submit", {"a": 1}, handler))
+        replay = asyncio.run(store.run(keyed_request(), "user1", "submit", {"a": 1}, handler))
+
+        assert first == {"message": "Application submitted successfully"}
+        assert isinstance(replay, JSONResponse)
+        assert replay.body == b'{"message":"Application submitted successfully"}'
+        assert replay.headers["idempotent-replayed"] == "true"
+        assert handler.call_count == 1
+
+    def test_keys_are_per_user(self):
+        """Test the same key from another user runs separately"""
+        store = make_store()
+        handler = Mock(return_value={"ok": True})
+
+        asyncio.run(store.run(keyed_request(), "user1", "submit", {}, handler))
+        asyncio.run(store.run(keyed_request(), "user2", "submit", {}, handler))
+
+        assert handler.call_count == 2
+
+    def test_reused_key_with_other_payload(self):
+        """Test a key reused for a different body is rejected with 422"""
+        store = make_store()
+        asyncio.run(store.run(keyed_request(), "user1", "submit", {"a": 1}, lambda: {"ok": True}))
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(store.run(keyed_request(), "user1", "submit", {"a": 2}, lambda: {"ok": True}))
+        assert error.value.status_code == 422
+
+    def test_duplicate_waits_for_first_request(self):
+        """Test a duplicate arriving mid-request replays the first result once it completes"""
+        store = make_store(wait=5)
+        record_key = "idempotency:user1:submit:key-1"
+        fingerprint = request_fingerprint({"a": 1})
+        store.backend.add(record_key, {"state": PENDING, "fingerprint": fingerprint}, 60)
+        handler = Mock()
+
+        async def scenario():
+            duplicate = asyncio.ensure_future(store.run(keyed_request(), "user1", "submit", {"a": 1}, handler))
+            await asyncio.sleep(0.1)
+            assert not duplicate.done()
+            await store._complete(record_key, fingerprint, 200, {"n": 1})
+            return await duplicate
+
+        response = asyncio.run(scenario())
+        assert response.body == b'{"n":1}'
+        handler.assert_not_called()
+
+    def test_duplicate_times_out_with_conflict(self):
+        """Test a duplicate answers 409 when the first request does not finish in time"""
+        store = make_store(wait=0.1)
+        store.backend.add("idempotency:user1:submit:key-1", {"state": PENDING, "fingerprint": request_fingerprint({})}, 60)
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(store.run(keyed_request(), "user1", "submit", {}, Mock()))
+        assert error.value.status_code == 409
+
+    def test_errors(self):
+        """Test client errors are replayed and server errors release the key"""
+        store = make_store()
+
+        def client_error():
+            raise HTTPException(status_code=404, detail="Application not found")
+
+        def server_error():
+            raise HTTPException(status_code=502, detail="Storage error")
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(store.run(keyed_request("a"), "user1", "submit", {}, client_error))
+            assert error.value.status_code == 404
+        assert error.value.headers["Idempotent-Replayed"] == "true"
+
+        with pytest.raises(HTTPException):
+            asyncio.run(store.run(keyed_request("b"), "user1", "submit", {}, server_error))
+        assert asyncio.run(store.run(keyed_request("b"), "user1", "submit", {}, lambda: {"ok": True})) == {"ok": True}
+
+    def test_cancelled_request_releases_key(self):
+        """Test a request cancelled mid-run releases its key so that a retry runs again"""
+        store = make_store()
+
+        async def scenario():
+            blocked = asyncio.Event()
+            first = asyncio.ensure_future(store.run(keyed_request(), "user1", "submit", {}, blocked.wait))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await store.run(keyed_request(), "user1", "submit", {}, lambda: {"ok": True})
+
+        assert asyncio.run(scenario()) == {"ok": True}
+
+    def test_offloaded_store_calls_leave_the_event_loop(self):
+        """Test store calls run on an executor thread when offloaded"""
+        store = make_store(offload=True)
+        threads = set()
+        add = store.backend.add
+
+        def tracking_add(*args):
+            threads.add(threading.current_thread())
+            return add(*args)
+
+        store.backend.add = tracking_add
+        asyncio.run(store.run(keyed_request(), "user1", "submit", {}, lambda: {"ok": True}))
+
+        assert threads and threading.main_thread() not in threads
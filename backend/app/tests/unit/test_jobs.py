@@ -0,0 +1,170 @@
+"""
+Unit tests for the background job queue.
+
+Tests bounded worker concurrency, step and result reporting, failed jobs,
+refusing work when the queue is full, failing what is left on shutdown and
+recording the outcome of shielded work that outlives it, and keeping slow
+store writes off the event loop.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cache import InMemoryCacheBackend
+from app.core.jobs import JobQueue
+
+
+class SlowStore(InMemoryCacheBackend):
+    """Store whose writes block like a round trip to a remote Redis"""
+
+    def set(self, key, value, ttl):
+        time.sleep(0.05)
+        super().set(key, value, ttl)
+
+
+def make_queue(**kwargs):
+    return JobQueue("test", InMemoryCacheBackend(), **kwargs)
+
+
+class TestJobQueue:
+    """Test cases for JobQueue"""
+
+    def test_workers_bound_concurrency_and_report_steps(self):
+        """Test no more than the worker count run at once and steps and results are recorded"""
+        queue = make_queue(workers=2)
+        running, peak = 0, 0
+
+        async def handler(job):
+            nonlocal running, peak
+            async with job.step("work"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+            await job.update(done=True)
+
+        async def scenario():
+            jobs = [await queue.enqueue("user123", ["work"], handler) for _ in range(6)]
+            await queue.stop(timeout=5)
+            return jobs
+
+        jobs = asyncio.run(scenario())
+
+        assert peak == 2
+        assert jobs[0]["status"] == "queued"
+        record = queue.get(jobs[0]["job_id"], "user123")
+        assert record["status"] == "succeeded"
+        assert record["steps"] == {"work": "succeeded"}
+        assert record["result"] == {"done": True}
+        assert queue.get(jobs[0]["job_id"], "someone-else") is None
+
+    def test_failed_job_records_error(self):
+        """Test a handler error fails the job and its step"""
+        queue = make_queue()
+
+        async def handler(job):
+            async with job.step("apply"):
+                raise HTTPException(status_code=404, detail="Application not found")
+
+        async def scenario():
+            job = await queue.enqueue("user123", ["apply", "notify"], handler)
+            await queue.stop(timeout=5)
+            return job
+
+        record = queue.get(asyncio.run(scenario())["job_id"], "user123")
+
+        assert record["status"] == "failed"
+        assert record["steps"] == {"apply": "failed", "notify": "pending"}
+        assert record["error"] == {"status_code": 404, "detail": "Application not found"}
+
+    def test_full_queue_refuses_and_shutdown_fails_pending(self):
+        """Test jobs beyond max_pending get 503 and jobs left at shutdown are failed"""
+        queue = make_queue(workers=1, max_pending=1)
+
+        async def scenario():
+            blocked = asyncio.Event()
+
+            async def handler(job):
+                await blocked.wait()
+
+            first = await queue.enqueue("user123", [], handler)
+            await asyncio.sleep(0)  # the worker takes the first job
+            second = await queue.enqueue("user123", [], handler)
+            with pytest.raises(HTTPException) as exc_info:
+                await queue.enqueue("user123", [], handler)
+            await queue.stop(timeout=0.05)
+            return first, second, exc_info.value
+
+        first, second, error = asyncio.run(scenario())
+
+        assert error.status_code == 503
+        assert error.headers["Retry-After"]
+        for job in (first, second):
+            record = queue.get(job["job_id"], "user123")
+            assert record["status"] == "failed"
+            assert record["error"]["status_code"] == 503
+
+    def test_shutdown_records_outcome_of_shielded_work(self):
+        """Test a job cancelled during shielded work records its outcome instead of failing"""
+        queue = make_queue()
+
+        def submit():
+            time.sleep(0.2)
+            return "app123"
+
+        async def handler(job):
+            async with job.step("apply"):
+                await job.shield(
+                    asyncio.get_running_loop().run_in_executor(None, submit),
+                    on_result=lambda application_id: job.update(application_id=application_id),
+                )
+            async with job.step("notify"):
+                pass
+
+        async def scenario():
+            job = await queue.enqueue("user123", ["apply", "notify"], handler)
+            await asyncio.sleep(0.05)
+            await queue.stop(timeout=0.01)
+            return job
+
+        record = queue.get(asyncio.run(scenario())["job_id"], "user123")
+
+        assert record["status"] == "succeeded"
+        assert record["steps"] == {"apply": "succeeded", "notify": "skipped"}
+        assert record["result"] == {"application_id": "app123"}
+        assert record["error"] is None
+
+    def test_offloaded_store_writes_keep_loop_responsive(self):
+        """Test slow status writes run on an executor pool instead of stalling the loop"""
+        queue = JobQueue("test", SlowStore(), offload=True)
+
+        async def handler(job):
+            async with job.step("work"):
+                await job.update(done=True)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            gaps, last = [], loop.time()
+
+            async def tick():
+                nonlocal last
+                while True:
+                    await asyncio.sleep(0.005)
+                    gaps.append(loop.time() - last)
+                    last = loop.time()
+
+            ticker = asyncio.ensure_future(tick())
+            job = await queue.enqueue("user123", ["work"], handler)
+            await queue.stop(timeout=5)
+            ticker.cancel()
+            return job, max(gaps)
+
+        job, longest_gap = asyncio.run(scenario())
+
+        assert longest_gap < 0.04
+        record = queue.get(job["job_id"], "user123")
+        assert record["status"] == "succeeded"
+        assert record["result"] == {"done": True}
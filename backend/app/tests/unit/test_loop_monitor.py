@@ -0,0 +1,108 @@
+"""
+Unit tests for the event-loop lag monitor and metrics registry.
+
+Tests blocking-call detection, Prometheus text rendering and access to
+/metrics.
+"""
+
+import asyncio
+import logging
+import time
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.loop_monitor import EventLoopMonitor, loop_stalls_total
+from app.core.metrics import MetricsRegistry
+from app.core.security import require_metrics_token
+
+
+def block_event_loop(seconds):
+    """Synchronous call standing in for a blocking Supabase request"""
+    time.sleep(seconds)
+
+
+class TestEventLoopMonitor:
+    """Test cases for EventLoopMonitor"""
+
+    def test_logs_stack_of_blocking_call(self, caplog):
+        """Test a blocked loop is reported with the blocking frame"""
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+        stalls_before = loop_stalls_total.value()
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.03)
+            block_event_loop(0.3)
+            await asyncio.sleep(0.03)
+            await monitor.stop()
+
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            asyncio.run(scenario())
+
+        messages = [record.getMessage() for record in caplog.records]
+        blocked = [m for m in messages if m.startswith("Event loop blocked")]
+        assert len(blocked) == 1
+        assert "in block_event_loop" in blocked[0]
+        assert "time.sleep(seconds)" in blocked[0]
+        assert loop_stalls_total.value() == stalls_before + 1
+
+    def test_quiet_loop_is_not_reported(self, caplog):
+        """Test no warning is logged when the loop stays responsive"""
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.2)
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            asyncio.run(scenario())
+
+        assert caplog.records == []
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry"""
+
+    def test_renders_prometheus_text(self):
+        """Test counters, gauges and histograms render in the text format"""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests", ["route"]).inc(route="/health")
+        registry.gauge("queue_depth", "Depth").set_function(lambda: 3)
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        text = registry.render()
+
+        assert '# TYPE requests_total counter' in text
+        assert 'requests_total{route="/health"} 1' in text
+        assert 'queue_depth 3' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+        assert 'latency_seconds_count 2' in text
+
+    def test_same_name_returns_existing_metric(self):
+        """Test registering a metric twice returns the first one"""
+        registry = MetricsRegistry()
+        assert registry.counter("hits_total", "Hits") is registry.counter("hits_total", "Hits")
+
+    def test_metrics_access(self):
+        """Test /metrics is off by default and requires METRICS_TOKEN when set"""
+        def status_of(token):
+            credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) if token else None
+            try:
+                require_metrics_token(credentials)
+            except HTTPException as e:
+                return e.status_code
+            return 200
+
+        with patch("app.core.security.settings.metrics_enabled", False):
+            assert status_of("scrape-secret") == 404
+        with patch("app.core.security.settings.metrics_enabled", True), \
+                patch("app.core.security.settings.metrics_token", "scrape-secret"):
+            assert status_of(None) == 401
+            assert status_of("wrong") == 401
+            assert status_of("scrape-secret") == 200
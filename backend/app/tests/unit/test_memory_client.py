@@ -0,0 +1,131 @@
+"""
+Unit tests for the in-memory Supabase backend.
+
+Tests query semantics, upsert conflict handling, RPCs, storage and fault injection.
+"""
+
+import pytest
+from postgrest.exceptions import APIError
+from storage3.exceptions import StorageApiError
+
+from app.db.memory_client import MemorySupabaseClient, FaultInjector
+
+
+class TestMemorySupabaseClient:
+    """Test cases for MemorySupabaseClient"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+
+    def test_insert_fills_defaults_and_nullable_columns(self):
+        """Test inserted rows get an id, timestamps and NULL columns"""
+        result = self.client.table("financing_selections").insert(
+            {"application_id": "app123", "plan_type": "bnpl"}
+        ).execute()
+
+        row = result.data[0]
+        assert row["id"]
+        assert row["created_at"]
+        assert row["cost_of_credit"] is None
+
+    def test_upsert_merges_on_default_conflict_key(self):
+        """Test section upserts update the existing row for the application"""
+        students = self.client.table("students")
+        students.upsert({"application_id": "app123", "surname": "Doe"}).execute()
+        self.client.table("students").upsert({"application_id": "app123", "first_name": "John"}).execute()
+
+        rows = self.client.table("students").select("*").eq("application_id", "app123").execute().data
+        assert len(rows) == 1
+        assert rows[0]["surname"] == "Doe"
+        assert rows[0]["first_name"] == "John"
+
+    def test_upsert_with_explicit_on_conflict_list(self):
+        """Test upsert accepts on_conflict as a list of columns"""
+        table = "academic_history"
+        self.client.table(table).upsert({"application_id": "app1", "school_name": "A"},
+                                        on_conflict=["application_id"]).execute()
+        self.client.table(table).upsert({"application_id": "app1", "school_name": "B"},
+                                        on_conflict=["application_id"]).execute()
+
+        rows = self.client.table(table).select("school_name").execute().data
+        assert rows == [{"school_name": "B"}]
+
+    def test_insert_duplicate_unique_key_fails(self):
+        """Test inserting a second row for a unique application_id raises APIError"""
+        self.client.table("financing_selections").insert({"application_id": "app1", "plan_type": "bnpl"}).execute()
+
+        with pytest.raises(APIError):
+            self.client.table("financing_selections").insert({"application_id": "app1", "plan_type": "bnpl"}).execute()
+
+    def test_is_null_filter(self):
+        """Test is_ matches NULL columns only"""
+        self.client.table("applications").insert({"user_id": None, "status": "in_progress"}).execute()
+        self.client.table("applications").insert({"user_id": "user1", "status": "in_progress"}).execute()
+
+        rows = self.client.table("applications").select("*").is_("user_id", None).execute().data
+        assert len(rows) == 1
+        assert rows[0]["user_id"] is None
+
+    def test_mark_upload_complete_rpc_updates_summary_view(self):
+        """Test the RPC completes documents and the summary view reflects it"""
+        self.client.table("application_documents").insert({
+            "application_id": "app1", "document_type": "payslip", "upload_status": "pending"
+        }).execute()
+
+        self.client.rpc("mark_upload_complete", {"app_id": "app1", "doc_type": "payslip"}).execute()
+
+        summary = self.client.table("application_upload_summary").select("*").eq("application_id", "app1").execute()
+        assert summary.data[0]["completed_categories"] == 1
+        assert summary.data[0]["uploaded_types"] == ["payslip"]
+
+    def test_submit_application_rpc_is_all_or_nothing(self):
+        """Test a failing submission leaves no application or section behind"""
+        with pytest.raises(TypeError):
+            self.client.rpc("submit_application", {
+                "p_user_id": "user123",
+                "p_student": {"surname": "Doe"},
+                "p_unknown": {},
+            }).execute()
+
+        assert self.client.table("applications").select("*").execute().data == []
+        assert self.client.table("students").select("*").execute().data == []
+
+        result = self.client.rpc("submit_application", {"p_user_id": "user123", "p_student": {"surname": "Doe"}}).execute()
+        application_id = result.data[0]["application_id"]
+        student = self.client.table("students").select("*").eq("application_id", application_id).execute().data[0]
+        assert student["surname"] == "Doe"
+        assert result.data[0]["progress"]["student_completed"] is True
+
+    def test_unknown_rpc_fails(self):
+        """Test calling an undefined function raises APIError"""
+        with pytest.raises(APIError):
+            self.client.rpc("does_not_exist", {}).execute()
+
+    def test_storage_upload_and_remove(self):
+        """Test objects can be uploaded, fetched and removed from buckets"""
+        bucket = self.client.storage.from_("payslips")
+        bucket.upload("user/app/payslip.pdf", b"%PDF", file_options={"content-type": "application/pdf"})
+
+        assert bucket.download("user/app/payslip.pdf") == b"%PDF"
+        with pytest.raises(StorageApiError):
+            bucket.upload("user/app/payslip.pdf", b"%PDF")
+
+        assert bucket.remove(["user/app/payslip.pdf"]) == [{"name": "user/app/payslip.pdf", "bucket_id": "payslips"}]
+
+    def test_failure_injection(self):
+        """Test a failure rate of 1 fails every database call"""
+        client = MemorySupabaseClient(db_faults=FaultInjector(failure_rate=1.0))
+
+        with pytest.raises(APIError):
+            client.table("applications").select("*").execute()
+
+    def test_returned_rows_are_copies(self):
+        """Test mutating a result does not change stored data"""
+        self.client.table("medical_info").insert({"application_id": "app1", "conditions": ["asthma"]}).execute()
+
+        row = self.client.table("medical_info").select("*").execute().data[0]
+        row["conditions"].append("eczema")
+
+        stored = self.client.table("medical_info").select("*").execute().data[0]
+        assert stored["conditions"] == ["asthma"]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the login-time prefetch service.
+
+Tests that a warm-up fills the application cache for every first-screen read,
+that users are warmed once per interval on a single executor and that
+ownership checks are served from the cached application row.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from app.core.cache import ApplicationCache, InMemoryCacheBackend
+from app.db.memory_client import MemorySupabaseClient
+from app.repositories.academic_repository import academic_repository
+from app.repositories.document_repository import document_repository
+from app.repositories.enrollment_repository import enrollment_repository
+from app.repositories.financing_repository import financing_repository
+from app.repositories.progress_repository import progress_repository
+from app.services.prefetch_service import PrefetchService
+
+REPOSITORIES = [
+    academic_repository, document_repository, enrollment_repository,
+    financing_repository, progress_repository,
+]
+
+
+class TestPrefetchService:
+    """Test cases for PrefetchService"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+        self.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+        self.patches = []
+        for repository in REPOSITORIES:
+            self.patches.append(patch.object(repository, "_supabase", self.client))
+            self.patches.append(patch.object(repository, "cache", self.cache))
+        for p in self.patches:
+            p.start()
+
+        self.service = PrefetchService(workers=1, interval=60)
+        self.service.cache = self.cache
+        self.application_id = enrollment_repository.create_application("user123")
+        self.client.table("academic_history").insert({"application_id": self.application_id, "school_name": "S"}).execute()
+        financing_repository.save_financing_selection(self.application_id, "bnpl")
+
+    def teardown_method(self):
+        """Restore the shared repositories"""
+        self.service.shutdown()
+        for p in self.patches:
+            p.stop()
+
+    def test_warm_serves_first_screen_from_cache(self):
+        """Test every first-screen read is a cache hit after a warm-up"""
+        self.service.warm("user123")
+
+        database = Mock()
+        with patch.object(enrollment_repository, "_supabase", database), \
+                patch.object(document_repository, "_supabase", database), \
+                patch.object(academic_repository, "_supabase", database), \
+                patch.object(financing_repository, "_supabase", database), \
+                patch.object(progress_repository, "_supabase", database):
+            assert enrollment_repository.get_application_by_id_and_user(self.application_id, "user123")
+            assert enrollment_repository.get_full_application(self.application_id)["id"] == self.application_id
+            assert len(document_repository.get_document_status(self.application_id)) == 4
+            assert academic_repository.get_academic_history_by_application(self.application_id)["school_name"] == "S"
+            assert financing_repository.get_financing_selection(self.application_id)["plan_type"] == "bnpl"
+            assert progress_repository.get_progress(self.application_id)["financing_plan"] == "bnpl"
+
+        database.table.assert_not_called()
+
+    def test_cached_ownership_check(self):
+        """Test the cached row answers ownership for owners and other users"""
+        enrollment_repository.get_application_by_id(self.application_id)
+
+        with patch.object(enrollment_repository, "_supabase", Mock()) as database:
+            assert enrollment_repository.get_application_by_id_and_user(self.application_id, "user123")
+            assert enrollment_repository.get_application_by_id_and_user(self.application_id, "intruder") is None
+            database.table.assert_not_called()
+
+    def test_schedule_once_per_interval(self):
+        """Test a user is only warmed once per interval"""
+        with patch.object(self.service, "warm") as warm:
+            assert self.service.schedule("user123") is True
+            assert self.service.schedule("user123") is False
+            self.service._executor.shutdown(wait=True)
+
+        warm.assert_called_once_with("user123")
+
+    def test_concurrent_first_schedules_share_one_executor(self):
+        """Test concurrent first calls create a single executor"""
+        def slow_executor(**kwargs):
+            time.sleep(0.01)
+            return Mock()
+
+        barrier = threading.Barrier(8)
+
+        def schedule(n):
+            barrier.wait()
+            self.service.schedule(f"user{n}")
+
+        with patch("app.services.prefetch_service.ThreadPoolExecutor", side_effect=slow_executor) as executor:
+            threads = [threading.Thread(target=schedule, args=(n,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert executor.call_count == 1
+        assert self.service._executor.submit.call_count == 8
+
+    def test_user_without_application(self):
+        """Test warming a user without an application does nothing"""
+        self.service.warm("nobody")
+        assert self.cache.backend.get("user:nobody:application_id") is None
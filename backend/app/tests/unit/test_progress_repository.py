@@ -0,0 +1,133 @@
+"""
+Unit tests for the application progress snapshot.
+
+Tests initialization on creation, incremental section and document updates,
+section flags from partial saves and rebuilding a missing snapshot.
+"""
+
+from unittest.mock import patch
+
+from app.api.v1.schemas.enrollment import MedicalInfo, StudentInfoPartial
+from app.core.cache import ApplicationCache, InMemoryCacheBackend
+from app.db.memory_client import MemorySupabaseClient
+from app.repositories.document_repository import DocumentRepository
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.progress_repository import progress_repository
+
+STUDENT = {
+    "surname": "Doe", "first_name": "John", "date_of_birth": "2015-01-01", "gender": "male",
+    "home_language": "English", "id_number": "1501015800087", "previous_grade": "Grade 3",
+    "grade_applied_for": "Grade 4", "previous_school": "Central Primary",
+}
+
+
+class TestProgressRepository:
+    """Test cases for ProgressRepository"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.client = MemorySupabaseClient()
+        self.cache = ApplicationCache(InMemoryCacheBackend(), ttl=60)
+        self.patches = [
+            patch.object(progress_repository, "_supabase", self.client),
+            patch.object(progress_repository, "cache", self.cache),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.enrollment = EnrollmentRepository()
+        self.enrollment.supabase = self.client
+        self.enrollment.cache = self.cache
+        self.documents = DocumentRepository()
+        self.documents.supabase = self.client
+        self.documents.cache = self.cache
+
+    def teardown_method(self):
+        """Restore the shared progress repository"""
+        for p in self.patches:
+            p.stop()
+
+    def stored_row(self, application_id):
+        return self.client.table("application_progress").select("*").eq("application_id", application_id).execute().data[0]
+
+    def test_created_application_has_empty_snapshot(self):
+        """Test creating an application stores an empty snapshot"""
+        application_id = self.enrollment.create_application("user123")
+
+        row = self.stored_row(application_id)
+        assert row["user_id"] == "user123"
+        assert row["status"] == "in_progress"
+        assert row["student_completed"] is False
+        assert row["document_types_completed"] == []
+
+    def test_partial_saves_complete_section_with_required_fields(self):
+        """Test auto-saves set the section flag only once every required field is saved"""
+        application_id = self.enrollment.create_application("user123")
+
+        self.enrollment.save_student_data_partial(application_id, StudentInfoPartial(surname="Doe"))
+        assert progress_repository.get_progress(application_id)["student_completed"] is False
+
+        self.enrollment.save_student_data_partial(application_id, StudentInfoPartial(**STUDENT))
+        assert progress_repository.get_progress(application_id)["student_completed"] is True
+        assert self.stored_row(application_id)["student_completed"] is True
+
+    def test_update_writes_over_stale_snapshot(self):
+        """Test a flag is written even when the cached snapshot already shows it"""
+        application_id = self.enrollment.create_application("user123")
+        self.enrollment.save_student_data_partial(application_id, StudentInfoPartial(**STUDENT))
+        # Another worker reset the row; this worker's cached snapshot is stale
+        self.client.table("application_progress").update({"student_completed": False}).eq("application_id", application_id).execute()
+
+        self.enrollment.save_student_data_partial(application_id, StudentInfoPartial(surname="Doe"))
+
+        assert self.stored_row(application_id)["student_completed"] is True
+
+    def test_document_uploads_complete_types(self):
+        """Test a document type completes once enough files are uploaded"""
+        application_id = self.enrollment.create_application("user123")
+
+        self.documents.save_document_metadata("user123", application_id, "proof_of_address", "url1")
+        self.documents.save_document_metadata("user123", application_id, "id_document", "url2")
+
+        assert self.stored_row(application_id)["document_types_completed"] == ["proof_of_address"]
+
+    def test_missing_snapshot_is_rebuilt(self):
+        """Test a snapshot is rebuilt from the source tables when absent"""
+        row = self.client.table("applications").insert({"user_id": "user123", "status": "in_progress"}).execute().data[0]
+        self.client.table("students").insert({"application_id": row["id"], **STUDENT}).execute()
+        self.client.table("fee_responsibility").insert({"application_id": row["id"], "fee_person": "Jane Doe"}).execute()
+        self.client.table("financing_selections").insert({"application_id": row["id"], "plan_type": "bnpl"}).execute()
+
+        progress = progress_repository.get_progress(row["id"])
+
+        assert progress["student_completed"] is True
+        assert progress["medical_completed"] is False
+        assert progress["fee_completed"] is False
+        assert progress["financing_plan"] == "bnpl"
+        assert self.stored_row(row["id"])["financing_plan"] == "bnpl"
+
+    def test_submit_is_one_round_trip(self):
+        """Test a submission writes sections, status and snapshot with a single database call"""
+        application_id = self.enrollment.create_application("user123")
+        progress_repository.get_progress(application_id)
+        medical = MedicalInfo(medical_aid_name="Aid", member_number="123")
+
+        with patch.object(self.client.db_faults, "apply", wraps=self.client.db_faults.apply) as calls:
+            submitted_id = self.enrollment.submit_application(
+                "user123", medical=medical, declaration={"agree_audit_storage": True}
+            )
+        assert calls.call_count == 1
+
+        assert submitted_id == application_id
+        application = self.client.table("applications").select("*").eq("id", application_id).execute().data[0]
+        assert application["status"] == "submitted"
+        assert application["submitted_at"]
+        assert application["agree_audit_storage"] is True
+        progress = progress_repository.get_progress(application_id)
+        assert progress["status"] == "submitted"
+        assert progress["medical_completed"] is True
+        assert progress["student_completed"] is False
+
+    def test_unknown_application(self):
+        """Test an unknown application has no snapshot"""
+        assert progress_repository.get_progress("missing") is None
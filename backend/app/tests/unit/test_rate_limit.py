@@ -0,0 +1,76 @@
+"""
+Unit tests for per-user rate limits.
+
+Tests the token bucket's burst and refill, per-user isolation, the bound on
+remembered users and the 429 raised over the limit.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import InMemoryRateLimiter, Limit, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestInMemoryRateLimiter:
+    """Test cases for InMemoryRateLimiter"""
+
+    def test_burst_then_refill(self):
+        """Test a full bucket admits the burst, then one request per interval"""
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        limit = Limit(rate=2, burst=3)
+
+        assert [limiter.acquire("user1", limit) for _ in range(3)] == [0, 0, 0]
+        assert limiter.acquire("user1", limit) == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert limiter.acquire("user1", limit) == 0
+        assert limiter.acquire("user1", limit) == pytest.approx(0.5)
+
+        clock.now += 10
+        assert [limiter.acquire("user1", limit) for _ in range(3)] == [0, 0, 0]
+
+    def test_users_are_isolated_and_bounded(self):
+        """Test one user's bucket does not affect another and old users are evicted"""
+        limiter = InMemoryRateLimiter(max_keys=2, clock=FakeClock())
+        limit = Limit(rate=1, burst=1)
+
+        assert limiter.acquire("user1", limit) == 0
+        assert limiter.acquire("user1", limit) > 0
+        assert limiter.acquire("user2", limit) == 0
+        assert limiter.acquire("user3", limit) == 0
+        assert len(limiter) == 2
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter"""
+
+    def test_over_limit_raises_429(self):
+        """Test requests over the limit get 429 with a whole-second Retry-After"""
+        limiter = RateLimiter(InMemoryRateLimiter(clock=FakeClock()), {"auto_save": Limit(rate=0.4, burst=1)})
+
+        limiter.check("auto_save", "user1")
+        with pytest.raises(HTTPException) as error:
+            limiter.check("auto_save", "user1")
+
+        assert error.value.status_code == 429
+        assert error.value.headers["Retry-After"] == "3"
+
+    def test_store_failure_admits(self):
+        """Test a failing bucket store lets requests through"""
+        store = Mock()
+        store.acquire.side_effect = ConnectionError("redis unavailable")
+        limiter = RateLimiter(store, {"writes": Limit(rate=1, burst=1)})
+
+        limiter.check("writes", "user1")
+        limiter.check("writes", "user1")
@@ -0,0 +1,79 @@
+"""
+Unit tests for the readiness probes.
+
+Tests that /ready reports cached probe results, and that failing, slow,
+stuck and stale probes make the instance not ready.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+from app.core.readiness import ReadinessMonitor
+
+
+def up():
+    return None
+
+
+def down():
+    raise ConnectionError("connection refused")
+
+
+class TestReadinessMonitor:
+    """Test cases for ReadinessMonitor"""
+
+    def test_starting_until_first_check(self):
+        """Test the instance is not ready before any probe has run"""
+        monitor = ReadinessMonitor({"database": up})
+        assert monitor.report() == (False, {"status": "starting", "checks": {}})
+
+        asyncio.run(monitor.check())
+        ready, report = monitor.report()
+        assert ready
+        assert report["checks"]["database"]["status"] == "up"
+
+    def test_failing_probe(self):
+        """Test one failing dependency makes the instance not ready and reports the error"""
+        monitor = ReadinessMonitor({"database": up, "storage": down})
+        asyncio.run(monitor.check())
+
+        ready, report = monitor.report()
+        assert not ready
+        assert report["status"] == "not_ready"
+        assert report["checks"]["storage"]["status"] == "down"
+        assert report["checks"]["storage"]["error"] == "connection refused"
+        assert report["checks"]["database"]["status"] == "up"
+
+    def test_slow_probe_times_out_without_piling_up(self):
+        """Test a hung probe counts as down and is not started again while it hangs"""
+        release, calls = threading.Event(), []
+
+        def hang():
+            calls.append(1)
+            release.wait(5)
+
+        monitor = ReadinessMonitor({"auth": hang}, timeout=0.05)
+
+        async def scenario():
+            try:
+                await monitor.check()
+                await monitor.check()
+                return monitor.report()
+            finally:
+                release.set()
+
+        ready, report = asyncio.run(scenario())
+        assert not ready
+        assert report["checks"]["auth"]["error"] == "previous probe has not returned"
+        assert len(calls) == 1
+
+    def test_stale_results(self):
+        """Test results older than a few intervals no longer count as up"""
+        monitor = ReadinessMonitor({"database": up}, interval=1)
+        asyncio.run(monitor.check())
+
+        with patch("app.core.readiness.time.monotonic", return_value=monitor._checked_at["database"] + 10):
+            ready, report = monitor.report()
+        assert not ready
+        assert report["checks"]["database"]["error"] == "probe results are stale"
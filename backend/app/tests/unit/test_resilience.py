@@ -0,0 +1,144 @@
+"""
+Unit tests for circuit breakers and bulkheads.
+
+Tests breaker transitions, bulkhead limits, fast failure with
+ExternalServiceError and that a failing Supabase API does not trip the
+breakers of the others.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core.exceptions import ExternalServiceError
+from app.core.resilience import (
+    CLOSED, HALF_OPEN, OPEN, Bulkhead, CircuitBreaker, Dependency, dependency_rejections_total,
+)
+from app.db.http_client import InstrumentedTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_dependency(name, threshold=2, limit=2, clock=None):
+    breaker = CircuitBreaker(name, failure_threshold=threshold, reset_timeout=10, clock=clock or FakeClock())
+    return Dependency(name, name.title(), breaker, Bulkhead(limit))
+
+
+def fail():
+    raise TimeoutError("read timeout")
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker and Dependency"""
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        """Test consecutive failures open the breaker and later calls are rejected without running"""
+        dependency = make_dependency("database")
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                dependency.call(fail)
+        assert dependency.breaker.state == OPEN
+
+        before = dependency_rejections_total.value(dependency="database", reason="circuit_open")
+        calls = []
+        with pytest.raises(ExternalServiceError) as error:
+            dependency.call(lambda: calls.append(1))
+        assert calls == []
+        assert error.value.message.startswith("Database error")
+        assert dependency_rejections_total.value(dependency="database", reason="circuit_open") == before + 1
+
+    def test_half_open_trial(self):
+        """Test one trial call after the reset timeout decides the next state"""
+        clock = FakeClock()
+        dependency = make_dependency("storage", threshold=1, clock=clock)
+        with pytest.raises(TimeoutError):
+            dependency.call(fail)
+
+        clock.now = 10
+        assert dependency.breaker.state == HALF_OPEN
+        with pytest.raises(TimeoutError):
+            dependency.call(fail)
+        assert dependency.breaker.state == OPEN
+
+        clock.now = 20
+        assert dependency.call(lambda: "ok") == "ok"
+        assert dependency.breaker.state == CLOSED
+
+    def test_failing_results_count(self):
+        """Test results flagged by is_failure trip the breaker like exceptions"""
+        dependency = make_dependency("auth", threshold=1)
+        assert dependency.call(lambda: 503, is_failure=lambda status: status >= 500) == 503
+        assert dependency.breaker.state == OPEN
+
+    def test_full_bulkhead_fails_fast(self):
+        """Test calls beyond the bulkhead limit are rejected while others are in flight"""
+        dependency = make_dependency("storage", limit=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=dependency.call, args=(slow,))
+        thread.start()
+        started.wait(5)
+        try:
+            with pytest.raises(ExternalServiceError):
+                dependency.call(lambda: None)
+            assert dependency.bulkhead.in_flight == 1
+        finally:
+            release.set()
+            thread.join()
+        assert dependency.breaker.state == CLOSED
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Answers 503 for database calls and 200 for everything else"""
+
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        status = 503 if self.path.startswith("/rest/v1/") else 200
+        self.send_response(status)
+        self.send_header("content-length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransportIsolation:
+    """Test cases for breakers in the shared Supabase transport"""
+
+    def test_degraded_database_does_not_block_storage(self):
+        """Test 5xx responses open only the database breaker"""
+        StatusHandler.paths = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        dependencies = {name: make_dependency(name) for name in ("database", "storage", "auth")}
+        client = httpx.Client(transport=InstrumentedTransport(dependencies=dependencies))
+        try:
+            for _ in range(2):
+                assert client.get(f"{url}/rest/v1/applications").status_code == 503
+            with pytest.raises(ExternalServiceError):
+                client.get(f"{url}/rest/v1/applications")
+
+            assert client.get(f"{url}/storage/v1/object/documents/file.pdf").status_code == 200
+            assert client.get(f"{url}/auth/v1/user").status_code == 200
+            assert len(StatusHandler.paths) == 4
+            assert dependencies["storage"].breaker.state == CLOSED
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
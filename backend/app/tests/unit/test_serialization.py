@@ -0,0 +1,69 @@
+"""
+Unit tests for fast response serialization.
+
+Tests that projected trusted rows match the validated response models and
+that the fast path can be switched off.
+"""
+
+import json
+from unittest.mock import patch
+
+from app.api.v1.schemas.academic import AcademicHistoryResponse
+from app.api.v1.schemas.documents import DocumentStatusResponse
+from app.api.v1.schemas.enrollment import ApplicationResponse
+from app.core.serialization import FastJSONResponse, project, trusted_response
+
+
+APPLICATION_ROW = {
+    "id": "app123",
+    "user_id": "user123",
+    "status": "in_progress",
+    "created_at": "2024-01-01T00:00:00",
+    "student": {"surname": "Doe", "first_name": "John"},
+    "medical": {},
+    "family": {"father_surname": "Doe"},
+    "fee": {},
+}
+
+DOCUMENT_STATUS_ROW = {
+    "application_id": "app123",
+    "summary": [
+        {"document_type": "payslip", "uploaded_count": 1, "required_count": 3, "completed": False,
+         "files": [{"id": "f1"}], "internal": "dropped"},
+    ],
+}
+
+
+class TestSerialization:
+    """Test cases for the trusted-row fast path"""
+
+    def test_projection_matches_validated_model(self):
+        """Test projected rows equal the validated model dump"""
+        for model, row in ((ApplicationResponse, APPLICATION_ROW), (DocumentStatusResponse, DOCUMENT_STATUS_ROW)):
+            assert project(model, row) == model(**row).model_dump(mode="json")
+
+    def test_missing_optional_fields_become_null(self):
+        """Test columns absent from the row are filled like the model would"""
+        row = {"application_id": "app123", "school_name": "S", "school_type": "public",
+               "last_grade_completed": "7", "academic_year_completed": "2023"}
+
+        projected = project(AcademicHistoryResponse, row)
+
+        assert projected["id"] is None
+        assert projected["principal_name"] is None
+        assert set(projected) == set(AcademicHistoryResponse.model_fields)
+
+    def test_trusted_response_renders_with_headers(self):
+        """Test the response body and passed headers"""
+        response = trusted_response(ApplicationResponse, APPLICATION_ROW, {"ETag": '"abc"'})
+
+        assert isinstance(response, FastJSONResponse)
+        assert response.headers["etag"] == '"abc"'
+        assert json.loads(response.body) == ApplicationResponse(**APPLICATION_ROW).model_dump(mode="json")
+        assert trusted_response(AcademicHistoryResponse, None).body == b"null"
+
+    def test_disabled_returns_model(self):
+        """Test the validating path when fast responses are disabled"""
+        with patch("app.core.serialization.settings.fast_responses_enabled", False):
+            result = trusted_response(ApplicationResponse, APPLICATION_ROW)
+        assert isinstance(result, ApplicationResponse)
@@ -0,0 +1,47 @@
+"""
+Unit tests for the production server entry point.
+
+Tests the per-worker uvicorn configuration, max-requests jitter and the
+refusal to fork workers that would not share state.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.serve import check_worker_count, default_workers, parse_args, worker_config
+
+
+class TestServe:
+    """Test cases for app.serve"""
+
+    def test_worker_config(self):
+        """Test workers use uvloop, httptools and the tuned socket options"""
+        args = parse_args(["--backlog", "4096", "--keepalive", "90", "--max-requests", "0"])
+        config = worker_config(object(), args)
+
+        assert (config.loop, config.http, config.lifespan) == ("uvloop", "httptools", "on")
+        assert (config.backlog, config.timeout_keep_alive) == (4096, 90)
+        assert config.limit_max_requests is None
+
+    def test_max_requests_jitter(self):
+        """Test every worker gets a request limit within the jitter range"""
+        args = parse_args(["--max-requests", "100", "--max-requests-jitter", "10"])
+        limits = {worker_config(object(), args).limit_max_requests for _ in range(50)}
+
+        assert limits <= set(range(100, 111))
+        assert len(limits) > 1
+
+    def test_several_workers_need_redis(self):
+        """Test several workers are refused, and not the default, without a shared cache"""
+        with patch("app.serve.settings.cache_backend", "memory"), patch("app.serve.settings.serve_workers", 0):
+            check_worker_count(1)
+            with pytest.raises(SystemExit) as exc_info:
+                check_worker_count(4)
+            assert default_workers() == 1
+
+        assert "CACHE_BACKEND=memory" in str(exc_info.value)
+        with patch("app.serve.settings.cache_backend", "redis"), patch("app.serve.settings.serve_workers", 0):
+            check_worker_count(4)
+            assert default_workers() == (os.cpu_count() or 1)
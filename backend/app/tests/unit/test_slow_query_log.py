@@ -0,0 +1,107 @@
+"""
+Unit tests for the slow database call recorder.
+
+Tests threshold filtering, captured fields, the bounded ring buffer and
+access to the /debug endpoints serving it.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.routers.debug import router as debug_router
+from app.db.instrumentation import InstrumentedClient, SlowQueryLog
+from app.db.memory_client import MemorySupabaseClient, FaultInjector
+
+
+class TestSlowQueryLog:
+    """Test cases for InstrumentedClient and SlowQueryLog"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.log = SlowQueryLog(threshold_ms=0, capacity=3)
+        self.client = InstrumentedClient(MemorySupabaseClient(), self.log)
+
+    def test_records_columns_and_filters_without_values(self):
+        """Test entries capture filter columns but never filter values"""
+        self.client.table("students").upsert({"application_id": "app123", "surname": "Doe"}).execute()
+        self.client.table("students").select("*").eq("application_id", "app123").execute()
+
+        entry = self.log.entries()[0]
+        assert entry["table"] == "students"
+        assert entry["operation"] == "select"
+        assert entry["columns"] == "*"
+        assert entry["filter_columns"] == ["application_id"]
+        assert entry["row_count"] == 1
+        assert "app123" not in str(entry)
+
+    def test_records_write_payload_size(self):
+        """Test writes record the size of the payload"""
+        self.client.table("students").upsert({"application_id": "app1", "surname": "Doe"}).execute()
+
+        entry = self.log.entries()[0]
+        assert entry["operation"] == "upsert"
+        assert entry["payload_bytes"] > 0
+
+    def test_fast_calls_are_not_recorded(self):
+        """Test calls under the threshold are skipped"""
+        self.log.threshold_ms = 10_000
+        self.client.table("students").select("*").execute()
+
+        assert self.log.entries() == []
+
+    def test_ring_buffer_is_bounded(self):
+        """Test only the most recent entries are kept"""
+        for _ in range(5):
+            self.client.table("students").select("*").execute()
+
+        assert len(self.log.entries()) == 3
+        assert self.log.total_recorded == 5
+
+    def test_failed_slow_calls_are_recorded(self):
+        """Test slow failures are recorded with the error type"""
+        client = InstrumentedClient(MemorySupabaseClient(db_faults=FaultInjector(failure_rate=1.0)), self.log)
+
+        try:
+            client.table("students").select("*").execute()
+        except Exception:
+            pass
+
+        assert self.log.entries()[0]["error"] == "APIError"
+
+
+class TestSlowQueryRoutes:
+    """Test cases for the /debug/slow-queries endpoints"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.app = FastAPI()
+        self.app.include_router(debug_router, prefix="/debug")
+
+    def request(self, method, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        async def send():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, "/debug/slow-queries", headers=headers)
+        return asyncio.run(send())
+
+    def test_disabled_without_token(self):
+        """Test the endpoints do not exist while no DEBUG_API_TOKEN is set"""
+        with patch("app.core.security.settings.debug_api_token", None):
+            assert self.request("GET", "anything").status_code == 404
+            assert self.request("DELETE", "anything").status_code == 404
+
+    def test_require_debug_token(self):
+        """Test only the configured token is admitted, and the endpoints stay out of the schema"""
+        with patch("app.core.security.settings.debug_api_token", "ops-secret"):
+            assert self.request("GET").status_code == 401
+            assert self.request("DELETE", "parent-session-jwt").status_code == 401
+            response = self.request("GET", "ops-secret")
+
+        assert response.status_code == 200
+        assert "entries" in response.json()
+        assert "/debug/slow-queries" not in self.app.openapi()["paths"]
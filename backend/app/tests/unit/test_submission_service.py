@@ -0,0 +1,88 @@
+"""
+Unit tests for SubmissionService.
+
+Tests the asynchronous submission pipeline: applying the submission, listing
+missing documents, post-submit failures that do not fail the job and
+submissions still running at shutdown.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+from app.api.v1.schemas.enrollment import SubmitApplicationRequest, SubmitApplicationResponse
+from app.core.cache import InMemoryCacheBackend
+from app.core.jobs import JobQueue
+from app.services.submission_service import SubmissionService
+
+
+class TestSubmissionService:
+    """Test cases for SubmissionService"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.queue = JobQueue("test_submission", InMemoryCacheBackend())
+        self.enrollment = Mock()
+        self.enrollment.submit_application.return_value = SubmitApplicationResponse(
+            message="Application submitted successfully", application_id="app123"
+        )
+        self.progress = Mock()
+        self.progress.get_progress.return_value = {"document_types_completed": ["proof_of_address", "payslip"]}
+        self.patches = [
+            patch("app.services.submission_service.enrollment_service", self.enrollment),
+            patch("app.services.submission_service.progress_repository", self.progress),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        """Restore the shared services"""
+        for p in self.patches:
+            p.stop()
+
+    def run_job(self, service):
+        async def scenario():
+            job = await service.enqueue(SubmitApplicationRequest(application_id="app123"), "user123")
+            await self.queue.stop(timeout=5)
+            return job
+        return service.get_status(asyncio.run(scenario())["job_id"], "user123")
+
+    def test_pipeline_reports_missing_documents(self):
+        """Test a job applies the submission and lists incomplete document types"""
+        record = self.run_job(SubmissionService(self.queue))
+
+        assert record["status"] == "succeeded"
+        assert record["steps"] == {"apply": "succeeded", "check_documents": "succeeded", "notify": "skipped"}
+        assert record["result"] == {"application_id": "app123", "missing_documents": ["id_document", "bank_statement"]}
+        self.enrollment.prepare_submission.assert_called_once()
+        self.enrollment.submit_application.assert_called_once()
+
+    def test_submission_caught_by_shutdown_is_recorded(self):
+        """Test an apply still running at shutdown is waited for and recorded as submitted"""
+        def slow_submit(data, user_id):
+            time.sleep(0.2)
+            return SubmitApplicationResponse(message="Application submitted successfully", application_id="app123")
+
+        self.enrollment.submit_application.side_effect = slow_submit
+
+        async def scenario():
+            job = await SubmissionService(self.queue).enqueue(SubmitApplicationRequest(application_id="app123"), "user123")
+            await asyncio.sleep(0.05)
+            await self.queue.stop(timeout=0.01)
+            return job
+
+        record = self.queue.get(asyncio.run(scenario())["job_id"], "user123")
+
+        assert record["status"] == "succeeded"
+        assert record["steps"] == {"apply": "succeeded", "check_documents": "skipped", "notify": "skipped"}
+        assert record["result"] == {"application_id": "app123"}
+
+    def test_failed_notification_keeps_job_succeeded(self):
+        """Test a webhook failure is shown on its step without failing the submitted job"""
+        service = SubmissionService(self.queue, webhook_url="http://hooks.invalid/submitted")
+
+        with patch.object(service, "notify", side_effect=ConnectionError("unreachable")):
+            record = self.run_job(service)
+
+        assert record["status"] == "succeeded"
+        assert record["steps"]["notify"] == "failed"
@@ -0,0 +1,90 @@
+"""
+Unit tests for lazily built Supabase clients.
+
+Tests that importing the app builds no client and imports no Supabase
+package, that missing variables surface when the clients are built rather
+than at import, that a failed background build is logged and awaited, and
+that repositories fall back to the shared client.
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import PropertyMock, patch
+
+from app.db.memory_client import MemorySupabaseClient
+from app.db.supabase_client import SupabaseClients
+from app.repositories.enrollment_repository import EnrollmentRepository
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def run_child(code, **env):
+    child_env = {key: value for key, value in os.environ.items() if not key.startswith("SUPABASE_")}
+    child_env.update(env, PYTHONPATH=BACKEND_DIR)
+    # Run outside the backend directory so a local .env is not picked up
+    with tempfile.TemporaryDirectory() as cwd:
+        return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=child_env,
+                              capture_output=True, text=True)
+
+
+class TestLazySupabaseClients:
+    """Test cases for SupabaseClients"""
+
+    def test_import_builds_nothing(self):
+        """Test importing the app neither builds clients nor imports supabase"""
+        result = run_child(
+            "import sys, app.main\n"
+            "from app.db.supabase_client import supabase_clients\n"
+            "assert not supabase_clients.built\n"
+            "assert 'supabase' not in sys.modules and 'postgrest' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_missing_variables_raise_on_build(self):
+        """Test a misconfigured deployment fails when the clients are built, not at import"""
+        result = run_child(
+            "import app.main\n"
+            "from app.db.supabase_client import supabase_clients\n"
+            "supabase_clients.build()\n",
+            DATABASE_BACKEND="supabase",
+        )
+        assert result.returncode != 0
+        assert "Missing required environment variables: SUPABASE_URL" in result.stderr
+
+    def test_background_build_failure_is_logged(self, caplog):
+        """Test a failing background build is logged and waited for before close"""
+        clients = SupabaseClients()
+
+        def fail():
+            time.sleep(0.05)
+            raise RuntimeError("Missing required environment variables: SUPABASE_URL")
+
+        async def run():
+            with patch.object(clients, "build", side_effect=fail):
+                future = clients.build_in_background()
+                await clients.wait_for_build()
+                assert future.done()
+                await asyncio.sleep(0)
+
+        with caplog.at_level(logging.ERROR, logger="app.db.supabase_client"):
+            asyncio.run(run())
+        assert "Building the Supabase clients failed" in caplog.text
+        assert "SUPABASE_URL" in caplog.text
+
+    def test_repository_client_override(self):
+        """Test an assigned client replaces the shared one until it is deleted"""
+        repository = EnrollmentRepository()
+        client = MemorySupabaseClient()
+
+        repository.supabase = client
+        assert repository.supabase is client
+
+        del repository.supabase
+        shared = MemorySupabaseClient()
+        with patch.object(SupabaseClients, "service", new_callable=PropertyMock, return_value=shared):
+            assert repository.supabase is shared
@@ -0,0 +1,84 @@
+"""
+Unit tests for precompiled request body decoding.
+
+Tests that compiled routes accept the same bodies, return the same 422
+errors and publish the same OpenAPI schema as stock FastAPI routes.
+"""
+
+import asyncio
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from app.api.v1.schemas.enrollment import AutoSaveRequest, StudentInfoPartial
+from app.core.validation import CompiledBodyRoute, dump_set_fields, request_body_decodes_total
+
+
+def make_app(route_class=None):
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+
+    @router.post("/auto-save")
+    async def auto_save(data: AutoSaveRequest):
+        return {"sections": dump_set_fields(data.student) if data.student else None,
+                "fields_set": sorted(data.model_fields_set)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def post(app, content, content_type="application/json"):
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/auto-save", content=content, headers={"content-type": content_type})
+    return asyncio.run(call())
+
+
+class TestCompiledBodyRoute:
+    """Test cases for CompiledBodyRoute"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.stock = make_app()
+        self.compiled = make_app(CompiledBodyRoute)
+
+    def test_valid_body_uses_compiled_path(self):
+        """Test a valid body is decoded once and keeps its set fields"""
+        before = request_body_decodes_total.value(schema="AutoSaveRequest", path="compiled")
+        body = b'{"application_id": "app123", "student": {"surname": "Doe", "middle_name": null}}'
+
+        response = post(self.compiled, body)
+
+        assert response.status_code == 200
+        assert response.json() == post(self.stock, body).json()
+        assert response.json()["sections"] == {"surname": "Doe", "middle_name": None}
+        assert request_body_decodes_total.value(schema="AutoSaveRequest", path="compiled") == before + 1
+
+    def test_errors_match_stock_route(self):
+        """Test invalid bodies get the same 422 responses as FastAPI's own decoding"""
+        bodies = [
+            b'{"student": {"id_number": "123", "gender": "unknown"}}',
+            b'{"student": "not an object"}',
+            b'{"student": {"surname": "Doe",}',
+            b'',
+        ]
+        for body in bodies:
+            stock, compiled = post(self.stock, body), post(self.compiled, body)
+            assert (compiled.status_code, compiled.json()) == (stock.status_code, stock.json()), body
+
+    def test_non_json_content_type_is_left_to_fastapi(self):
+        """Test bodies FastAPI would not decode as JSON are not decoded either"""
+        body = b'{"application_id": "app123"}'
+        stock, compiled = post(self.stock, body, "text/plain"), post(self.compiled, body, "text/plain")
+        assert (compiled.status_code, compiled.json()) == (stock.status_code, stock.json())
+
+    def test_openapi_unchanged(self):
+        """Test the request body schema is still documented"""
+        assert self.compiled.openapi()["paths"] == self.stock.openapi()["paths"]
+        assert "StudentInfoPartial" in self.compiled.openapi()["components"]["schemas"]
+
+    def test_dump_set_fields(self):
+        """Test the compiled dump matches model_dump(exclude_unset=True)"""
+        student = StudentInfoPartial(surname="Doe", preferred_name=None)
+        assert dump_set_fields(student) == student.model_dump(exclude_unset=True)
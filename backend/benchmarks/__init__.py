@@ -0,0 +1 @@
+# Benchmark and load-generation tools for the backend
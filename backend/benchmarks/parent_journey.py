@@ -0,0 +1,432 @@
+"""
+Parent-journey load generator.
+
+Replays the enrollment-season journey of a parent against a running API:
+login, a burst of auto-saves, several document uploads, academic history,
+financing selection, declaration and final submission. Each simulated parent
+runs the journey once; many parents run concurrently.
+
+Usage:
+    python -m benchmarks.parent_journey --base-url http://localhost:8000 \\
+        --parents 2000 --concurrency 200 --ramp-up 30
+
+Per-step latency percentiles and error rates are printed at the end and can
+also be written as JSON with ``--json-output``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+
+# Journey steps in the order they are executed (and reported)
+JOURNEY_STEPS: List[str] = [
+    "login",
+    "auto_save",
+    "upload",
+    "academic_history",
+    "financing",
+    "declaration",
+    "submit",
+]
+
+UPLOAD_DOCUMENT_TYPES: List[str] = ["proof_of_address", "id_document", "payslip", "bank_statement"]
+
+FINANCING_PLANS: List[str] = [
+    "monthly_flat", "termly_discount", "annual_discount", "sibling_discount", "bnpl"
+]
+
+AUTO_SAVE_SUCCESS_MESSAGE = "Progress saved successfully"
+
+
+@dataclass
+class StepStats:
+    """Latency samples and error counts for a single journey step."""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, latency: float, status: str, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.latencies)
+        if not count:
+            return {"count": 0, "errors": 0, "error_rate": 0.0}
+        ordered = sorted(self.latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count,
+            "mean_ms": statistics.fmean(ordered) * 1000,
+            "p50_ms": _percentile(ordered, 50) * 1000,
+            "p90_ms": _percentile(ordered, 90) * 1000,
+            "p99_ms": _percentile(ordered, 99) * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "statuses": dict(sorted(self.status_counts.items())),
+        }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class JourneyConfig:
+    """Options controlling the shape of the simulated journey."""
+    base_url: str
+    parents: int = 100
+    concurrency: int = 50
+    ramp_up: float = 0.0
+    auto_saves: int = 12
+    uploads: int = 4
+    upload_size_kb: int = 256
+    think_time: float = 0.0
+    timeout: float = 30.0
+    auth_mode: str = "local"
+    jwt_secret: str = "load-test-secret"
+    supabase_url: Optional[str] = None
+    supabase_anon_key: Optional[str] = None
+    password: str = "LoadTest123!"
+    email_domain: str = "loadtest.example.com"
+    seed: Optional[int] = None
+
+
+class ParentJourney:
+    """Runs the enrollment journey for many simulated parents and collects stats."""
+
+    def __init__(self, config: JourneyConfig):
+        self.config = config
+        self.stats: Dict[str, StepStats] = {step: StepStats() for step in JOURNEY_STEPS}
+        self.completed_journeys = 0
+        self.failed_journeys = 0
+        self.random = random.Random(config.seed)
+        self._upload_payload = self._build_upload_payload(config.upload_size_kb)
+
+    @staticmethod
+    def _build_upload_payload(size_kb: int) -> bytes:
+        """Build a PDF-looking payload of roughly the requested size."""
+        header = b"%PDF-1.4\n% parent journey load test\n"
+        body_size = max(0, size_kb * 1024 - len(header) - 6)
+        return header + b"0" * body_size + b"\n%%EOF"
+
+    async def _timed(self, step: str, call, ok_check=None) -> Optional[httpx.Response]:
+        """Execute a request coroutine and record its latency and outcome."""
+        start = time.perf_counter()
+        try:
+            response = await call
+        except httpx.HTTPError as e:
+            self.stats[step].record(time.perf_counter() - start, e.__class__.__name__, ok=False)
+            return None
+        latency = time.perf_counter() - start
+        ok = response.status_code < 400
+        if ok and ok_check is not None:
+            ok = ok_check(response)
+        self.stats[step].record(latency, str(response.status_code), ok=ok)
+        return response if response.status_code < 400 else None
+
+    async def _think(self) -> None:
+        if self.config.think_time > 0:
+            await asyncio.sleep(self.random.uniform(0, self.config.think_time))
+
+    async def _login(self, client: httpx.AsyncClient, parent_number: int) -> Optional[str]:
+        """Obtain a bearer token for the simulated parent."""
+        email = f"parent{parent_number}@{self.config.email_domain}"
+        if self.config.auth_mode == "supabase":
+            response = await self._timed("login", client.post(
+                f"{self.config.supabase_url}/auth/v1/token",
+                params={"grant_type": "password"},
+                headers={"apikey": self.config.supabase_anon_key or ""},
+                json={"email": email, "password": self.config.password},
+            ))
+            return response.json().get("access_token") if response is not None else None
+
+        # Local mode mints a token carrying a unique subject per parent
+        start = time.perf_counter()
+        token = jwt.encode(
+            {
+                "sub": str(uuid.uuid5(uuid.NAMESPACE_DNS, email)),
+                "email": email,
+                "role": "authenticated",
+                "aud": "authenticated",
+                "exp": int(time.time()) + 3600,
+            },
+            self.config.jwt_secret,
+            algorithm="HS256",
+        )
+        self.stats["login"].record(time.perf_counter() - start, "local", ok=True)
+        return token
+
+    def _auto_save_payload(self, step_number: int, application_id: Optional[str]) -> Dict[str, Any]:
+        """Build a partial auto-save body, cycling through form sections."""
+        sections = [
+            ("student", {
+                "surname": "Loadtest",
+                "first_name": f"Learner{step_number}",
+                "date_of_birth": "2014-03-15",
+                "gender": self.random.choice(["male", "female"]),
+                "home_language": "English",
+                "id_number": f"{self.random.randrange(10**12, 10**13)}",
+                "previous_grade": "Grade 4",
+                "grade_applied_for": "Grade 5",
+                "previous_school": "Journey Primary",
+            }),
+            ("medical", {
+                "medical_aid_name": "Discovery",
+                "member_number": f"M{step_number:06d}",
+                "conditions": ["asthma"] if step_number % 2 else [],
+                "allergies": "None",
+            }),
+            ("family", {
+                "father_surname": "Loadtest",
+                "father_first_name": "Parent",
+                "father_mobile": "+27 82 555 0101",
+                "mother_surname": "Loadtest",
+                "mother_first_name": "Guardian",
+                "mother_mobile": "+27 82 555 0102",
+            }),
+            ("fee", {
+                "fee_person": "Parent Loadtest",
+                "relationship": "Father",
+                "fee_terms_accepted": step_number % 3 == 0,
+            }),
+        ]
+        section, values = sections[step_number % len(sections)]
+        payload: Dict[str, Any] = {section: values}
+        if application_id:
+            payload["application_id"] = application_id
+        return payload
+
+    async def _run_parent(self, client: httpx.AsyncClient, parent_number: int) -> None:
+        """Run the full journey for one simulated parent."""
+        token = await self._login(client, parent_number)
+        if not token:
+            self.failed_journeys += 1
+            return
+        headers = {"Authorization": f"Bearer {token}"}
+        application_id: Optional[str] = None
+
+        for step_number in range(self.config.auto_saves):
+            await self._think()
+            response = await self._timed(
+                "auto_save",
+                client.post(
+                    f"{API_PREFIX}/enrollment/auto-save",
+                    json=self._auto_save_payload(step_number, application_id),
+                    headers=headers,
+                ),
+                # The router masks failures as 200s, so inspect the message
+                ok_check=lambda r: r.json().get("message") == AUTO_SAVE_SUCCESS_MESSAGE,
+            )
+            if response is not None:
+                returned_id = response.json().get("application_id")
+                if returned_id and returned_id != "unknown":
+                    application_id = returned_id
+
+        if not application_id:
+            self.failed_journeys += 1
+            return
+
+        for upload_number in range(self.config.uploads):
+            await self._think()
+            document_type = UPLOAD_DOCUMENT_TYPES[upload_number % len(UPLOAD_DOCUMENT_TYPES)]
+            await self._timed("upload", client.post(
+                f"{API_PREFIX}/documents/upload",
+                data={"application_id": application_id, "document_type": document_type},
+                files={"file": (f"{document_type}.pdf", self._upload_payload, "application/pdf")},
+                headers=headers,
+            ))
+
+        await self._think()
+        await self._timed("academic_history", client.post(
+            f"{API_PREFIX}/academic/academic-history",
+            json={
+                "application_id": application_id,
+                "school_name": "Journey Primary",
+                "school_type": "public",
+                "last_grade_completed": "Grade 4",
+                "academic_year_completed": "2025",
+                "reason_for_leaving": "Relocation",
+                "report_card_url": "",
+            },
+            headers=headers,
+        ))
+
+        await self._think()
+        await self._timed("financing", client.post(
+            f"{API_PREFIX}/financing/select-plan",
+            json={
+                "application_id": application_id,
+                "plan_type": self.random.choice(FINANCING_PLANS),
+                "discount_rate": 5.0,
+                "repayment_term": "12 months",
+            },
+            headers=headers,
+        ))
+
+        await self._think()
+        await self._timed("declaration", client.post(
+            f"{API_PREFIX}/enrollment/declaration",
+            json={
+                "application_id": application_id,
+                "agree_truth": True,
+                "agree_policies": True,
+                "agree_financial": True,
+                "agree_verification": True,
+                "agree_data_processing": True,
+                "fullName": "Parent Loadtest",
+                "city": "Cape Town",
+            },
+            headers=headers,
+        ))
+
+        await self._think()
+        response = await self._timed("submit", client.post(
+            f"{API_PREFIX}/enrollment/submit-application",
+            json={
+                "application_id": application_id,
+                "declaration": {"agreeAuditStorage": True, "agreeAffordabilityProcessing": True},
+            },
+            headers=headers,
+        ))
+        if response is None:
+            self.failed_journeys += 1
+        else:
+            self.completed_journeys += 1
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all simulated parents and return the report."""
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+        limits = httpx.Limits(
+            max_connections=self.config.concurrency,
+            max_keepalive_connections=self.config.concurrency,
+        )
+        spacing = self.config.ramp_up / self.config.parents if self.config.parents else 0
+
+        async with httpx.AsyncClient(
+            base_url=self.config.base_url, limits=limits, timeout=self.config.timeout
+        ) as client:
+
+            async def parent_task(parent_number: int) -> None:
+                if spacing:
+                    await asyncio.sleep(parent_number * spacing)
+                async with semaphore:
+                    try:
+                        await self._run_parent(client, parent_number)
+                    except Exception as e:
+                        logger.error(f"Journey for parent {parent_number} aborted: {e}")
+                        self.failed_journeys += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(parent_task(n) for n in range(self.config.parents)))
+            elapsed = time.perf_counter() - start
+
+        total_requests = sum(len(s.latencies) for s in self.stats.values())
+        return {
+            "parents": self.config.parents,
+            "concurrency": self.config.concurrency,
+            "elapsed_s": elapsed,
+            "completed_journeys": self.completed_journeys,
+            "failed_journeys": self.failed_journeys,
+            "requests": total_requests,
+            "requests_per_s": total_requests / elapsed if elapsed else 0.0,
+            "steps": {step: self.stats[step].summary() for step in JOURNEY_STEPS},
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render the report as a fixed-width table."""
+    lines = [
+        f"Parents: {report['parents']}  Concurrency: {report['concurrency']}  "
+        f"Elapsed: {report['elapsed_s']:.1f}s  Requests: {report['requests']}  "
+        f"Throughput: {report['requests_per_s']:.1f} req/s",
+        f"Journeys completed: {report['completed_journeys']}  failed: {report['failed_journeys']}",
+        "",
+        f"{'step':<18}{'count':>8}{'errors':>8}{'err%':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}",
+    ]
+    for step, summary in report["steps"].items():
+        if not summary["count"]:
+            lines.append(f"{step:<18}{0:>8}")
+            continue
+        lines.append(
+            f"{step:<18}{summary['count']:>8}{summary['errors']:>8}{summary['error_rate'] * 100:>7.1f}%"
+            f"{summary['mean_ms']:>9.1f}ms{summary['p50_ms']:>8.1f}ms{summary['p90_ms']:>8.1f}ms"
+            f"{summary['p99_ms']:>8.1f}ms{summary['max_ms']:>8.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay the parent enrollment journey under load")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--parents", type=int, default=100, help="Number of simulated parents")
+    parser.add_argument("--concurrency", type=int, default=50, help="Parents running at the same time")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which parents start")
+    parser.add_argument("--auto-saves", type=int, default=12, help="Auto-saves per parent")
+    parser.add_argument("--uploads", type=int, default=4, help="Document uploads per parent")
+    parser.add_argument("--upload-size-kb", type=int, default=256, help="Size of each uploaded file")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max random pause between steps (s)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--auth-mode", choices=["local", "supabase"], default="local",
+                        help="local mints a test token per parent; supabase signs in seeded users")
+    parser.add_argument("--jwt-secret", default="load-test-secret", help="Secret for locally minted tokens")
+    parser.add_argument("--supabase-url", help="Supabase project URL (supabase auth mode)")
+    parser.add_argument("--supabase-anon-key", help="Supabase anon key (supabase auth mode)")
+    parser.add_argument("--password", default="LoadTest123!", help="Password of the seeded test users")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible payloads")
+    parser.add_argument("--json-output", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+    if args.auth_mode == "supabase" and not (args.supabase_url and args.supabase_anon_key):
+        parser.error("--supabase-url and --supabase-anon-key are required with --auth-mode supabase")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = JourneyConfig(
+        base_url=args.base_url.rstrip("/"),
+        parents=args.parents,
+        concurrency=args.concurrency,
+        ramp_up=args.ramp_up,
+        auto_saves=args.auto_saves,
+        uploads=args.uploads,
+        upload_size_kb=args.upload_size_kb,
+        think_time=args.think_time,
+        timeout=args.timeout,
+        auth_mode=args.auth_mode,
+        jwt_secret=args.jwt_secret,
+        supabase_url=args.supabase_url,
+        supabase_anon_key=args.supabase_anon_key,
+        password=args.password,
+        seed=args.seed,
+    )
+    report = asyncio.run(ParentJourney(config).run())
+    print(format_report(report))
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Response serialization micro-benchmark.
+
+Measures the CPU time each read endpoint spends turning repository rows into
+a response body, comparing the validated path (build the response model, let
+FastAPI validate it against ``response_model`` and encode it) with the
+trusted-row fast path in ``app.core.serialization``.
+
+Usage:
+    python -m benchmarks.serialization --iterations 20000
+
+Rows are representative of a fully completed application. No server or
+database is needed.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.api.v1.schemas.academic import AcademicHistoryResponse
+from app.api.v1.schemas.documents import DocumentStatusResponse, UploadedFilesResponse
+from app.api.v1.schemas.enrollment import ApplicationProgressResponse, ApplicationResponse
+from app.api.v1.schemas.financing import FinancingSelectionResponse
+from app.core.serialization import FastJSONResponse, orjson, project
+
+TIMESTAMP = "2025-01-15T09:30:12.345678+00:00"
+APPLICATION_ID = "3f9c1a52-8d7e-4b61-9a0f-2c4d5e6f7a8b"
+
+
+def _file(n: int, document_type: str) -> Dict[str, Any]:
+    return {
+        "id": f"0c1d2e3f-4a5b-6c7d-8e9f-{n:012d}",
+        "filename": f"{APPLICATION_ID}/{document_type}_{n}.pdf",
+        "original_filename": f"{document_type} scan {n}.pdf",
+        "file_size": 245760 + n,
+        "content_type": "application/pdf",
+        "document_type": document_type,
+        "download_url": f"https://example.supabase.co/storage/v1/object/public/enrollment-documents/{APPLICATION_ID}/{n}.pdf",
+        "created_at": TIMESTAMP,
+    }
+
+
+def sample_rows() -> Dict[str, Tuple[Type[BaseModel], Dict[str, Any]]]:
+    """Response model and trusted row per endpoint."""
+    requirements = {"proof_of_address": 1, "id_document": 2, "payslip": 3, "bank_statement": 1}
+    files = [_file(n, doc_type) for n, doc_type in enumerate(
+        doc_type for doc_type, count in requirements.items() for _ in range(count)
+    )]
+    student = {
+        "application_id": APPLICATION_ID, "surname": "Dlamini", "first_name": "Thandiwe",
+        "middle_name": "Nomsa", "preferred_name": "Thandi", "date_of_birth": "2012-03-14",
+        "gender": "female", "home_language": "isiZulu", "id_number": "1203140123085",
+        "previous_grade": "Grade 6", "grade_applied_for": "Grade 7",
+        "previous_school": "Sunnyside Primary", "created_at": TIMESTAMP, "updated_at": TIMESTAMP,
+    }
+    medical = {
+        "application_id": APPLICATION_ID, "medical_aid_name": "Discovery", "member_number": "123456789",
+        "conditions": ["asthma"], "allergies": "Peanuts", "medication": "Inhaler as needed",
+        "doctor_name": "Dr N. Khumalo", "doctor_phone": "0115550100", "created_at": TIMESTAMP,
+    }
+    family = {
+        "application_id": APPLICATION_ID, "father_surname": "Dlamini", "father_first_name": "Sipho",
+        "father_id_number": "7805125123081", "father_mobile": "0825550101",
+        "father_email": "sipho@example.com", "mother_surname": "Dlamini", "mother_first_name": "Lerato",
+        "mother_id_number": "8007220123087", "mother_mobile": "0835550102",
+        "mother_email": "lerato@example.com", "next_of_kin_name": "Zanele Mokoena",
+        "next_of_kin_relationship": "Aunt", "next_of_kin_contact": "0845550103", "created_at": TIMESTAMP,
+    }
+    fee = {
+        "application_id": APPLICATION_ID, "fee_person": "father", "relationship": "parent",
+        "fee_terms_accepted": True, "created_at": TIMESTAMP, "updated_at": TIMESTAMP,
+    }
+    return {
+        "get_application": (ApplicationResponse, {
+            "id": APPLICATION_ID, "user_id": "user123", "status": "in_progress", "created_at": TIMESTAMP,
+            "student": student, "medical": medical, "family": family, "fee": fee,
+        }),
+        "document_status": (DocumentStatusResponse, {
+            "application_id": APPLICATION_ID,
+            "summary": [
+                {"document_type": doc_type, "uploaded_count": count, "required_count": count,
+                 "completed": True, "files": [f for f in files if f["document_type"] == doc_type]}
+                for doc_type, count in requirements.items()
+            ],
+        }),
+        "uploaded_files": (UploadedFilesResponse, {"files": files}),
+        "academic_history": (AcademicHistoryResponse, {
+            "id": "5a6b7c8d-9e0f-4a1b-8c2d-3e4f5a6b7c8d", "application_id": APPLICATION_ID,
+            "school_name": "Sunnyside Primary", "school_type": "public", "last_grade_completed": "Grade 6",
+            "academic_year_completed": "2024", "reason_for_leaving": "Moving to high school",
+            "principal_name": "Mrs P. Naidoo", "school_phone_number": "0125550123",
+            "school_email": "office@sunnyside.example.com", "school_address": "12 Jacaranda St, Pretoria",
+            "additional_notes": None, "report_card_url": None, "created_at": TIMESTAMP, "updated_at": TIMESTAMP,
+        }),
+        "financing_selection": (FinancingSelectionResponse, {
+            "id": "6b7c8d9e-0f1a-4b2c-9d3e-4f5a6b7c8d9e", "application_id": APPLICATION_ID,
+            "plan_type": "termly_discount", "discount_rate": 5.0, "cost_of_credit": None,
+            "repayment_term": None, "next_of_kin_name": None, "created_at": TIMESTAMP, "updated_at": TIMESTAMP,
+        }),
+        "progress": (ApplicationProgressResponse, {
+            "application_id": APPLICATION_ID, "user_id": "user123", "status": "in_progress",
+            "student_completed": True, "medical_completed": True, "family_completed": True,
+            "fee_completed": True, "document_types_completed": list(requirements),
+            "academic_history_completed": True, "financing_plan": "termly_discount",
+            "declaration_signed": False, "created_at": TIMESTAMP, "updated_at": TIMESTAMP,
+        }),
+    }
+
+
+def validated_path(model: Type[BaseModel], row: Dict[str, Any]) -> Callable[[], bytes]:
+    """What FastAPI does for an endpoint returning ``model(**row)``."""
+    field = create_response_field(name=f"Response_{model.__name__}", type_=model)
+
+    def encode() -> bytes:
+        # serialize_response never suspends for async endpoints; step it without a loop
+        coroutine = serialize_response(field=field, response_content=model(**row))
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return JSONResponse(done.value).body
+        raise RuntimeError("serialize_response suspended")
+
+    return encode
+
+
+def fast_path(model: Type[BaseModel], row: Dict[str, Any]) -> Callable[[], bytes]:
+    return lambda: FastJSONResponse(project(model, row)).body
+
+
+def normalized(document: Any) -> Any:
+    """``document`` with ISO timestamps parsed, so ``+00:00`` and ``Z`` compare equal."""
+    if isinstance(document, dict):
+        return {key: normalized(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [normalized(value) for value in document]
+    if isinstance(document, str) and len(document) >= 19 and document[10:11] == "T":
+        try:
+            return datetime.fromisoformat(document.replace("Z", "+00:00"))
+        except ValueError:
+            return document
+    return document
+
+
+def cpu_time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Process CPU seconds per call, best of three runs."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.process_time()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.process_time() - start) / iterations)
+    return best
+
+
+def run(iterations: int) -> Dict[str, Any]:
+    endpoints = {}
+    for endpoint, (model, row) in sample_rows().items():
+        validated, fast = validated_path(model, row), fast_path(model, row)
+        # Both paths must produce the same document
+        assert normalized(json.loads(validated())) == normalized(json.loads(fast())), endpoint
+        validated_s = cpu_time_per_call(validated, iterations)
+        fast_s = cpu_time_per_call(fast, iterations)
+        endpoints[endpoint] = {
+            "validated_us": validated_s * 1e6,
+            "fast_us": fast_s * 1e6,
+            "saved_us": (validated_s - fast_s) * 1e6,
+            "speedup": validated_s / fast_s if fast_s else 0.0,
+            "body_bytes": len(fast()),
+        }
+    return {"iterations": iterations, "encoder": "orjson" if orjson else "pydantic_core", "endpoints": endpoints}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render the report as a fixed-width table."""
+    lines = [
+        f"Iterations: {report['iterations']}  Encoder: {report['encoder']}",
+        "",
+        f"{'endpoint':<22}{'bytes':>8}{'validated':>12}{'fast':>10}{'saved':>10}{'speedup':>9}",
+    ]
+    for endpoint, result in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<22}{result['body_bytes']:>8}{result['validated_us']:>10.1f}us"
+            f"{result['fast_us']:>8.1f}us{result['saved_us']:>8.1f}us{result['speedup']:>8.1f}x"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare validated and fast response serialization")
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per endpoint and path")
+    parser.add_argument("--json-output", help="Write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = run(args.iterations)
+    print(format_report(report))
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Process start-up benchmark.
+
+Starts fresh interpreters and times the phases of a cold start:
+
+1. ``import app.main``
+2. Building the Supabase clients (deferred to first use, or to a thread
+   started by the startup hook)
+3. The startup hook
+4. The first request (``GET /health``)
+
+One extra run under ``python -X importtime`` lists the slowest imports, so a
+regression can be traced to the module that caused it. Clients are built
+against a placeholder project; nothing is sent over the network.
+
+Usage:
+    python -m benchmarks.startup --runs 10 --json-output startup.json
+    python -m benchmarks.startup --compare startup.json
+
+No server or database is needed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+PHASES = ("import_ms", "clients_ms", "startup_ms", "first_request_ms")
+
+PLACEHOLDER_ENV = {
+    "SUPABASE_URL": "https://benchmark-placeholder.supabase.co",
+    "SUPABASE_ANON_KEY": "placeholder.anon.key",
+    "SUPABASE_SERVICE_ROLE_KEY": "placeholder.service.key",
+    "SUPABASE_JWT_SECRET": "placeholder-secret",
+}
+
+# Runs in the child interpreter; prints one JSON object with the phase timings
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.db.supabase_client import supabase_clients
+supabase_clients.build()
+built = time.perf_counter()
+
+async def serve():
+    import httpx
+    await app.main.app.router.startup()
+    started = time.perf_counter()
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        before = time.perf_counter()
+        response = await client.get("/health")
+        answered = time.perf_counter()
+    await app.main.app.router.shutdown()
+    assert response.status_code == 200, response.status_code
+    return started, answered - before
+
+begin_startup = time.perf_counter()
+started, first_request = asyncio.run(serve())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "clients_ms": (built - imported) * 1000,
+    "startup_ms": (started - begin_startup) * 1000,
+    "first_request_ms": first_request * 1000,
+}))
+"""
+
+
+def child_env(backend: str) -> Dict[str, str]:
+    env = {**os.environ, "DATABASE_BACKEND": backend, "LOOP_MONITOR_ENABLED": "false"}
+    if backend == "supabase":
+        env.update(PLACEHOLDER_ENV)
+    return env
+
+
+def run_once(backend: str) -> Dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], env=child_env(backend),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(backend: str, top: int) -> List[Dict[str, Any]]:
+    """Application modules and top-level packages by cumulative import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], env=child_env(backend),
+        capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        self_us, cumulative_us, name = parts
+        if name.startswith("app.") or "." not in name:
+            modules.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    modules.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    return modules[:top]
+
+
+def run(runs: int, backend: str, top: int) -> Dict[str, Any]:
+    samples = [run_once(backend) for _ in range(runs)]
+    phases = {}
+    for phase in PHASES:
+        values = [sample[phase] for sample in samples]
+        phases[phase] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    total = [sum(sample[phase] for phase in PHASES) for sample in samples]
+    phases["total_ms"] = {"median": statistics.median(total), "min": min(total), "max": max(total)}
+    return {
+        "runs": runs,
+        "backend": backend,
+        "python": sys.version.split()[0],
+        "phases": phases,
+        "slowest_imports": slowest_imports(backend, top),
+    }
+
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Render the report as fixed-width tables, with deltas against ``baseline``."""
+    lines = [
+        f"Runs: {report['runs']}  Backend: {report['backend']}  Python: {report['python']}",
+        "",
+        f"{'phase':<18}{'median':>10}{'min':>10}{'max':>10}" + (f"{'vs base':>10}" if baseline else ""),
+    ]
+    for phase, result in report["phases"].items():
+        line = f"{phase:<18}{result['median']:>8.1f}ms{result['min']:>8.1f}ms{result['max']:>8.1f}ms"
+        if baseline and phase in baseline["phases"]:
+            line += f"{result['median'] - baseline['phases'][phase]['median']:>+8.1f}ms"
+        lines.append(line)
+
+    lines += ["", f"{'module':<44}{'self':>10}{'cumulative':>12}"]
+    for module in report["slowest_imports"]:
+        lines.append(f"{module['module']:<44}{module['self_ms']:>8.1f}ms{module['cumulative_ms']:>10.1f}ms")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time the cold start of the API process")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--backend", choices=["supabase", "memory"], default="supabase",
+                        help="supabase builds real clients against a placeholder project")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--json-output", help="Write the report as JSON to this path")
+    parser.add_argument("--compare", help="Earlier JSON report to show deltas against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = run(args.runs, args.backend, args.top)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
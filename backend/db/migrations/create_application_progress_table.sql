@@ -0,0 +1,32 @@
+-- Create application_progress table
+-- One row per application, kept up to date by every write path so the
+-- sidebar and review step can read completeness with a single lookup.
+CREATE TABLE IF NOT EXISTS public.application_progress (
+  application_id UUID NOT NULL,
+  user_id UUID NULL,
+  status TEXT NULL,
+  student_completed BOOLEAN NOT NULL DEFAULT FALSE,
+  medical_completed BOOLEAN NOT NULL DEFAULT FALSE,
+  family_completed BOOLEAN NOT NULL DEFAULT FALSE,
+  fee_completed BOOLEAN NOT NULL DEFAULT FALSE,
+  document_types_completed TEXT[] NOT NULL DEFAULT '{}',
+  academic_history_completed BOOLEAN NOT NULL DEFAULT FALSE,
+  financing_plan TEXT NULL,
+  declaration_signed BOOLEAN NOT NULL DEFAULT FALSE,
+  created_at TIMESTAMP WITH TIME ZONE NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NULL DEFAULT NOW(),
+  CONSTRAINT application_progress_pkey PRIMARY KEY (application_id),
+  CONSTRAINT application_progress_application_id_fkey FOREIGN KEY (application_id) REFERENCES applications (id) ON DELETE CASCADE
+) TABLESPACE pg_default;
+
+-- Create trigger for updated_at
+CREATE TRIGGER update_application_progress_updated_at
+BEFORE UPDATE ON application_progress
+FOR EACH ROW
+EXECUTE FUNCTION update_updated_at_column();
+
+-- Row Level Security: parents read their own progress, the API writes it
+ALTER TABLE public.application_progress ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own application progress" ON public.application_progress
+    FOR SELECT USING (auth.uid() = user_id);
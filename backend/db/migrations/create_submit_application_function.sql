@@ -0,0 +1,106 @@
+-- Submit an application in one transaction
+-- Finds (or creates) the user's application, upserts every provided section,
+-- academic history and declaration flags, marks it submitted and updates the
+-- progress snapshot. The API calls it through rpc("submit_application"), so a
+-- submission is a single round trip and either applies completely or not at all.
+
+-- Upsert one row of a section table keyed by application_id. Only the keys
+-- present in p_row are written, so columns the API does not send keep their
+-- values (or defaults).
+CREATE OR REPLACE FUNCTION public.upsert_application_section(p_table TEXT, p_row JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_columns TEXT;
+  v_updates TEXT;
+BEGIN
+  IF p_table NOT IN ('students', 'medical_info', 'family_info', 'fee_responsibility', 'academic_history') THEN
+    RAISE EXCEPTION 'Unsupported section table %', p_table;
+  END IF;
+
+  SELECT string_agg(quote_ident(key), ', '),
+         string_agg(format('%I = EXCLUDED.%I', key, key), ', ')
+           FILTER (WHERE key <> 'application_id')
+    INTO v_columns, v_updates
+    FROM jsonb_object_keys(p_row) AS key;
+
+  EXECUTE format(
+    'INSERT INTO public.%I (%s) SELECT %s FROM jsonb_populate_record(NULL::public.%I, $1) '
+    'ON CONFLICT (application_id) %s',
+    p_table, v_columns, v_columns, p_table, COALESCE('DO UPDATE SET ' || v_updates, 'DO NOTHING')
+  ) USING p_row;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.submit_application(
+  p_user_id UUID,
+  p_student JSONB DEFAULT NULL,
+  p_medical JSONB DEFAULT NULL,
+  p_family JSONB DEFAULT NULL,
+  p_fee JSONB DEFAULT NULL,
+  p_academic_history JSONB DEFAULT NULL,
+  p_declaration JSONB DEFAULT NULL
+)
+RETURNS TABLE (application_id UUID, progress JSONB)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_application_id UUID;
+  v_progress JSONB;
+BEGIN
+  -- Serialize submissions of the same user so only one application is created
+  PERFORM pg_advisory_xact_lock(hashtext(p_user_id::TEXT));
+
+  SELECT id INTO v_application_id FROM public.applications WHERE user_id = p_user_id LIMIT 1;
+  IF v_application_id IS NULL THEN
+    INSERT INTO public.applications (user_id, status)
+    VALUES (p_user_id, 'submitted')
+    RETURNING id INTO v_application_id;
+
+    INSERT INTO public.application_progress (application_id, user_id, status)
+    VALUES (v_application_id, p_user_id, 'submitted');
+  END IF;
+
+  IF p_student IS NOT NULL THEN
+    PERFORM public.upsert_application_section('students', p_student || jsonb_build_object('application_id', v_application_id));
+  END IF;
+  IF p_medical IS NOT NULL THEN
+    PERFORM public.upsert_application_section('medical_info', p_medical || jsonb_build_object('application_id', v_application_id));
+  END IF;
+  IF p_family IS NOT NULL THEN
+    PERFORM public.upsert_application_section('family_info', p_family || jsonb_build_object('application_id', v_application_id));
+  END IF;
+  IF p_fee IS NOT NULL THEN
+    PERFORM public.upsert_application_section('fee_responsibility', p_fee || jsonb_build_object('application_id', v_application_id));
+  END IF;
+  IF p_academic_history IS NOT NULL THEN
+    PERFORM public.upsert_application_section('academic_history', p_academic_history || jsonb_build_object('application_id', v_application_id));
+  END IF;
+
+  UPDATE public.applications
+     SET status = 'submitted',
+         submitted_at = NOW(),
+         agree_audit_storage = COALESCE((p_declaration->>'agree_audit_storage')::BOOLEAN, agree_audit_storage),
+         agree_affordability_processing = COALESCE((p_declaration->>'agree_affordability_processing')::BOOLEAN, agree_affordability_processing)
+   WHERE id = v_application_id;
+
+  -- A missing snapshot is left to the API, which rebuilds it on first read
+  UPDATE public.application_progress
+     SET status = 'submitted',
+         student_completed = student_completed OR p_student IS NOT NULL,
+         medical_completed = medical_completed OR p_medical IS NOT NULL,
+         family_completed = family_completed OR p_family IS NOT NULL,
+         fee_completed = fee_completed OR p_fee IS NOT NULL,
+         academic_history_completed = academic_history_completed OR p_academic_history IS NOT NULL
+   WHERE application_id = v_application_id
+  RETURNING to_jsonb(application_progress.*) INTO v_progress;
+
+  RETURN QUERY SELECT v_application_id, v_progress;
+END;
+$$;
+
+-- Only the API's service role may call these
+REVOKE EXECUTE ON FUNCTION public.upsert_application_section(TEXT, JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.submit_application(UUID, JSONB, JSONB, JSONB, JSONB, JSONB, JSONB) FROM PUBLIC, anon, authenticated;